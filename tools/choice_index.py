@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+choice_index.py — "Special military operation"? We have seen that one before.
+
+show_consequences() wants an exact PRECEDENT_DATABASE key. People don't
+speak in keys. They quote what they heard: a slogan, a promise, an
+outcome. Every entry already lists how the choice is sold (sounds_like),
+what was promised and what people got.
+
+This indexes all of that text with BM25 over words and word pairs. Each
+phrase is its own short document, tagged with the choice (and precedent)
+it came from. A quote is scored against every phrase through the postings
+lists; a choice ranks by its best-matching phrase.
+
+BM25 weights are computed when the index is built, so a lookup is a few
+dictionary reads and additions. The built index is pickled under
+workspace/cache/, keyed by a fingerprint of the database: CLI startup
+loads it, and it is only rebuilt when the precedents change.
+
+Run:
+  python3 tools/choice_index.py "special military operation"
+  python3 tools/choice_index.py --rebuild
+"""
+
+import hashlib
+import json
+import math
+import os
+import pickle
+import sys
+import time
+
+from textvec import tokens
+
+
+INDEX_PATH = "workspace/cache/choice_index.pkl"
+
+# How much a match in each field counts. Slogans are what people quote.
+FIELD_WEIGHTS = {
+    "sounds_like": 1.0,
+    "choice": 1.0,
+    "promised": 0.8,
+    "got": 0.6,
+}
+
+K1 = 1.2
+B = 0.75
+BIGRAM_BOOST = 1.5
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ations", "ation", "ings", "ing", "ies", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text: str) -> list:
+    """Stemmed words, then adjacent word pairs ("military operation")."""
+    words = [_stem(w) for w in tokens(text)]
+    return words + [a + " " + b for a, b in zip(words, words[1:])]
+
+
+def fingerprint(database: dict) -> str:
+    """Changes whenever any choice, slogan or precedent text changes."""
+    if getattr(database, "fingerprint", None):
+        return database.fingerprint     # LazyTable: no need to decode every entry
+    blob = json.dumps(database, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def _phrases(database: dict):
+    """(choice key, precedent index or -1, field, text) for every indexed phrase."""
+    for key, entry in database.items():
+        yield key, -1, "choice", entry.get("choice", "")
+        for s in entry.get("sounds_like", []):
+            yield key, -1, "sounds_like", s
+        for i, p in enumerate(entry.get("precedents", [])):
+            yield key, i, "promised", p.get("promised", "")
+            yield key, i, "got", p.get("got", "")
+
+
+def _idf(n: int, df: int) -> float:
+    return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+
+class ChoiceIndex:
+    """BM25 over every phrase in the precedent database, weights precomputed."""
+
+    def __init__(self, units: list, postings: dict, fp: str):
+        self.units = units          # [(choice key, precedent index, field, text)]
+        self.postings = postings    # term -> [(unit id, weight)]
+        self.fingerprint = fp
+
+    @classmethod
+    def build(cls, database: dict) -> "ChoiceIndex":
+        units = list(_phrases(database))
+        docs = [terms(text) for _, _, _, text in units]
+        avg_len = sum(len(d) for d in docs) / max(len(docs), 1) or 1.0
+
+        df = {}
+        for d in docs:
+            for t in set(d):
+                df[t] = df.get(t, 0) + 1
+
+        n = len(docs)
+        postings = {}
+        for u, d in enumerate(docs):
+            field = FIELD_WEIGHTS[units[u][2]]
+            norm = K1 * (1 - B + B * len(d) / avg_len)
+            tf = {}
+            for t in d:
+                tf[t] = tf.get(t, 0) + 1
+            for t, f in tf.items():
+                idf = _idf(n, df[t])
+                w = idf * f * (K1 + 1) / (f + norm) * field
+                if " " in t:
+                    w *= BIGRAM_BOOST
+                postings.setdefault(t, []).append((u, w))
+        return cls(units, postings, fingerprint(database))
+
+    @classmethod
+    def load(cls, database: dict, path: str = INDEX_PATH) -> "ChoiceIndex":
+        """The pickled index if it matches this database, else rebuild and save."""
+        fp = fingerprint(database)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("fingerprint") == fp:
+                return cls(data["units"], data["postings"], fp)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            pass
+        index = cls.build(database)
+        index.save(path)
+        return index
+
+    def save(self, path: str = INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            # Plain containers only, so the pickle loads from any entry point
+            pickle.dump({"fingerprint": self.fingerprint, "units": self.units,
+                         "postings": self.postings}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _unit_scores(self, quote: str) -> dict:
+        scores = {}
+        for t in set(terms(quote)):
+            for u, w in self.postings.get(t, ()):
+                scores[u] = scores.get(u, 0.0) + w
+        return scores
+
+    def lookup(self, quote: str, top: int = 3) -> list:
+        """
+        [(choice key, score, matched phrase)], best first.
+        A choice scores as its best-matching phrase. Empty if nothing matches.
+        """
+        best = {}
+        for u, s in self._unit_scores(quote).items():
+            key = self.units[u][0]
+            if s > best.get(key, (0.0, None))[0]:
+                best[key] = (s, self.units[u][3])
+        ranked = sorted(best.items(), key=lambda kv: -kv[1][0])[:top]
+        return [(key, round(s, 3), phrase) for key, (s, phrase) in ranked]
+
+    def precedents(self, quote: str, top: int = 3) -> list:
+        """[(choice key, precedent index, score)] for promises and outcomes that match."""
+        best = {}
+        for u, s in self._unit_scores(quote).items():
+            key, i, _, _ = self.units[u]
+            if i >= 0 and s > best.get((key, i), 0.0):
+                best[(key, i)] = s
+        ranked = sorted(best.items(), key=lambda kv: -kv[1])[:top]
+        return [(key, i, round(s, 3)) for (key, i), s in ranked]
+
+
+if __name__ == "__main__":
+    from consequence_sim import PRECEDENT_DATABASE
+
+    args = sys.argv[1:]
+    if "--rebuild" in args:
+        args.remove("--rebuild")
+        ChoiceIndex.build(PRECEDENT_DATABASE).save()
+        print(f"Rebuilt {INDEX_PATH}")
+
+    index = ChoiceIndex.load(PRECEDENT_DATABASE)
+    print(f"{len(index.units)} phrases, {len(index.postings)} terms")
+    if not args:
+        sys.exit(0)
+
+    quote = " ".join(args)
+    t0 = time.perf_counter()
+    matches = index.lookup(quote)
+    elapsed = (time.perf_counter() - t0) * 1e6
+    print(f'\n"{quote}"  ({elapsed:.0f} µs)\n')
+    if not matches:
+        print("  No precedent found for that quote.")
+    for key, score, phrase in matches:
+        print(f"  {score:6.2f}  {key:22s} via \"{phrase}\"")
+    for key, i, score in index.precedents(quote):
+        p = PRECEDENT_DATABASE[key]["precedents"][i]
+        print(f"\n  {score:6.2f}  {p['who']}")
+        print(f"          Promised: {p['promised']}")
+        print(f"          Got:      {p['got']}")
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+claims.py — Task claims that expire. A crashed worker cannot hold a task forever.
+
+A claim used to be a noclobber file holding a PID, in .swarm_claims/,
+.swarm_brain_claims/ or runtime/claims/. Nothing ever removed it except
+the worker that made it, so a worker that crashed held its task until
+someone cleaned up by hand, and every loop skipped it.
+
+A claim is now a lease, in the same file:
+
+  {"pid": 4242, "host": "box", "ttl": 300, "acquired": 1760000000.0}
+
+  - The lease runs for ttl seconds from the file's mtime. A heartbeat
+    touches the file to renew it.
+  - A claim is stale when its lease ran out, or when its PID is dead
+    on this host. A stale claim is reclaimed by the next worker that
+    wants the task, and by sweep().
+  - Acquire writes the lease to a temporary file and hard-links it into
+    place. The link either creates the whole claim or fails, so no one
+    ever sees a half-written claim.
+  - Reclaiming a stale claim, renewing and releasing your own happen
+    under the directory's lock (<dir>/.lock). The claim is checked again,
+    by inode, before it is removed, so a claim just renewed or re-taken
+    is never removed, and a heartbeat never renews a claim someone else
+    took over.
+
+Old PID-only files are read as leases that started at their mtime.
+
+Run:
+  python3 tools/claims.py acquire DIR KEY [--pid P] [--ttl S] [--suffix .claim]   Exit 0 if claimed
+  python3 tools/claims.py heartbeat DIR KEY [--pid P] [--while PID]       Renew until released
+  python3 tools/claims.py heartbeat DIR --all [--pid P]                   Renew all of P's claims while P lives
+  python3 tools/claims.py release DIR KEY [--pid P]
+  python3 tools/claims.py sweep DIR                                        Remove stale claims
+  python3 tools/claims.py list DIR
+"""
+
+import fcntl
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+TTL = 300.0             # Seconds a lease lasts without a heartbeat
+SUFFIX = ".claim"
+
+HOST = socket.gethostname()
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True         # Someone else's process, but alive
+    return True
+
+
+class ClaimStore:
+    """Leases on task keys, one file per key in a directory."""
+
+    def __init__(self, directory: str, suffix: str = SUFFIX, ttl: float = TTL, pid: int = None):
+        self.directory = directory
+        self.suffix = suffix
+        self.ttl = ttl
+        self.pid = pid or os.getpid()
+        self.held = set()       # Keys this store acquired and has not released
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # --- reading ---
+
+    def read(self, key: str):
+        """The claim on key as a dict (pid, host, ttl, acquired, mtime, inode), or None."""
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                st = os.fstat(f.fileno())
+                text = f.read()
+        except OSError:
+            return None
+        try:
+            info = json.loads(text)
+            if not isinstance(info, dict):
+                raise ValueError
+        except ValueError:
+            # Old style: just a PID
+            try:
+                info = {"pid": int(text.split()[0])}
+            except (IndexError, ValueError):
+                info = {}
+        info.setdefault("host", HOST)
+        info.setdefault("ttl", self.ttl)
+        info.setdefault("acquired", st.st_mtime)
+        info.update(mtime=st.st_mtime, inode=st.st_ino)
+        return info
+
+    def stale(self, info: dict, now: float = None) -> str:
+        """Why a claim no longer holds ("expired", "dead pid"), or "" if it does."""
+        now = time.time() if now is None else now
+        if now > info["mtime"] + float(info["ttl"]):
+            return "expired"
+        pid = info.get("pid")
+        if info["host"] == HOST and isinstance(pid, int) and not pid_alive(pid):
+            return "dead pid"
+        return ""
+
+    def mine(self, info) -> bool:
+        return bool(info) and info.get("pid") == self.pid and info["host"] == HOST
+
+    # --- acquire / renew / release ---
+
+    def _link(self, key: str) -> bool:
+        tmp = os.path.join(self.directory, f".{key}.{self.pid}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"pid": self.pid, "host": HOST, "ttl": self.ttl, "acquired": time.time()}, f)
+            f.write("\n")
+        try:
+            os.link(tmp, self.path(key))
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp)
+
+    def acquire(self, key: str) -> bool:
+        """Take key. A stale claim on it is reclaimed first. False if someone holds it."""
+        if self._link(key):
+            self.held.add(key)
+            return True
+        info = self.read(key)
+        if info is None or self.stale(info):
+            self._remove_if_stale(key, info)
+            if self._link(key):
+                self.held.add(key)
+                return True
+        return False
+
+    def _remove_if_stale(self, key: str, seen) -> bool:
+        with self._locked():
+            now = self.read(key)
+            # Same file we judged, and still stale: nobody renewed or re-took it meanwhile
+            if now is None or (seen and now["inode"] != seen["inode"]) or not self.stale(now):
+                return False
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                return False
+            return True
+
+    def renew(self, key: str) -> bool:
+        """Heartbeat: push the lease out by ttl. False if the claim is no longer ours."""
+        with self._locked():
+            # Checked and touched under the lock reclaims take: an expired claim re-taken
+            # in between would otherwise get our renewal
+            info = self.read(key)
+            if not self.mine(info) or self.stale(info):
+                self.held.discard(key)
+                return False
+            try:
+                os.utime(self.path(key))
+            except FileNotFoundError:
+                self.held.discard(key)
+                return False
+        return True
+
+    def release(self, key: str) -> bool:
+        """Give key back, only if we still hold it."""
+        self.held.discard(key)
+        with self._locked():
+            if not self.mine(self.read(key)):
+                return False
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                return False
+        return True
+
+    # --- upkeep ---
+
+    def claims(self) -> dict:
+        """{key: info} for every claim in the directory."""
+        out = {}
+        for name in os.listdir(self.directory):
+            if name.startswith(".") or not name.endswith(self.suffix):
+                continue
+            key = name[:len(name) - len(self.suffix)] if self.suffix else name
+            info = self.read(key)
+            if info is not None:
+                out[key] = info
+        return out
+
+    def sweep(self) -> list:
+        """Remove every stale claim. Returns [(key, reason)]."""
+        removed = []
+        for key, info in self.claims().items():
+            reason = self.stale(info)
+            if reason and self._remove_if_stale(key, info):
+                removed.append((key, reason))
+        return removed
+
+    @contextmanager
+    def keep_alive(self, every: float = None):
+        """Renew every held claim in a background thread while the block runs."""
+        every = every or self.ttl / 3
+        done = threading.Event()
+
+        def beat():
+            while not done.wait(every):
+                for key in list(self.held):
+                    self.renew(key)
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            done.set()
+            thread.join()
+
+
+def heartbeat(store: ClaimStore, key: str, watch: int = None, every: float = None) -> str:
+    """Renew key until it is released, taken over, or watch (a PID) exits. Returns why it stopped."""
+    every = every or store.ttl / 3
+    while True:
+        time.sleep(every)
+        if watch and not pid_alive(watch):
+            return "worker exited"
+        if not store.renew(key):
+            return "released"
+
+
+def heartbeat_all(store: ClaimStore, watch: int, every: float = None) -> str:
+    """
+    Renew every claim store.pid holds in the directory, whichever keys
+    come and go, until watch (a PID) exits. One of these serves a whole
+    shell loop, instead of one process per claim.
+    """
+    every = every or store.ttl / 3
+    while True:
+        time.sleep(every)
+        if not pid_alive(watch):
+            return "worker exited"
+        for key, info in store.claims().items():
+            if store.mine(info):
+                store.renew(key)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {"--pid": None, "--ttl": TTL, "--suffix": SUFFIX, "--while": None}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    if len(args) < 2:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+
+    all_claims = "--all" in args
+    args = [a for a in args if a != "--all"]
+    cmd, directory = args[0], args[1]
+    # From a shell, the claim belongs to the loop that asked, not to this process
+    pid = int(opts["--pid"]) if opts["--pid"] else os.getppid()
+    store = ClaimStore(directory, opts["--suffix"], float(opts["--ttl"]), pid)
+
+    if cmd == "acquire" and len(args) > 2:
+        sys.exit(0 if store.acquire(args[2]) else 1)
+    elif cmd == "heartbeat" and all_claims:
+        heartbeat_all(store, int(opts["--while"]) if opts["--while"] else pid)
+    elif cmd == "heartbeat" and len(args) > 2:
+        watch = int(opts["--while"]) if opts["--while"] else pid
+        heartbeat(store, args[2], watch)
+    elif cmd == "release" and len(args) > 2:
+        sys.exit(0 if store.release(args[2]) else 1)
+    elif cmd == "sweep":
+        for key, reason in store.sweep():
+            print(f"reclaimed {key} ({reason})")
+    elif cmd == "list":
+        now = time.time()
+        for key, info in sorted(store.claims().items()):
+            left = info["mtime"] + float(info["ttl"]) - now
+            state = store.stale(info, now) or f"{left:.0f}s left"
+            print(f"  {key:24s} pid {info.get('pid', '?')}@{info['host']}  {state}")
+    else:
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
@@ -18,77 +18,11 @@ import json
 import sys
 from datetime import datetime
 
+import knowledge
+
 
 # The six sins — what every civilization agrees on
-SINS = {
-    "HARM_CHILDREN": {
-        "name": "Harming children",
-        "tier": 3,
-        "keywords": [
-            "child abuse", "minor", "underage", "trafficking children",
-            "child labor", "child soldiers", "child marriage",
-            "pedophil", "sexual abuse of minors", "exploitation of children",
-            "trafficking of minor", "rape of minor", "grooming",
-            "young girls", "age 16", "age 17", "age 14", "age 15",
-            "sexual abuse", "sex trafficking",
-        ],
-    },
-    "MURDER": {
-        "name": "Murder of innocents",
-        "tier": 2,
-        "keywords": [
-            "war crime", "civilian casualties", "massacre", "assassination",
-            "extrajudicial", "torture", "bombing civilian", "genocide",
-            "ethnic cleansing", "crimes against humanity", "killed",
-            "murder", "death", "died", "lethal", "premature deaths",
-            "atrocit", "killed in",
-        ],
-    },
-    "THEFT": {
-        "name": "Theft from the powerless",
-        "tier": 1,
-        "keywords": [
-            "embezzlement", "corruption", "bribery", "stolen", "looted",
-            "offshore accounts", "shell companies", "money laundering",
-            "tax evasion", "fraud", "kleptocracy", "misappropriation",
-            "enrichment", "unexplained wealth",
-        ],
-    },
-    "SLAVERY": {
-        "name": "Slavery / forced labor",
-        "tier": 2,
-        "keywords": [
-            "forced labor", "slavery", "trafficking", "debt bondage",
-            "forced marriage", "human trafficking", "sweatshop",
-            "modern slavery", "indentured",
-        ],
-    },
-    "DESTROY_TRUTH": {
-        "name": "Destruction of truth",
-        "tier": 2,
-        "keywords": [
-            "censorship", "jailed journalist", "killed journalist",
-            "destroyed evidence", "cover-up", "classified", "sealed records",
-            "threatened witness", "NDA", "silenced", "propaganda",
-            "disinformation campaign", "media control", "denial",
-            "misled", "deceiving", "lied", "false", "misleading",
-            "funded denial", "hid the findings", "concealed",
-            "press freedom", "banned", "suppressed",
-        ],
-    },
-    "BETRAYAL": {
-        "name": "Betrayal of trust",
-        "tier": 1,
-        "keywords": [
-            "abuse of power", "oath of office", "conflict of interest",
-            "nepotism", "cronyism", "breach of duty", "violated oath",
-            "self-dealing", "insider", "position of trust",
-            "poor judgment", "sweetheart", "protected co-conspirators",
-            "plea deal", "settled", "stripped of", "resigned",
-            "failed to", "violated", "asbestos", "knew for decades",
-        ],
-    },
-}
+SINS = knowledge.SINS          # tools/data/sins.json
 
 EVIDENCE_GRADES = {
     "A":  "Court records, convictions, official legal findings",
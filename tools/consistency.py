@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+consistency.py — TASTE for the whole corpus. Said vs did, in one pass.
+
+Every record already lists what the person SAID and what they DID.
+This pairs them up and scores each pair, so TasteConsistency items no
+longer have to be written by hand.
+
+  similarity     cosine of the two statements (textvec.py vectors)
+  relevance      how on-topic the pair is: 0 up to MIN_SIMILARITY (below
+                 it a cosine is hash-collision noise), 1 from FULL_SIMILARITY
+  contradiction  same topic, opposite direction: one side negates
+                 ("does not attack"), or the two sides sit on opposite
+                 ends of a known opposition ("protect" vs "target"),
+                 scaled by relevance. Off-topic pairs never contradict.
+
+Per record this is two small matrix products: said x did for similarity,
+and said x did over signed opposition features for contradiction.
+Every statement vector is cached by hash, so a rescore after editing one
+record only embeds the lines that changed.
+
+The result is a PROPOSAL. consistency runs from -1 (they did the
+opposite) to 1 (they did what they said). A human confirms it.
+
+Run:
+  python3 tools/consistency.py              Proposals for every record
+  python3 tools/consistency.py --json       As TasteConsistency dicts
+
+Requires: numpy
+"""
+
+import json
+import sys
+from dataclasses import asdict
+
+import numpy as np
+
+from leader_transparency import TasteConsistency, date_hint
+from textvec import VectorCache, tokens
+
+
+NEGATIONS = frozenset("not no never nothing none nor without deny denies denied zero".split())
+
+# (upholds, violates). A statement that touches both ends counts as neither.
+OPPOSITIONS = [
+    (("protect", "defend", "safe", "save", "help", "care"),
+     ("attack", "harm", "kill", "target", "destroy", "bomb", "invad", "deport")),
+    (("free", "freedom", "democra", "independen", "rule of law", "respect"),
+     ("jail", "imprison", "censor", "shut", "ban", "suppress", "crush", "purg")),
+    (("peace", "short", "quick", "limited"),
+     ("war", "invasion", "full-scale", "years", "ongoing")),
+    (("honest", "transparen", "truth", "accurate"),
+     ("lie", "lied", "mislead", "misled", "false", "conceal", "cover", "denial", "deceiv")),
+    (("serve", "people", "public", "worker"),
+     ("enrich", "wealth", "palace", "stole", "embezzl", "bribe", "billion")),
+    (("clean", "green", "sustainab", "health"),
+     ("pollut", "contamina", "toxic", "emission", "cancer", "death")),
+    (("legal", "lawful", "complian", "innocent"),
+     ("convicted", "fraud", "indict", "charged", "fine", "guilty", "settle")),
+]
+
+# Cosine below which a pair is off-topic, and at which it counts as fully on-topic.
+# Hashed vectors of unrelated statements reach ~0.14 by collision alone.
+MIN_SIMILARITY = 0.15
+FULL_SIMILARITY = 0.35
+MIN_RELEVANCE = 0.05
+
+
+def _has(words: list, text: str, stem: str) -> bool:
+    return stem in text if " " in stem else any(w.startswith(stem) for w in words)
+
+
+def opposition_features(texts: list) -> np.ndarray:
+    """Per statement, per opposition: +1 upholds, -1 violates, 0 neither."""
+    out = np.zeros((len(texts), len(OPPOSITIONS)), dtype=np.float32)
+    for i, text in enumerate(texts):
+        words, low = tokens(text), text.lower()
+        for k, (up, down) in enumerate(OPPOSITIONS):
+            u = any(_has(words, low, s) for s in up)
+            d = any(_has(words, low, s) for s in down)
+            out[i, k] = float(u) - float(d)
+    return out
+
+
+def negated(texts: list) -> np.ndarray:
+    """1 where a statement negates itself ("does not", "never"), else 0."""
+    return np.array([any(w in NEGATIONS for w in tokens(t)) for t in texts], dtype=np.float32)
+
+
+def relevance(similarity: np.ndarray) -> np.ndarray:
+    """0..1: 0 up to MIN_SIMILARITY, rising to 1 at FULL_SIMILARITY."""
+    return np.clip((similarity - MIN_SIMILARITY) / (FULL_SIMILARITY - MIN_SIMILARITY), 0, 1)
+
+
+def score_pairs(said_vec, did_vec, said_opp, did_opp, said_neg, did_neg) -> tuple:
+    """
+    (similarity, contradiction), each shaped (len(said), len(did)).
+    contradiction is 0..relevance: how strongly an on-topic pair points
+    in opposite directions.
+    """
+    similarity = said_vec @ did_vec.T
+    # Opposite signs on the same opposition give a negative product
+    opposed = np.clip(-(said_opp @ did_opp.T), 0, None)
+    opposed = np.minimum(opposed, 1.0)
+    flipped = np.abs(said_neg[:, None] - did_neg[None, :])
+    return similarity, np.maximum(opposed, flipped) * relevance(similarity)
+
+
+def consistency_matrix(similarity: np.ndarray, contradiction: np.ndarray) -> np.ndarray:
+    """-1..1: on-topic and contradicted -> negative, on-topic and aligned -> positive."""
+    return relevance(similarity) - 2.0 * contradiction
+
+
+class ConsistencyEngine:
+    """Batch said-vs-did scoring across the corpus, vectors cached by hash."""
+
+    def __init__(self, cache: VectorCache = None):
+        self.cache = cache or VectorCache()
+
+    def score_corpus(self, records: list) -> list:
+        """
+        [(record, similarity, contradiction, consistency)] per record.
+        All statements are embedded in one batch; each record is then
+        sliced out and scored with matrix products.
+        """
+        said_all, did_all, spans = [], [], []
+        for r in records:
+            said, did = r.get("said", []), r.get("did", [])
+            spans.append((len(said_all), len(said), len(did_all), len(did)))
+            said_all.extend(said)
+            did_all.extend(did)
+
+        said_vec = self.cache.vectors(said_all)
+        did_vec = self.cache.vectors(did_all)
+        said_opp, did_opp = opposition_features(said_all), opposition_features(did_all)
+        said_neg, did_neg = negated(said_all), negated(did_all)
+
+        out = []
+        for r, (s0, ns, d0, nd) in zip(records, spans):
+            s, d = slice(s0, s0 + ns), slice(d0, d0 + nd)
+            sim, con = score_pairs(said_vec[s], did_vec[d], said_opp[s], did_opp[d],
+                                   said_neg[s], did_neg[d])
+            out.append((r, sim, con, consistency_matrix(sim, con)))
+        return out
+
+    def propose(self, records: list, min_relevance: float = MIN_RELEVANCE) -> dict:
+        """
+        {record name: [TasteConsistency]} — for each SAID line, the DID line
+        that bears on it most, with a proposed consistency score.
+        """
+        proposals = {}
+        for r, sim, con, cons in self.score_corpus(records):
+            if not sim.size:
+                continue
+            items = []
+            source = (r.get("sources") or ["public record"])[0]
+            rel = relevance(sim)
+            best = rel.argmax(axis=1)
+            for i, j in enumerate(best):
+                if rel[i, j] < min_relevance:
+                    continue
+                said, did = r["said"][i], r["did"][j]
+                items.append(TasteConsistency(
+                    claim=said, claim_date=date_hint(said), claim_source="public statement",
+                    reality=did, reality_date=date_hint(did), reality_source=source,
+                    consistency=round(float(cons[i, j]), 3),
+                ))
+            proposals[r["name"]] = items
+        return proposals
+
+
+if __name__ == "__main__":
+    from corpus import load_all_records
+
+    engine = ConsistencyEngine()
+    proposals = engine.propose(load_all_records())
+
+    if "--json" in sys.argv:
+        print(json.dumps({k: [asdict(t) for t in v] for k, v in proposals.items()}, indent=2))
+        sys.exit(0)
+
+    print("TASTE — proposed consistency checks")
+    print(f"  {sum(len(v) for v in proposals.values())} pairs across {len(proposals)} records "
+          f"(vectors: {engine.cache.hits} cached, {engine.cache.misses} new)\n")
+    for name, items in proposals.items():
+        if not items:
+            continue
+        print(f"  {name}")
+        for t in items:
+            label = "CONSISTENT" if t.consistency > 0.5 else (
+                "INCONSISTENT" if t.consistency < -0.5 else "MIXED")
+            print(f"    [{label} {t.consistency:+.2f}] Said: \"{t.claim}\"")
+            print(f"    {'':>{len(label) + 8}} Did: {t.reality}")
+        print()
+    print("Proposals. A human confirms each one.")
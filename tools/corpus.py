@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+corpus.py — The whole corpus at once. Columns, not records.
+
+Every record in records/*.json becomes one row. Evidence grades, sense
+counts and pattern strengths are held in NumPy arrays, so scoring every
+record is a handful of array operations instead of a Python loop per record.
+
+Output: docs/dashboard.json — visibility, grade-weighted confidence,
+percentiles and per-country totals, for the site generators to read.
+
+Run: python3 tools/corpus.py
+Requires: numpy
+"""
+
+import json
+import glob
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+# to_accountability and date_hint live with the record types, so leader_transparency never imports us
+from leader_transparency import EvidenceGrade, date_hint, to_accountability  # noqa: F401  (re-exported)
+
+
+SENSES = ("sight", "hearing", "smell", "taste", "touch")
+
+# Grade codes in a fixed order. An item's grade is stored as an index into this.
+GRADE_CODES = tuple(g.value for g in EvidenceGrade)
+GRADE_WEIGHTS = np.array([g.weight() for g in EvidenceGrade])
+HIGH_GRADE = np.array([code in ("A", "A-", "B") for code in GRADE_CODES])
+_GRADE_INDEX = {code: i for i, code in enumerate(GRADE_CODES)}
+_UNVERIFIED = _GRADE_INDEX["D"]
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+# === Loading ===
+
+def load_all_records(pattern: str = "records/*.json", collapse: bool = False) -> list:
+    """
+    Load all JSON records (skipping the composite examples).
+    collapse=True merges same-name records and drops near-duplicate
+    statements inside each one (see dedupe.py).
+    """
+    records = []
+    for path in sorted(glob.glob(pattern)):
+        if "examples" in path:
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            records.extend(data)
+        else:
+            records.append(data)
+    if collapse:
+        from dedupe import collapse_records
+        records = collapse_records(records)
+    return records
+
+
+def grade_index(grade: str) -> int:
+    """Position of a grade in GRADE_CODES. Unknown grades count as unverified."""
+    return _GRADE_INDEX.get(grade, _UNVERIFIED)
+
+
+# === Columnar view ===
+
+@dataclass
+class CorpusView:
+    """
+    One row per record, one array per column.
+
+    Evidence (SIGHT + HEARING) and patterns (SMELL) are flattened into item
+    arrays that carry the index of the record they belong to, so per-record
+    totals are a single np.bincount.
+    """
+    names: list
+    countries: list            # Unique country names
+    country_idx: np.ndarray    # (n,) index into countries
+    senses: np.ndarray         # (n, 5) item counts in SENSES order
+    concerns: np.ndarray       # (n,) concerns flagged
+    item_record: np.ndarray    # (m,) record index of each evidence item
+    item_grade: np.ndarray     # (m,) grade index of each evidence item
+    smell_record: np.ndarray   # (k,) record index of each pattern
+    smell_strength: np.ndarray  # (k,) match strength of each pattern
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records: list) -> "CorpusView":
+        """Build from AccountabilityRecords. The only per-item Python loop."""
+        names, country_idx, senses, concerns = [], [], [], []
+        item_record, item_grade = [], []
+        smell_record, smell_strength = [], []
+        country_pos = {}
+        for i, rec in enumerate(records):
+            names.append(rec.name)
+            country_idx.append(country_pos.setdefault(rec.country, len(country_pos)))
+            senses.append([len(getattr(rec, s)) for s in SENSES])
+            concerns.append(len(rec.concerns))
+            for item in rec.sight + rec.hearing:
+                item_record.append(i)
+                item_grade.append(grade_index(item.grade))
+            for p in rec.smell:
+                smell_record.append(i)
+                smell_strength.append(p.match_strength)
+        return cls(
+            names=names,
+            countries=list(country_pos),
+            country_idx=np.array(country_idx, dtype=np.int64),
+            senses=np.array(senses, dtype=np.int64).reshape(-1, len(SENSES)),
+            concerns=np.array(concerns, dtype=np.int64),
+            item_record=np.array(item_record, dtype=np.int64),
+            item_grade=np.array(item_grade, dtype=np.int64),
+            smell_record=np.array(smell_record, dtype=np.int64),
+            smell_strength=np.array(smell_strength, dtype=np.float64),
+        )
+
+    def _per_record(self, index: np.ndarray, weights=None) -> np.ndarray:
+        return np.bincount(index, weights=weights, minlength=len(self)).astype(np.float64)
+
+    def visibility(self) -> dict:
+        """compute_visibility_score() for every record at once, as arrays."""
+        total = self.senses[:, 0] + self.senses[:, 1]
+        high = self._per_record(self.item_record, HIGH_GRADE[self.item_grade])
+        n_smell = self.senses[:, 2]
+        strength = self._per_record(self.smell_record, self.smell_strength)
+        return {
+            "total_evidence_items": total,
+            "high_grade_items": high.astype(np.int64),
+            "evidence_quality_ratio": np.divide(high, total, out=np.zeros(len(self)), where=total > 0),
+            "pattern_coverage": np.round(
+                np.divide(strength, n_smell, out=np.zeros(len(self)), where=n_smell > 0), 3),
+            "consistency_checks": self.senses[:, 3],
+            "impacts_mapped": self.senses[:, 4],
+            "concerns_flagged": self.concerns,
+            "opacity_warning": total < 5,
+        }
+
+    def confidence(self) -> np.ndarray:
+        """Mean EvidenceGrade weight of each record's evidence. 0 with no evidence."""
+        weighted = self._per_record(self.item_record, GRADE_WEIGHTS[self.item_grade])
+        total = self.senses[:, 0] + self.senses[:, 1]
+        return np.divide(weighted, total, out=np.zeros(len(self)), where=total > 0)
+
+    def visibility_score(self) -> np.ndarray:
+        """
+        One number per record, 0..1: how much is known and how good it is.
+        Confidence times evidence count on a log scale, relative to the best-documented record.
+        """
+        total = self.visibility()["total_evidence_items"]
+        if len(total) == 0:
+            return np.zeros(0)
+        depth = np.log1p(total) / np.log1p(max(int(total.max()), 5))
+        return self.confidence() * depth
+
+    def by_country(self, values: dict) -> dict:
+        """Per-country record count, and sum and mean of each named column."""
+        k = len(self.countries)
+        counts = np.bincount(self.country_idx, minlength=k)
+        out = {}
+        for c, country in enumerate(self.countries):
+            out[country] = {"records": int(counts[c])}
+        for key, col in values.items():
+            sums = np.bincount(self.country_idx, weights=col, minlength=k)
+            for c, country in enumerate(self.countries):
+                out[country][f"{key}_sum"] = round(float(sums[c]), 4)
+                out[country][f"{key}_mean"] = round(float(sums[c] / counts[c]), 4)
+        return out
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Share of the corpus (0-100) scoring at or below each value."""
+    if len(values) == 0:
+        return np.zeros(0)
+    ordered = np.sort(values)
+    return np.searchsorted(ordered, values, side="right") * 100.0 / len(values)
+
+
+def summary(values: np.ndarray) -> dict:
+    """Fixed percentiles of a column."""
+    if len(values) == 0:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    return {f"p{p}": round(float(v), 4) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+# === Dashboard ===
+
+def build_dashboard(view: CorpusView) -> dict:
+    """Everything the site needs, as plain JSON types."""
+    vs = view.visibility()
+    visibility = view.visibility_score()
+    confidence = view.confidence()
+    vis_pct = percentile_rank(visibility)
+    conf_pct = percentile_rank(confidence)
+
+    rows = []
+    for i, name in enumerate(view.names):
+        rows.append({
+            "name": name,
+            "country": view.countries[view.country_idx[i]],
+            "visibility": round(float(visibility[i]), 4),
+            "visibility_percentile": round(float(vis_pct[i]), 1),
+            "confidence": round(float(confidence[i]), 4),
+            "confidence_percentile": round(float(conf_pct[i]), 1),
+            "evidence_items": int(vs["total_evidence_items"][i]),
+            "high_grade_items": int(vs["high_grade_items"][i]),
+            "senses": dict(zip(SENSES, (int(x) for x in view.senses[i]))),
+            "opacity_warning": bool(vs["opacity_warning"][i]),
+        })
+
+    return {
+        "records": len(view),
+        "evidence_items": int(len(view.item_record)),
+        "percentiles": {
+            "visibility": summary(visibility),
+            "confidence": summary(confidence),
+        },
+        "countries": view.by_country({
+            "visibility": visibility,
+            "confidence": confidence,
+            "evidence": vs["total_evidence_items"].astype(np.float64),
+        }),
+        "people": rows,
+    }
+
+
+if __name__ == "__main__":
+    out_path = "docs/dashboard.json"
+    if len(sys.argv) > 2 and sys.argv[1] == "--out":
+        out_path = sys.argv[2]
+
+    records = [to_accountability(r) for r in load_all_records()]
+    view = CorpusView.from_records(records)
+    dashboard = build_dashboard(view)
+    with open(out_path, "w") as f:
+        json.dump(dashboard, f, indent=2)
+    print(f"Generated {out_path} — {len(view)} records, "
+          f"{dashboard['evidence_items']} evidence items, "
+          f"{len(view.countries)} countries")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+corroboration.py — Who backs up whom. HEARING as a graph.
+
+Every source of testimony is a node. Every entry in
+HearingTestimony.corroborated_by is an edge: corroborator -> corroborated.
+
+Trust starts at the EvidenceGrade weight of what a source reported, then
+flows along the edges. Being confirmed by a court record lifts a rumor;
+being confirmed by another rumor lifts it a little. Corroboration never
+lowers trust — silence is not evidence against.
+
+    trust[i] = seed[i] + (1 - seed[i]) * damping * P(any corroborator is right)
+
+P is a noisy-OR over the corroborators' trust. It is computed as a sparse
+matrix-vector product (np.bincount over the edge arrays) and iterated to a
+fixed point, so it scales with the number of edges, not nodes squared.
+
+Testimony can be added at any time. The next propagation starts from the
+previous trust, and only items whose sources moved are rescored.
+
+Run: python3 tools/corroboration.py [top_n]
+Requires: numpy
+"""
+
+import sys
+
+import numpy as np
+
+from leader_transparency import EvidenceGrade, HearingTestimony
+from corpus import grade_index, GRADE_WEIGHTS, load_all_records, to_accountability
+
+
+# A source that is only named as a corroborator, never heard from directly
+UNHEARD_WEIGHT = EvidenceGrade.UNVERIFIED.weight()
+
+_EPS = 1e-12
+
+
+def source_key(name: str) -> str:
+    """Normalize a source name so "UN OHCHR" and "un  ohchr" are one node."""
+    return " ".join(name.lower().split())
+
+
+def _noisy_or(index: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """1 - prod(1 - values) grouped by index, as one sparse sum in log space."""
+    logs = np.log1p(-np.minimum(values, 1.0 - _EPS))
+    return 1.0 - np.exp(np.bincount(index, weights=logs, minlength=n))
+
+
+class CorroborationGraph:
+    """Sources as nodes, corroborations as edges, trust by propagation."""
+
+    def __init__(self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100):
+        self.damping = damping
+        self.tol = tol
+        self.max_iter = max_iter
+
+        self.names = []            # Display name per node
+        self._node = {}            # source_key -> node id
+        self._seed = []            # Best grade weight heard from each node
+        self._edges = set()        # (src, dst) node pairs, deduplicated
+
+        self.items = []            # (record, HearingTestimony) per item
+        self._item_weight = []     # Grade weight of the item itself
+        self._item_corr = []       # (item, node) pairs for corroborators
+
+        # Results of the last propagation
+        self._trust = np.zeros(0)
+        self._scores = np.zeros(0)
+        self._scored = 0           # Items scored so far
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    # --- Building ---
+
+    def _node_id(self, name: str) -> int:
+        key = source_key(name)
+        if key not in self._node:
+            self._node[key] = len(self.names)
+            self.names.append(name.strip())
+            self._seed.append(UNHEARD_WEIGHT)
+        return self._node[key]
+
+    def add(self, testimony: HearingTestimony, record: str = "") -> int:
+        """Add one piece of testimony. Returns its item id."""
+        item = len(self.items)
+        node = self._node_id(testimony.outlet_or_context)
+        weight = float(GRADE_WEIGHTS[grade_index(testimony.grade)])
+        self._seed[node] = max(self._seed[node], weight)
+
+        self.items.append((record, testimony))
+        self._item_weight.append(weight)
+        for other in testimony.corroborated_by:
+            src = self._node_id(other)
+            if src == node:
+                continue
+            self._edges.add((src, node))
+            self._item_corr.append((item, src))
+        self._dirty = True
+        return item
+
+    def add_record(self, rec) -> None:
+        """Add every HEARING item of an AccountabilityRecord."""
+        for h in rec.hearing:
+            self.add(h, rec.name)
+
+    @classmethod
+    def from_records(cls, records: list, **kwargs) -> "CorroborationGraph":
+        graph = cls(**kwargs)
+        for rec in records:
+            graph.add_record(rec)
+        return graph
+
+    # --- Scoring ---
+
+    def _edge_arrays(self):
+        if not self._edges:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        pairs = np.array(sorted(self._edges), dtype=np.int64)
+        return pairs[:, 0], pairs[:, 1]
+
+    def propagate(self) -> np.ndarray:
+        """Trust per node. Warm-starts from the previous result."""
+        n = len(self.names)
+        seed = np.array(self._seed, dtype=np.float64)
+        src, dst = self._edge_arrays()
+
+        # Adding testimony only adds edges or raises seeds, so the old trust
+        # is still a lower bound of the new fixed point.
+        prev = np.zeros(n)
+        prev[:len(self._trust)] = self._trust
+        trust = np.maximum(prev, seed)
+
+        for _ in range(self.max_iter):
+            lifted = seed + (1.0 - seed) * self.damping * _noisy_or(dst, trust[src], n)
+            delta = np.abs(lifted - trust).max() if n else 0.0
+            trust = lifted
+            if delta < self.tol:
+                break
+
+        changed = np.ones(n, dtype=bool)
+        changed[:len(self._trust)] = np.abs(trust[:len(self._trust)] - self._trust) > self.tol
+        self._trust = trust
+        self._rescore(changed)
+        self._dirty = False
+        return trust
+
+    def _rescore(self, changed: np.ndarray) -> None:
+        """Recompute item scores, but only where a corroborator they name moved."""
+        m = len(self.items)
+        weight = np.array(self._item_weight, dtype=np.float64)
+        corr = np.array(self._item_corr, dtype=np.int64).reshape(-1, 2)
+
+        dirty = np.zeros(m, dtype=bool)
+        dirty[self._scored:] = True
+        dirty[corr[changed[corr[:, 1]], 0]] = True
+        if not dirty.any():
+            return
+
+        # An item is scored like a node: its own grade, lifted by the
+        # corroborators it names.
+        idx = np.flatnonzero(dirty)
+        pos = np.full(m, -1, dtype=np.int64)
+        pos[idx] = np.arange(len(idx))
+        rows = corr[dirty[corr[:, 0]]]
+        support = _noisy_or(pos[rows[:, 0]], self._trust[rows[:, 1]], len(idx))
+
+        scores = np.zeros(m)
+        scores[:len(self._scores)] = self._scores
+        scores[idx] = weight[idx] + (1.0 - weight[idx]) * self.damping * support
+        self._scores = scores
+        self._scored = m
+
+    def trust(self, source: str) -> float:
+        """Propagated trust of one source (0 if never seen)."""
+        if self._dirty:
+            self.propagate()
+        node = self._node.get(source_key(source))
+        return float(self._trust[node]) if node is not None else 0.0
+
+    def item_scores(self) -> np.ndarray:
+        """Score per testimony item, in the order they were added."""
+        if self._dirty:
+            self.propagate()
+        return self._scores
+
+    def top_sources(self, n: int = 10) -> list:
+        """[(name, trust, seed)] for the most trusted sources."""
+        if self._dirty:
+            self.propagate()
+        order = np.argsort(-self._trust, kind="stable")[:n]
+        return [(self.names[i], float(self._trust[i]), self._seed[i]) for i in order]
+
+
+if __name__ == "__main__":
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+
+    records = [to_accountability(r) for r in load_all_records()]
+    graph = CorroborationGraph.from_records(records)
+    graph.propagate()
+
+    print("CORROBORATION GRAPH")
+    print(f"  {len(graph)} sources, {graph.edge_count} corroborations, "
+          f"{len(graph.items)} testimony items\n")
+    print("Most corroborated sources:")
+    for name, trust, seed in graph.top_sources(top_n):
+        print(f"  {trust:.3f}  (grade {seed:.2f})  {name}")
+    print("\nTrust comes from what backs you up. Not from who you are.")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+dedupe.py — Same fact, said twice. Find it once.
+
+The same facts turn up in more than one place: re-entered with small wording
+changes, copied between network files, listed under both FACTS and DID.
+This finds them without comparing every statement to every other.
+
+  1. Each statement becomes a set of character shingles.
+  2. MinHash squeezes each set into a short signature (NumPy, batched).
+  3. LSH cuts signatures into bands. Statements that share a band land in
+     the same bucket. Only bucket-mates are compared.
+
+Roughly linear in the number of statements instead of quadratic.
+
+Run:
+  python3 tools/dedupe.py              Dedupe report for records/*.json
+  python3 tools/dedupe.py 0.6          Stricter threshold
+  python3 tools/dedupe.py --json       Machine-readable report
+
+Requires: numpy
+"""
+
+import json
+import re
+import sys
+import zlib
+
+import numpy as np
+
+from leader_transparency import AccountabilityRecord
+
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+# Shingles hashed per batch before taking the minimum; bounds memory to
+# about CHUNK * num_perm * 8 bytes.
+CHUNK = 1 << 15
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: a well-spread 64-bit hash of each value."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def normalize(text: str) -> str:
+    """Lowercase words only. "Shut down ALL media." == "shut down all media"."""
+    return " ".join(_WORDS.findall(text.lower()))
+
+
+def shingles(text: str, k: int = 4) -> np.ndarray:
+    """Hashed character k-grams of the normalized text."""
+    s = normalize(text)
+    if len(s) <= k:
+        grams = {s} if s else set()
+    else:
+        grams = {s[i:i + k] for i in range(len(s) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class NearDuplicateIndex:
+    """MinHash signatures + banded LSH over a growing set of statements."""
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 128, bands: int = 32,
+                 k: int = 4, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.k = k
+
+        rng = np.random.default_rng(seed)
+        self._salt = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self._mix = rng.integers(1, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.texts = []
+        self.refs = []
+        # Rows are written into preallocated buffers that double when full,
+        # so adding one text at a time does not copy everything indexed so far
+        self._sig_buf = np.zeros((16, num_perm), dtype=np.uint64)
+        self._key_buf = np.zeros((16, bands), dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.texts)
+
+    @property
+    def _sigs(self) -> np.ndarray:
+        return self._sig_buf[:len(self.texts)]
+
+    @property
+    def _keys(self) -> np.ndarray:
+        return self._key_buf[:len(self.texts)]
+
+    def _reserve(self, n: int):
+        cap = len(self._sig_buf)
+        if n <= cap:
+            return
+        while cap < n:
+            cap *= 2
+        used = len(self.texts)
+        for name in ("_sig_buf", "_key_buf"):
+            old = getattr(self, name)
+            grown = np.zeros((cap, old.shape[1]), dtype=old.dtype)
+            grown[:used] = old[:used]
+            setattr(self, name, grown)
+
+    def signatures(self, texts: list) -> np.ndarray:
+        """MinHash signature per text, shape (len(texts), num_perm)."""
+        sets = [shingles(t, self.k) for t in texts]
+        sigs = np.full((len(sets), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        start = 0
+        while start < len(sets):
+            # Whole texts per chunk, so reduceat never straddles a boundary
+            stop, size = start, 0
+            while stop < len(sets) and (size == 0 or size + len(sets[stop]) <= CHUNK):
+                size += len(sets[stop])
+                stop += 1
+            batch = [s for s in sets[start:stop] if len(s)]
+            if batch:
+                rows = [i for i in range(start, stop) if len(sets[i])]
+                flat = np.concatenate(batch)
+                hashed = _mix64(flat[:, None] ^ self._salt)
+                offsets = np.cumsum([0] + [len(s) for s in batch[:-1]])
+                sigs[rows] = np.minimum.reduceat(hashed, offsets, axis=0)
+            start = stop
+        return sigs
+
+    def _band_keys(self, sigs: np.ndarray) -> np.ndarray:
+        """One 64-bit key per band: the band's rows mixed together."""
+        banded = sigs.reshape(len(sigs), self.bands, self.rows)
+        with np.errstate(over="ignore"):
+            return (banded * self._mix).sum(axis=2, dtype=np.uint64)
+
+    def add_many(self, texts: list, refs: list = None) -> range:
+        """Index a batch of statements. Returns their ids."""
+        refs = refs if refs is not None else [None] * len(texts)
+        sigs = self.signatures(texts)
+        first = len(self.texts)
+        self._reserve(first + len(texts))
+        self._sig_buf[first:first + len(texts)] = sigs
+        self._key_buf[first:first + len(texts)] = self._band_keys(sigs)
+        self.texts.extend(texts)
+        self.refs.extend(refs)
+        return range(first, len(self.texts))
+
+    def add(self, text: str, ref=None) -> int:
+        return self.add_many([text], [ref])[0]
+
+    def similarity(self, i: int, j: int) -> float:
+        """Estimated Jaccard similarity: share of signature slots that agree."""
+        return float((self._sigs[i] == self._sigs[j]).mean())
+
+    def query(self, text: str) -> list:
+        """[(id, similarity)] of indexed statements near this text, best first."""
+        sig = self.signatures([text])
+        keys = self._band_keys(sig)[0]
+        candidates = np.flatnonzero((self._keys == keys).any(axis=1))
+        sims = (self._sigs[candidates] == sig[0]).mean(axis=1)
+        keep = sims >= self.threshold
+        order = np.argsort(-sims[keep], kind="stable")
+        return [(int(candidates[keep][o]), float(sims[keep][o])) for o in order]
+
+    def clusters(self) -> list:
+        """Groups of statement ids (2+) that are near-duplicates of each other."""
+        parent = list(range(len(self.texts)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        # Empty statements hash to the sentinel signature; never group them
+        usable = (self._sigs != np.iinfo(np.uint64).max).any(axis=1)
+        for band in range(self.bands):
+            keys = self._keys[:, band]
+            order = np.argsort(keys, kind="stable")
+            order = order[usable[order]]
+            sorted_keys = keys[order]
+            # Each bucket member is checked against the bucket's first member
+            starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+            heads = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+            pairs = np.flatnonzero(~starts)
+            if not len(pairs):
+                continue
+            a, b = heads[pairs], order[pairs]
+            sims = (self._sigs[a] == self._sigs[b]).mean(axis=1)
+            for x, y in zip(a[sims >= self.threshold], b[sims >= self.threshold]):
+                rx, ry = find(int(x)), find(int(y))
+                if rx != ry:
+                    parent[max(rx, ry)] = min(rx, ry)
+
+        groups = {}
+        for i in range(len(self.texts)):
+            groups.setdefault(find(i), []).append(i)
+        return [g for g in groups.values() if len(g) > 1]
+
+
+# === Corpus ===
+
+def statements(records: list) -> list:
+    """[(record name, field, text)] for facts, did and evidence summaries."""
+    out = []
+    for r in records:
+        if isinstance(r, AccountabilityRecord):
+            out.extend((r.name, "sight", s.summary) for s in r.sight)
+            out.extend((r.name, "hearing", h.summary) for h in r.hearing)
+            out.extend((r.name, "touch", t.decision) for t in r.touch)
+            continue
+        for fld in ("facts", "did"):
+            out.extend((r["name"], fld, t) for t in r.get(fld, []))
+        for e in r.get("evidence", []):
+            if isinstance(e, dict) and e.get("summary"):
+                out.append((r["name"], "evidence", e["summary"]))
+    return out
+
+
+def build_index(records: list, threshold: float = 0.5) -> NearDuplicateIndex:
+    index = NearDuplicateIndex(threshold=threshold)
+    stmts = statements(records)
+    index.add_many([t for _, _, t in stmts], [(name, fld) for name, fld, _ in stmts])
+    return index
+
+
+def dedupe_report(records: list, threshold: float = 0.5) -> dict:
+    """Every near-duplicate group in the corpus, where each copy lives."""
+    index = build_index(records, threshold)
+    groups = []
+    for ids in index.clusters():
+        head = ids[0]
+        groups.append({
+            "text": index.texts[head],
+            "copies": [
+                {"record": index.refs[i][0], "field": index.refs[i][1],
+                 "text": index.texts[i], "similarity": round(index.similarity(head, i), 3)}
+                for i in ids
+            ],
+        })
+    groups.sort(key=lambda g: -len(g["copies"]))
+    return {
+        "threshold": threshold,
+        "statements": len(index),
+        "groups": len(groups),
+        "redundant": sum(len(g["copies"]) - 1 for g in groups),
+        "duplicates": groups,
+    }
+
+
+def collapse_records(records: list, threshold: float = 0.5) -> list:
+    """
+    Records with duplicate work removed.
+
+    Records for the same name are merged into one. Inside a record, a
+    statement that near-duplicates an earlier one is dropped (DID is kept
+    over FACTS, since DID is what gets shown). Statements about different
+    people are never merged, even when they read the same.
+    """
+    merged, order = {}, []
+    for r in records:
+        key = normalize(r["name"])
+        if key not in merged:
+            merged[key] = {k: (list(v) if isinstance(v, list) else v) for k, v in r.items()}
+            order.append(key)
+            continue
+        into = merged[key]
+        for fld in ("said", "did", "facts", "sources"):
+            into.setdefault(fld, []).extend(x for x in r.get(fld, []) if x not in into[fld])
+
+    out = []
+    for key in order:
+        r = merged[key]
+        index = NearDuplicateIndex(threshold=threshold)
+        for fld in ("did", "facts", "said"):
+            if fld == "said":
+                index = NearDuplicateIndex(threshold=threshold)  # Quotes vs quotes only
+            kept = []
+            for text in r.get(fld, []):
+                if not index.query(text):
+                    kept.append(text)
+                    index.add(text)
+            if fld in r:
+                r[fld] = kept
+        out.append(r)
+    return out
+
+
+if __name__ == "__main__":
+    from corpus import load_all_records
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    threshold = float(args[0]) if args else 0.5
+    report = dedupe_report(load_all_records(), threshold)
+
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+
+    print("NEAR-DUPLICATE REPORT")
+    print(f"  {report['statements']} statements, {report['groups']} groups, "
+          f"{report['redundant']} redundant copies (threshold {threshold})\n")
+    for g in report["duplicates"]:
+        head = g["copies"][0]
+        print(f"  {head['record']} [{head['field']}]: {head['text']}")
+        for c in g["copies"][1:]:
+            print(f"    ~{c['similarity']:.0%}  {c['record']} [{c['field']}]: {c['text']}")
+        print()
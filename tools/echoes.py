@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+echoes.py — SAID, matched against how every bad choice was sold before.
+
+consequence_sim.py lists what each choice sounds like when it is sold:
+"Special military operation", "Only I can fix it", "Fake news is
+dangerous". The records list what leaders actually said. This joins the
+two.
+
+Every SAID quote and every sounds_like phrase becomes a textvec.py
+vector. Quotes are taken in fixed-size chunks; each chunk is one matrix
+multiply against all phrases, then a threshold and a top-k. Memory stays
+at one chunk of vectors however large the corpus grows, and quote vectors
+are cached by hash, so a rerun only embeds new quotes.
+
+Each record comes back with "echoes": the precedents its words repeat.
+A match is a flag for a human to read, not a verdict.
+
+Run:
+  python3 tools/echoes.py              Echoes per record
+  python3 tools/echoes.py 0.4          Stricter threshold
+  python3 tools/echoes.py --json       Annotated records
+
+Requires: numpy
+"""
+
+import json
+import sys
+
+import numpy as np
+
+from textvec import VectorCache
+
+
+THRESHOLD = 0.3
+TOP_K = 3
+CHUNK = 4096          # Quotes per matrix multiply: CHUNK x DIM float32 in memory
+
+
+def sounds_like_phrases(database: dict) -> list:
+    """[(choice key, phrase)] for every sounds_like line."""
+    return [(key, s) for key, entry in database.items() for s in entry.get("sounds_like", [])]
+
+
+def iter_quotes(records):
+    """(record index, quote) for every SAID line, streamed."""
+    for i, r in enumerate(records):
+        for q in r.get("said", []):
+            yield i, q
+
+
+def _chunks(iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def join(quotes, phrases: list, cache: VectorCache = None,
+         threshold: float = THRESHOLD, top: int = TOP_K, chunk: int = CHUNK):
+    """
+    Stream (record index, quote, choice key, phrase, similarity) for every
+    quote/phrase pair at or above threshold, at most `top` per quote.
+    quotes: iterable of (record index, quote), consumed one chunk at a time.
+    """
+    cache = cache or VectorCache()
+    if not phrases:
+        return
+    phrase_vec = cache.vectors([p for _, p in phrases])
+    top = min(top, len(phrases))
+
+    for batch in _chunks(quotes, chunk):
+        sim = cache.vectors([q for _, q in batch]) @ phrase_vec.T
+        # Top-k per row without a full sort, then keep what clears the bar
+        best = np.argpartition(-sim, top - 1, axis=1)[:, :top]
+        best_sim = np.take_along_axis(sim, best, axis=1)
+        rows, cols = np.nonzero(best_sim >= threshold)
+        order = np.lexsort((-best_sim[rows, cols], rows))
+        for r, c in zip(rows[order], cols[order]):
+            rec, quote = batch[r]
+            key, phrase = phrases[best[r, c]]
+            yield rec, quote, key, phrase, round(float(best_sim[r, c]), 3)
+
+
+def annotate(records: list, database: dict, **kwargs) -> list:
+    """Copies of records, each with "echoes": [{said, choice, sounds_like, similarity}]."""
+    out = [dict(r, echoes=[]) for r in records]
+    for rec, quote, key, phrase, sim in join(iter_quotes(records), sounds_like_phrases(database), **kwargs):
+        out[rec]["echoes"].append({
+            "said": quote, "choice": key, "sounds_like": phrase, "similarity": sim,
+        })
+    return out
+
+
+if __name__ == "__main__":
+    from consequence_sim import PRECEDENT_DATABASE
+    from corpus import load_all_records
+
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    if as_json:
+        args.remove("--json")
+    threshold = float(args[0]) if args else THRESHOLD
+
+    cache = VectorCache()
+    records = annotate(load_all_records(), PRECEDENT_DATABASE, cache=cache, threshold=threshold)
+
+    if as_json:
+        print(json.dumps(records, indent=2))
+        sys.exit(0)
+
+    hits = [r for r in records if r["echoes"]]
+    print(f"ECHOES — SAID quotes that repeat a known sales pitch (threshold {threshold})")
+    print(f"  {sum(len(r['echoes']) for r in hits)} echoes in {len(hits)} of {len(records)} records "
+          f"(vectors: {cache.hits} cached, {cache.misses} new)\n")
+    for r in hits:
+        print(f"  {r['name']}")
+        for e in r["echoes"]:
+            print(f"    [{e['similarity']:.2f}] \"{e['said']}\"")
+            print(f"           sounds like \"{e['sounds_like']}\" -> {e['choice']}")
+        print()
+    print("Flags, not verdicts. Read the quote in context.")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+entities.py — TOUCH, counted. Who keeps getting hurt?
+
+TouchImpact.beneficiaries and .harmed are free strings: "civilians",
+"Workers", "family members", "the workers". The same groups appear in
+decision after decision, record after record.
+
+Each name is normalized and interned once into an integer id. Every
+impact is then three small integers — decision, entity, benefited or
+harmed — held in compact arrays. Questions like "who is harmed most by
+irreversible global decisions?" are one masked np.bincount.
+
+Memory grows with the number of distinct groups and edges, not with how
+many times a name is repeated.
+
+The corpus (records/*.json) is flat SAID/DID cards. to_accountability()
+turns each "did" line into a decision but leaves beneficiaries and harmed
+for a human to fill in, so over the corpus alone every count is zero.
+The groups come from AccountabilityRecords that were filled in and saved
+with record.save().
+
+Run:
+  python3 tools/entities.py                         Corpus records (decisions only, see above)
+  python3 tools/entities.py RECORD.json...          Saved AccountabilityRecords
+  python3 tools/entities.py RECORD.json... --scale global --irreversible
+
+Requires: numpy
+"""
+
+import re
+import sys
+from array import array
+
+import numpy as np
+
+
+SCALES = ("individual", "community", "national", "global")
+BENEFITED, HARMED = 0, 1
+
+_WORDS = re.compile(r"[a-z0-9]+")
+_ARTICLES = {"the", "a", "an", "all", "many", "some"}
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize(name: str) -> str:
+    """"The Workers" and "worker" -> "worker"."""
+    words = [w for w in _WORDS.findall(name.lower()) if w not in _ARTICLES]
+    return " ".join(_singular(w) for w in words)
+
+
+def _view(arr: array) -> np.ndarray:
+    """Zero-copy NumPy view of a compact array.array."""
+    return np.frombuffer(arr, dtype=arr.typecode)
+
+
+class EntityTable:
+    """Name <-> integer id, one entry per distinct normalized name."""
+
+    def __init__(self):
+        self._ids = {}
+        self.names = []      # Display name: first spelling seen
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        key = normalize(name)
+        if key not in self._ids:
+            self._ids[key] = len(self.names)
+            self.names.append(name.strip())
+        return self._ids[key]
+
+    def get(self, name: str) -> int:
+        """Id of a name, or -1 if it was never seen."""
+        return self._ids.get(normalize(name), -1)
+
+
+class ImpactGraph:
+    """Decisions and the groups they touch, as integer edge arrays."""
+
+    def __init__(self):
+        self.entities = EntityTable()
+        self.decisions = []              # (record name, decision text)
+        self._scale = array("b")         # Per decision: index into SCALES, -1 unknown
+        self._reversible = array("b")    # Per decision: 1 / 0
+        self._edge_decision = array("l")
+        self._edge_entity = array("l")
+        self._edge_role = array("b")     # BENEFITED / HARMED
+
+    def add(self, impact, record: str = "") -> int:
+        """Add one TouchImpact. Returns its decision id."""
+        d = len(self.decisions)
+        self.decisions.append((record, impact.decision))
+        scale = impact.scale.lower()
+        self._scale.append(SCALES.index(scale) if scale in SCALES else -1)
+        self._reversible.append(1 if impact.reversible else 0)
+        for role, names in ((BENEFITED, impact.beneficiaries), (HARMED, impact.harmed)):
+            # Two spellings of one group ("civilians", "the Civilians") are one edge
+            for e in dict.fromkeys(self.entities.intern(name) for name in names):
+                self._edge_decision.append(d)
+                self._edge_entity.append(e)
+                self._edge_role.append(role)
+        return d
+
+    def add_record(self, rec):
+        for impact in rec.touch:
+            self.add(impact, rec.name)
+
+    @classmethod
+    def from_records(cls, records) -> "ImpactGraph":
+        graph = cls()
+        for rec in records:
+            graph.add_record(rec)
+        return graph
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_entity)
+
+    def _edges(self):
+        return (_view(self._edge_decision), _view(self._edge_entity), _view(self._edge_role))
+
+    def counts(self, role: int = HARMED, scale: str = None, reversible: bool = None) -> np.ndarray:
+        """
+        Decisions touching each entity, per entity id.
+        scale: only decisions at this scale. reversible: only (ir)reversible ones.
+        """
+        if scale is not None and scale not in SCALES:
+            raise ValueError(f"unknown scale {scale!r}, expected one of {', '.join(SCALES)}")
+        decision, entity, roles = self._edges()
+        mask = roles == role
+        if scale is not None:
+            scales = _view(self._scale)
+            mask &= scales[decision] == SCALES.index(scale)
+        if reversible is not None:
+            rev = _view(self._reversible)
+            mask &= rev[decision] == int(reversible)
+        return np.bincount(entity[mask], minlength=len(self.entities))
+
+    def most(self, role: int = HARMED, top: int = 10, **filters) -> list:
+        """[(name, decisions)] for the most affected groups, most first."""
+        counts = self.counts(role, **filters)
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [(self.entities.names[i], int(counts[i])) for i in order if counts[i] > 0]
+
+    def balance(self) -> list:
+        """[(name, benefited, harmed)] per group: both columns, always."""
+        gained, hurt = self.counts(BENEFITED), self.counts(HARMED)
+        order = np.argsort(-(hurt - gained), kind="stable")
+        return [(self.entities.names[i], int(gained[i]), int(hurt[i])) for i in order]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    scale = None
+    if "--scale" in args:
+        i = args.index("--scale")
+        scale = args[i + 1].lower() if i + 1 < len(args) else ""
+        del args[i:i + 2]
+        if scale not in SCALES:
+            print(f"Unknown --scale {scale!r}: use one of {', '.join(SCALES)}")
+            sys.exit(1)
+    reversible = None
+    if "--irreversible" in args:
+        args.remove("--irreversible")
+        reversible = False
+    if "--reversible" in args:
+        args.remove("--reversible")
+        reversible = True
+
+    if args:
+        from leader_transparency import AccountabilityRecord
+        records = [AccountabilityRecord.load(p) for p in args]
+    else:
+        from corpus import load_all_records, to_accountability
+        records = [to_accountability(r) for r in load_all_records()]
+
+    graph = ImpactGraph.from_records(records)
+    print("TOUCH — who is affected, across every decision")
+    print(f"  {len(graph.decisions)} decisions, {len(graph.entities)} distinct groups, "
+          f"{graph.edge_count} impacts")
+    if scale or reversible is not None:
+        print(f"  filter: scale={scale or 'any'} "
+              f"reversible={'any' if reversible is None else reversible}")
+    print()
+
+    if not graph.edge_count:
+        print("  No beneficiaries or harmed groups mapped yet.")
+        if not args:
+            print("  Corpus records carry decisions only; nobody is named as benefited or harmed.")
+        print("  Fill in TouchImpact.beneficiaries / .harmed, save the record, and pass its file.")
+        sys.exit(0)
+
+    for label, role in (("HARMED MOST", HARMED), ("BENEFITED MOST", BENEFITED)):
+        print(f"  {label}:")
+        for name, n in graph.most(role, scale=scale, reversible=reversible):
+            print(f"    {n:4d}  {name}")
+        print()
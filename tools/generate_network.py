@@ -5,11 +5,12 @@ generate_network.py — Generate a visual network map from all records.
 Shows WHO is connected to WHOM, and HOW.
 Simple enough that a picture tells the story.
 
-Run: python3 tools/generate_network.py
+Run: python3 tools/generate_network.py [--dedupe]
 """
 
 import json
 import glob
+import sys
 
 from classify import SINS, classify_facts, highest_tier
 
@@ -379,6 +380,9 @@ canvas.addEventListener('mouseleave', () => {{ tooltip.style.display = 'none'; }
 
 if __name__ == "__main__":
     records = load_all_records()
+    if "--dedupe" in sys.argv:
+        from dedupe import collapse_records
+        records = collapse_records(records)
     print(f"Loaded {len(records)} records")
     html = generate_network_page(records)
     with open("docs/network.html", "w") as f:
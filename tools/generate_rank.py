@@ -4,10 +4,13 @@ generate_rank.py — The simplest possible page. A ranked list. Worst first.
 
 One line per person. One sentence. One color. Scroll.
 If you can read a menu, you can read this.
+
+Run: python3 tools/generate_rank.py [--dedupe]
 """
 
 import json
 import glob
+import sys
 from classify import SINS, classify_facts, highest_tier
 
 
@@ -270,6 +273,9 @@ body {{ font-family: Georgia, serif; background: #111; color: #ddd; }}
 
 if __name__ == "__main__":
     records = load_all_records()
+    if "--dedupe" in sys.argv:
+        from dedupe import collapse_records
+        records = collapse_records(records)
     html = generate_rank_page(records)
     with open("docs/rank.html", "w") as f:
         f.write(html)
@@ -5,11 +5,12 @@ generate_site.py — Generate the public records page from the database.
 Reads records/*.json, generates docs/records.html with real cards
 for real leaders with real evidence.
 
-Run: python3 tools/generate_site.py
+Run: python3 tools/generate_site.py [--dedupe]
 """
 
 import json
 import glob
+import sys
 import os
 
 from classify import SINS, classify_facts, highest_tier
@@ -296,6 +297,9 @@ body {{
 
 if __name__ == "__main__":
     records = load_all_records()
+    if "--dedupe" in sys.argv:
+        from dedupe import collapse_records
+        records = collapse_records(records)
     print(f"Loaded {len(records)} records")
 
     html = generate_page(records)
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+git_sync.py — Commit what the workers touched, in batches; pull only when the remote moved.
+
+Every swarm cycle (swarm_clean.sh: every task) ran
+
+  git fetch origin B && git reset --hard origin/B
+  git add . && git commit && git push
+
+`git add .` stats the whole tree, each cycle makes a commit of its own,
+and the fetch and reset run even when nobody else pushed.
+
+GitSync does the same job with less:
+
+  - Staging. Each task gets a file to list what it changed, one path per
+    line: <state>.touched/<key>, passed to resolve_one.sh as
+    SWARM_TOUCHED. When the task is done() only those paths are staged.
+    A task that wrote no file is unknown, and that flush falls back to
+    `git add -A`.
+  - Coalescing. Finished tasks are committed together once `tasks` of
+    them are pending or `window` seconds have passed since the first,
+    whichever comes first. The commit body lists the task keys.
+  - Pulling. `git ls-remote` gives the remote branch's commit. If it is
+    the one we last fetched or pushed, fetch and rebase are skipped. If
+    it moved, pending work is committed first, and so are changes to
+    tracked files no task reported (the loops' own seen, log and status
+    files), then fetched and rebased onto. If the rebase conflicts, a
+    merge is tried. If that conflicts too, our commits stay as they are
+    and the next down() tries again; after `retries` tries in a row they
+    are moved to refs/swarm-backup/<branch>/<time> and the branch is
+    reset to the remote, so one conflict cannot keep a clone off the
+    remote for good. Appends to the seen and log files and tasks/NEXT.md
+    on both sides merge as unions (.gitattributes).
+
+State lives in a JSON file (guarded by <state>.lock), so the shell
+loops can call this once per step and the daemon survives a restart
+with its pending work:
+
+  {"remote": "<sha>", "pending": ["L-12", ...], "paths": [...], "unknown": false, "since": 1760000000.0,
+   "diverged": 0}
+
+Run:
+  python3 tools/git_sync.py down STATE [--branch B] [--reset-to origin|fetch_head] [--retries N] [--force]
+  python3 tools/git_sync.py done STATE KEY [PATH...]        A task finished (plus its SWARM_TOUCHED file)
+  python3 tools/git_sync.py touch STATE [PATH...]           Changed outside a task (no paths: everything)
+  python3 tools/git_sync.py up STATE [--branch B] [--message M] [--window S] [--tasks N] [--force]
+  python3 tools/git_sync.py status STATE
+  python3 tools/git_sync.py selftest                        Against a throwaway bare repo
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+WINDOW = float(os.environ.get("SYNC_WINDOW_SECS", 30))    # Seconds a finished task may wait for company
+TASKS = int(os.environ.get("SYNC_TASKS", 5))              # Or this many finished tasks
+MESSAGE = "swarm: {time}"                                 # {time}, {tasks} (keys), {count}
+RETRIES = int(os.environ.get("SYNC_DIVERGED_RETRIES", 3))  # Conflicting down()s before local work is set aside
+
+
+def _fresh_state() -> dict:
+    return {"remote": "", "pending": [], "paths": [], "unknown": False, "since": 0.0, "diverged": 0}
+
+
+class GitSync:
+    """Incremental staging, batched commits and skip-if-unchanged pulls for one branch."""
+
+    def __init__(self, root: str = ".", state: str = None, branch: str = "", remote: str = "origin",
+                 reset_to: str = "origin", message: str = MESSAGE, window: float = WINDOW,
+                 tasks: int = TASKS, retries: int = RETRIES, log=None):
+        self.root = root
+        self.state_path = state
+        self.branch = branch
+        self.remote = remote
+        self.reset_to = reset_to            # origin: <remote>/<branch>; fetch_head: FETCH_HEAD
+        self.message = message
+        self.window = window
+        self.tasks = tasks
+        self.retries = retries
+        self.log = log or (lambda msg: None)
+        self.state = _fresh_state()
+        if state:
+            try:
+                with open(state) as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    def git(self, *args) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], cwd=self.root, capture_output=True, text=True)
+
+    def save(self):
+        if not self.state_path:
+            return
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_path)
+
+    # --- what workers touched ---
+
+    def _report(self, key: str) -> str:
+        return os.path.join((self.state_path or os.path.join(self.root, ".git_sync")) + ".touched", key)
+
+    def touched_file(self, key: str) -> str:
+        """Where key's worker lists the paths it changed, cleared before it starts. Absent means unknown."""
+        path = self._report(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return path
+
+    def done(self, key: str, paths=None):
+        """
+        key finished. What it changed (paths, plus its touched file) joins
+        the next commit. paths=None and no touched file: unknown, stage everything.
+        """
+        paths = None if paths is None else list(paths)
+        report = self._report(key)
+        try:
+            with open(report) as f:
+                paths = (paths or []) + [line.strip() for line in f if line.strip()]
+            os.remove(report)
+        except FileNotFoundError:
+            pass
+        s = self.state
+        if not s["pending"]:
+            s["since"] = time.time()
+        s["pending"].append(key)
+        self.touch(paths)
+
+    def touch(self, paths=None):
+        """Paths changed outside any task go in the next commit; None means unknown (everything)."""
+        s = self.state
+        if paths is None:
+            s["unknown"] = True
+            paths = []
+        s["paths"] = sorted(set(s["paths"]) | {os.path.relpath(os.path.join(self.root, p), self.root)
+                                               for p in paths})
+        self.save()
+
+    def due(self, now: float = None) -> bool:
+        s = self.state
+        if not s["pending"]:
+            return False
+        now = time.time() if now is None else now
+        return len(s["pending"]) >= self.tasks or now - s["since"] >= self.window
+
+    # --- committing ---
+
+    def _stage(self):
+        s = self.state
+        if s["unknown"]:
+            self.git("add", "-A")
+            return
+        present = [p for p in s["paths"] if os.path.lexists(os.path.join(self.root, p))]
+        gone = [p for p in s["paths"] if p not in present]
+        if present:
+            self.git("add", "-A", "--", *present)      # Ignored paths are refused; the rest still go in
+        if gone:
+            self.git("rm", "-q", "--cached", "--ignore-unmatch", "--", *gone)
+
+    def commit(self) -> bool:
+        """
+        Commit every pending task's paths as one commit. True if a commit
+        was made. If git refuses (no identity, a hook), the tasks stay
+        pending for the next try.
+        """
+        s = self.state
+        if not s["pending"]:
+            return False
+        self._stage()
+        made = False
+        if self.git("diff", "--cached", "--quiet").returncode != 0:
+            msg = self.message.format(time=time.strftime("%H:%M:%S"), tasks=" ".join(s["pending"]),
+                                      count=len(s["pending"]))
+            r = self.git("commit", "-q", "-m", msg, "-m", "tasks: " + " ".join(s["pending"]))
+            if r.returncode != 0:
+                self.log(f"COMMIT FAILED, {len(s['pending'])} task(s) kept pending: {_last_line(r)}")
+                return False
+            made = True
+        self.state.update(pending=[], paths=[], unknown=False, since=0.0)
+        self.save()
+        return made
+
+    def commit_tracked(self) -> bool:
+        """Commit changes to tracked files that no task reported. True if a commit was made."""
+        if self.git("diff", "--quiet").returncode == 0 and self.git("diff", "--cached", "--quiet").returncode == 0:
+            return False
+        self.git("add", "-u")
+        r = self.git("commit", "-q", "-m", self.message.format(time=time.strftime("%H:%M:%S"), tasks="state",
+                                                               count=0))
+        if r.returncode != 0:
+            self.log(f"COMMIT FAILED: {_last_line(r)}")
+        return r.returncode == 0
+
+    def push(self) -> bool:
+        """Push HEAD if the remote does not have it yet."""
+        head = self.git("rev-parse", "HEAD").stdout.strip()
+        if not head or head == self.state["remote"]:
+            return False
+        r = self.git("push", "-q", self.remote, f"HEAD:{self.branch}")
+        if r.returncode != 0:
+            self.log(f"PUSH FAILED {_last_line(r)}")
+            return False
+        self.state["remote"] = head
+        self.save()
+        return True
+
+    def up(self, force: bool = False) -> str:
+        """Commit and push if the batch is due (or force). Returns what happened."""
+        if not force and not self.due():
+            return "waiting" if self.state["pending"] else "idle"
+        committed = self.commit()
+        pushed = self.push()
+        return ("committed" if committed else "nothing") + (", pushed" if pushed else "")
+
+    # --- pulling ---
+
+    def remote_head(self) -> str:
+        r = self.git("ls-remote", self.remote, f"refs/heads/{self.branch}")
+        return r.stdout.split()[0] if r.returncode == 0 and r.stdout.strip() else ""
+
+    def down(self, force: bool = False) -> str:
+        """
+        Bring in the remote branch, unless it has not moved. Local work is
+        committed and rebased onto it, or merged if the rebase conflicts.
+        If both conflict it is kept for the next down(), and after
+        `retries` of those it is moved to a backup ref and the branch
+        reset to the remote. Returns what happened.
+        """
+        remote = self.remote_head()
+        if remote and remote == self.state["remote"] and not force:
+            return "unchanged"
+        self.commit()
+        if self.state["pending"]:
+            return "commit failed"
+        # The loops' own tracked files (seen, log, status) are dirty between task commits
+        self.commit_tracked()
+        if self.git("fetch", "-q", self.remote, self.branch).returncode != 0:
+            return "fetch failed"
+        target = "FETCH_HEAD" if self.reset_to == "fetch_head" else f"{self.remote}/{self.branch}"
+        target_sha = self.git("rev-parse", target).stdout.strip()
+        ahead = self.git("rev-list", "--count", f"{target_sha}..HEAD").stdout.strip()
+        ahead = int(ahead) if ahead.isdigit() else 0
+        how = "rebased"
+        if self.git("rev-parse", "-q", "--verify", "HEAD").returncode != 0:
+            # A clone of an empty remote: no commits of ours yet, nothing to rebase
+            r = self.git("checkout", "-q", "-B", self.branch or "HEAD", target_sha)
+        else:
+            r = self.git("rebase", "-q", "--autostash", target_sha)
+        if r.returncode != 0:
+            self.git("rebase", "--abort")
+            # Replayed one commit at a time, our work can conflict where its end result does not
+            how = "merged"
+            r = self.git("merge", "-q", "--autostash", "--no-edit", target_sha)
+        if r.returncode != 0:
+            self.git("merge", "--abort")
+            self.state["diverged"] += 1
+            self.save()
+            if self.state["diverged"] < self.retries:
+                self.log(f"REBASE FAILED onto {target} ({self.state['diverged']}/{self.retries}), "
+                         f"keeping {ahead} local commit(s) for the next try: {_last_line(r)}")
+                return "diverged"
+            ref = f"refs/swarm-backup/{self.branch or 'HEAD'}/{time.strftime('%Y%m%d-%H%M%S')}"
+            self.git("update-ref", ref, "HEAD")
+            self.git("reset", "-q", "--hard", target_sha)
+            self.log(f"DIVERGED {self.state['diverged']} times from {target}: "
+                     f"{ahead} local commit(s) moved to {ref}, reset to the remote")
+            how, ahead = "reset", 0
+        self.state.update(remote=target_sha, diverged=0)
+        self.save()
+        if ahead:
+            self.push()
+            return how
+        return "reset" if how == "reset" else "updated"
+
+
+def _last_line(r: subprocess.CompletedProcess) -> str:
+    lines = [ln for ln in (r.stderr or r.stdout).strip().splitlines() if not ln.startswith("hint:")]
+    return lines[-1] if lines else f"exit {r.returncode}"
+
+
+# === Self-test ===
+
+def selftest() -> int:
+    """
+    Run GitSync against a throwaway bare repo and two clones of it.
+    Prints one line per check; returns the number that failed.
+    """
+    tmp = tempfile.mkdtemp(prefix="git_sync.")
+    failed = 0
+
+    def check(name: str, ok: bool):
+        nonlocal failed
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+        failed += not ok
+
+    def run(cwd, *args) -> str:
+        return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True).stdout.strip()
+
+    def write(path, text, mode="a"):
+        with open(path, mode) as f:
+            f.write(text)
+
+    def read(path) -> str:
+        with open(path) as f:
+            return f.read()
+
+    try:
+        origin = os.path.join(tmp, "origin.git")
+        run(tmp, "init", "-q", "--bare", "-b", "main", origin)
+        a, b = os.path.join(tmp, "a"), os.path.join(tmp, "b")
+        for repo in (a, b):
+            run(tmp, "clone", "-q", origin, repo)
+            run(repo, "config", "user.name", "swarm")
+            run(repo, "config", "user.email", "swarm@localhost")
+            run(repo, "config", "commit.gpgsign", "false")
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".gitattributes"),
+                    os.path.join(a, ".gitattributes"))
+        write(os.path.join(a, ".swarm.seen"), "L-0\n")
+        write(os.path.join(a, "shared.txt"), "base\n")
+        run(a, "add", "-A")
+        run(a, "commit", "-q", "-m", "base")
+        run(a, "push", "-q", "origin", "HEAD:main")
+
+        sa = GitSync(a, os.path.join(tmp, "a.gitsync"), "main", window=3600, tasks=5)
+        sb = GitSync(b, os.path.join(tmp, "b.gitsync"), "main", window=3600, tasks=5)
+        sa.down(force=True)
+        sb.down(force=True)
+
+        # Only reported paths are committed, and the batch waits for company
+        write(os.path.join(a, "out_1.txt"), "1\n")
+        write(os.path.join(a, "stray.txt"), "not reported\n")
+        sa.done("t1", ["out_1.txt"])
+        check("batch waits for the window", sa.up() == "waiting")
+        check("forced batch commits and pushes", sa.up(force=True) == "committed, pushed")
+        files = run(origin, "ls-tree", "--name-only", "main").split()
+        check("reported path is pushed", "out_1.txt" in files)
+        check("unreported path is not", "stray.txt" not in files)
+        check("unchanged remote skips the fetch", sa.down() == "unchanged")
+
+        # The remote moved while a has pending work and a dirty seen file
+        sb.down()
+        write(os.path.join(b, ".swarm.seen"), "L-9\n")
+        write(os.path.join(b, "out_b.txt"), "b\n")
+        sb.done("tb", [".swarm.seen", "out_b.txt"])
+        sb.up(force=True)
+        write(os.path.join(a, ".swarm.seen"), "L-1\n")
+        write(os.path.join(a, "out_2.txt"), "2\n")
+        sa.done("t2", ["out_2.txt"])
+        check("moved remote is rebased onto", sa.down() == "rebased")
+        seen = read(os.path.join(a, ".swarm.seen")).split()
+        check("seen lines from both sides survive", {"L-0", "L-1", "L-9"} <= set(seen))
+        check("local task work survives", os.path.exists(os.path.join(a, "out_2.txt")))
+        check("remote work arrives", os.path.exists(os.path.join(a, "out_b.txt")))
+        check("rebased work is pushed", run(a, "rev-parse", "HEAD") == run(origin, "rev-parse", "main"))
+
+        # A push refused (the remote moved) leaves an unpushed commit; the seen file is dirty again
+        sb.down()
+        write(os.path.join(b, "out_c.txt"), "c\n")
+        sb.done("tc", ["out_c.txt"])
+        sb.up(force=True)
+        write(os.path.join(a, "out_5.txt"), "5\n")
+        sa.done("t5", ["out_5.txt"])
+        check("push onto a moved remote fails", sa.up(force=True) == "committed")
+        write(os.path.join(a, ".swarm.seen"), "L-5\n")
+        check("the unpushed commit is rebased, not dropped", sa.down() == "rebased")
+        check("its work and seen line survive", os.path.exists(os.path.join(a, "out_5.txt"))
+              and "L-5" in read(os.path.join(a, ".swarm.seen")).split())
+        check("and reach the remote", "out_5.txt" in run(origin, "ls-tree", "--name-only", "main").split())
+
+        # A refused commit keeps the tasks pending and the tree untouched
+        hook = os.path.join(a, ".git", "hooks", "pre-commit")
+        write(hook, "#!/bin/sh\nexit 1\n", "w")
+        os.chmod(hook, 0o755)
+        write(os.path.join(a, "out_3.txt"), "3\n")
+        sa.done("t3", ["out_3.txt"])
+        check("refused commit is reported", sa.commit() is False)
+        check("refused commit keeps the task pending", sa.state["pending"] == ["t3"])
+        sb.down()
+        write(os.path.join(b, "out_b.txt"), "moved\n")
+        sb.done("tb2", ["out_b.txt"])
+        sb.up(force=True)
+        check("down waits for the commit to go through", sa.down() == "commit failed")
+        check("the work is still there", os.path.exists(os.path.join(a, "out_3.txt")))
+        os.remove(hook)
+        check("the retry commits it", sa.down() == "rebased" and not sa.state["pending"])
+
+        # Both clones append a generated id to tasks/NEXT.md: a union merge, not a conflict
+        sb.down()
+        os.makedirs(os.path.join(b, "tasks"), exist_ok=True)
+        write(os.path.join(b, "tasks", "NEXT.md"), "L-100\n")
+        sb.done("tb4", ["tasks/NEXT.md"])
+        sb.up(force=True)
+        os.makedirs(os.path.join(a, "tasks"), exist_ok=True)
+        write(os.path.join(a, "tasks", "NEXT.md"), "L-200\n")
+        sa.done("t6", ["tasks/NEXT.md"])
+        check("both appends to NEXT.md rebase cleanly", sa.down() == "rebased")
+        check("and both ids are kept", {"L-100", "L-200"} <= set(read(os.path.join(a, "tasks", "NEXT.md")).split()))
+
+        # A rebase that conflicts part way, on work whose end result does not, is merged
+        sb.down()
+        write(os.path.join(b, "shared.txt"), "from b\n", "w")
+        sb.done("tb5", ["shared.txt"])
+        sb.up(force=True)
+        write(os.path.join(a, "shared.txt"), "from a\n", "w")
+        sa.done("t7", ["shared.txt"])
+        sa.commit()
+        write(os.path.join(a, "shared.txt"), "base\n", "w")
+        write(os.path.join(a, "out_7.txt"), "7\n")
+        sa.done("t8", ["shared.txt", "out_7.txt"])
+        sa.commit()
+        check("a rebase conflict falls back to a merge", sa.down() == "merged")
+        check("the merge is pushed", run(a, "rev-parse", "HEAD") == run(origin, "rev-parse", "main"))
+
+        # A real conflict keeps the local commits for a few tries, then sets them aside
+        sb.down()
+        write(os.path.join(b, "shared.txt"), "from b again\n", "w")
+        sb.done("tb6", ["shared.txt"])
+        sb.up(force=True)
+        write(os.path.join(a, "shared.txt"), "from a again\n", "w")
+        sa.done("t9", ["shared.txt"])
+        sa.commit()
+        head = run(a, "rev-parse", "HEAD")
+        check("conflict is reported, not reset away", sa.down() == "diverged")
+        check("local commit is kept", run(a, "rev-parse", "HEAD") == head)
+        check("no rebase or merge is left in progress",
+              not any(os.path.exists(os.path.join(a, ".git", p)) for p in ("rebase-merge", "MERGE_HEAD")))
+        check("the next down tries again", sa.down() == "diverged")
+        check("the last try sets the work aside and recovers", sa.down() == "reset")
+        backups = run(a, "for-each-ref", "--format=%(objectname)", "refs/swarm-backup/").split()
+        check("the local commit is kept in a backup ref", head in backups)
+        check("the clone is on the remote again", run(a, "rev-parse", "HEAD") == run(origin, "rev-parse", "main"))
+        write(os.path.join(a, "out_10.txt"), "10\n")
+        sa.done("t10", ["out_10.txt"])
+        check("and its next work reaches the remote", sa.up(force=True) == "committed, pushed")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return failed
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {"--branch": "", "--reset-to": "origin", "--message": MESSAGE,
+            "--window": str(WINDOW), "--tasks": str(TASKS), "--retries": str(RETRIES)}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    force = "--force" in args
+    args = [a for a in args if a != "--force"]
+    if args[:1] == ["selftest"]:
+        sys.exit(1 if selftest() else 0)
+    if len(args) < 2:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+
+    cmd, state = args[0], args[1]
+    # Workers in parallel shells report at once: one reader-writer of the state at a time
+    lock = open(state + ".lock", "a")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    sync = GitSync(".", state, opts["--branch"], reset_to=opts["--reset-to"], message=opts["--message"],
+                   window=float(opts["--window"]), tasks=int(opts["--tasks"]), retries=int(opts["--retries"]),
+                   log=lambda msg: print(msg, file=sys.stderr))
+    if cmd == "down":
+        print(sync.down(force))
+    elif cmd == "done" and len(args) > 2:
+        sync.done(args[2], args[3:] or None)
+    elif cmd == "touch":
+        sync.touch(args[2:] or None)
+    elif cmd == "up":
+        print(sync.up(force))
+    elif cmd == "status":
+        s = sync.state
+        paths = "all paths" if s["unknown"] else f"{len(s['paths'])} path(s)"
+        print(f"remote {s['remote'][:12] or '-'}, {len(s['pending'])} pending task(s), {paths}, "
+              f"{'due' if sync.due() else 'not due'}")
+    else:
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+knowledge.py — The knowledge bases, on disk. Read only what is asked for.
+
+SINS, KNOWN_PATTERNS and PRECEDENT_DATABASE are data, not code. They live
+in tools/data/*.json, where they can be edited, reviewed and grown to
+thousands of entries without touching a .py file.
+
+Each table is a LazyTable: importing it costs nothing. On first access
+it reads a compiled snapshot (workspace/cache/knowledge/<name>.kb):
+
+  header   magic + length of the key index
+  index    marshal: source stamp, source hash, keys in order, byte spans
+  entries  one marshal blob per key
+
+Looking up one key reads the index and that key's bytes. Iterating
+reads everything, once. The snapshot is rebuilt from the JSON whenever
+the JSON's size or mtime changes, and ignored (JSON read directly) if
+it cannot be written.
+
+Run:
+  python3 tools/knowledge.py            Compile every table, show sizes
+"""
+
+import json
+import marshal
+import os
+import time
+from collections.abc import Mapping
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(TOOLS_DIR, "data")
+SNAPSHOT_DIR = os.path.join(os.path.dirname(TOOLS_DIR), "workspace", "cache", "knowledge")
+
+TABLES = ("sins", "patterns", "precedents")
+
+_MAGIC = b"KB1\n"
+_HEADER_SIZE = len(_MAGIC) + 8     # Magic, then the index length (little-endian)
+
+
+def _hash(raw: bytes) -> str:
+    import hashlib      # Only when (re)compiling: keeps the import cheap
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def _stamp(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def compile_table(name: str, data_dir: str = DATA_DIR, snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    """JSON -> snapshot. Returns the snapshot path."""
+    src = os.path.join(data_dir, f"{name}.json")
+    with open(src, "rb") as f:
+        raw = f.read()
+    table = json.loads(raw)
+
+    blobs, spans, offset = [], [], 0
+    for value in table.values():
+        blob = marshal.dumps(value)
+        blobs.append(blob)
+        spans.append((offset, len(blob)))
+        offset += len(blob)
+    index = marshal.dumps({
+        "stamp": _stamp(src),
+        "hash": _hash(raw),
+        "keys": list(table),
+        "spans": spans,
+    })
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    out = os.path.join(snapshot_dir, f"{name}.kb")
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + len(index).to_bytes(8, "little"))
+        f.write(index)
+        f.writelines(blobs)
+    os.replace(tmp, out)
+    return out
+
+
+class LazyTable(Mapping):
+    """
+    Read-only mapping backed by a data file. Nothing is read until the
+    first lookup; entries are decoded one at a time and kept.
+    """
+
+    def __init__(self, name: str, data_dir: str = DATA_DIR, snapshot_dir: str = SNAPSHOT_DIR):
+        self.name = name
+        self._src = os.path.join(data_dir, f"{name}.json")
+        self._data_dir = data_dir
+        self._snapshot_dir = snapshot_dir
+        self._snapshot = os.path.join(snapshot_dir, f"{name}.kb")
+        self._keys = None       # Ordered keys
+        self._pos = None        # key -> index into spans
+        self._spans = None
+        self._base = 0          # Offset of the first entry in the snapshot
+        self._hash = None
+        self._values = {}
+        self._json = None       # Whole table, when no snapshot can be used
+
+    def _read_index(self) -> bool:
+        try:
+            with open(self._snapshot, "rb") as f:
+                header = f.read(_HEADER_SIZE)
+                if len(header) != _HEADER_SIZE or not header.startswith(_MAGIC):
+                    return False
+                n = int.from_bytes(header[len(_MAGIC):], "little")
+                index = marshal.loads(f.read(n))
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if index["stamp"] != _stamp(self._src):
+            return False
+        self._keys = index["keys"]
+        self._spans = index["spans"]
+        self._hash = index["hash"]
+        self._base = _HEADER_SIZE + n
+        return True
+
+    def _load(self):
+        if self._keys is not None:
+            return
+        if not self._read_index():
+            try:
+                compile_table(self.name, self._data_dir, self._snapshot_dir)
+                ok = self._read_index()
+            except OSError:
+                ok = False
+            if not ok:
+                with open(self._src, "rb") as f:
+                    raw = f.read()
+                self._json = json.loads(raw)
+                self._keys = list(self._json)
+                self._hash = _hash(raw)
+        self._pos = {k: i for i, k in enumerate(self._keys)}
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        self._load()
+        if self._json is not None:
+            return self._json[key]
+        i = self._pos[key]
+        offset, length = self._spans[i]
+        with open(self._snapshot, "rb") as f:
+            f.seek(self._base + offset)
+            value = marshal.loads(f.read(length))
+        self._values[key] = value
+        return value
+
+    def _load_all(self):
+        """Decode every entry with one read of the snapshot."""
+        self._load()
+        if self._json is not None or len(self._values) == len(self._keys):
+            return
+        with open(self._snapshot, "rb") as f:
+            f.seek(self._base)
+            body = f.read()
+        for key, (offset, length) in zip(self._keys, self._spans):
+            if key not in self._values:
+                self._values[key] = marshal.loads(body[offset:offset + length])
+
+    def __contains__(self, key):
+        self._load()
+        return key in self._pos
+
+    def __iter__(self):
+        self._load()
+        return iter(self._keys)
+
+    def __len__(self):
+        self._load()
+        return len(self._keys)
+
+    def items(self):
+        self._load_all()
+        return [(k, self[k]) for k in self._keys]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the source JSON: changes whenever any entry does."""
+        self._load()
+        return self._hash
+
+    def __repr__(self):
+        state = "unloaded" if self._keys is None else f"{len(self._keys)} entries"
+        return f"LazyTable({self.name!r}, {state})"
+
+
+SINS = LazyTable("sins")
+KNOWN_PATTERNS = LazyTable("patterns")
+PRECEDENT_DATABASE = LazyTable("precedents")
+
+
+if __name__ == "__main__":
+    for name in TABLES:
+        t0 = time.perf_counter()
+        path = compile_table(name)
+        table = LazyTable(name)
+        first = next(iter(table))
+        table[first]
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"  {name:12s} {len(table):5d} entries  {os.path.getsize(path):8d} bytes  "
+              f"{elapsed:.1f} ms  -> {os.path.relpath(path)}")
@@ -21,13 +21,20 @@ Principle: the tool DESCRIBES. It does not SENTENCE.
 Connects to: justice.html (PHIL-29), human_impact.py (F-SOUL1)
 """
 
+import glob
+import io
 import json
 import hashlib
+import os
+import re
+import sys
 from datetime import datetime, date
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from typing import Optional
 
+import knowledge
+
 
 # === Evidence quality tiers ===
 
@@ -180,91 +187,97 @@ class AccountabilityRecord:
 
     def generate_report(self) -> str:
         """Generate human-readable accountability report."""
-        lines = []
-        lines.append(f"{'='*60}")
-        lines.append(f"ACCOUNTABILITY REPORT: {self.name}")
-        lines.append(f"Role: {self.role} | Country: {self.country}")
+        buf = io.StringIO()
+        self.write_report(buf)
+        return buf.getvalue()[:-1]
+
+    def write_report(self, out):
+        """Stream the report to a file-like object, one line at a time."""
+        def emit(line):
+            out.write(line + "\n")
+
+        emit(f"{'='*60}")
+        emit(f"ACCOUNTABILITY REPORT: {self.name}")
+        emit(f"Role: {self.role} | Country: {self.country}")
         if self.family_of:
-            lines.append(f"Family of: {self.family_of}")
-        lines.append(f"In power: {'YES' if self.in_power else 'NO'}")
-        lines.append(f"Last updated: {self.last_updated}")
-        lines.append(f"{'='*60}")
+            emit(f"Family of: {self.family_of}")
+        emit(f"In power: {'YES' if self.in_power else 'NO'}")
+        emit(f"Last updated: {self.last_updated}")
+        emit(f"{'='*60}")
 
         # Visibility score
         vs = self.compute_visibility_score()
-        lines.append(f"\nVISIBILITY SCORE")
-        lines.append(f"  Evidence items: {vs['total_evidence_items']} "
-                     f"(high-grade: {vs['high_grade_items']})")
-        lines.append(f"  Quality ratio: {vs['evidence_quality_ratio']:.0%}")
-        lines.append(f"  Pattern coverage: {vs['pattern_coverage']:.0%}")
-        lines.append(f"  Consistency checks: {vs['consistency_checks']}")
-        lines.append(f"  Impacts mapped: {vs['impacts_mapped']}")
+        emit(f"\nVISIBILITY SCORE")
+        emit(f"  Evidence items: {vs['total_evidence_items']} "
+             f"(high-grade: {vs['high_grade_items']})")
+        emit(f"  Quality ratio: {vs['evidence_quality_ratio']:.0%}")
+        emit(f"  Pattern coverage: {vs['pattern_coverage']:.0%}")
+        emit(f"  Consistency checks: {vs['consistency_checks']}")
+        emit(f"  Impacts mapped: {vs['impacts_mapped']}")
         if vs['opacity_warning']:
-            lines.append(f"  WARNING: Low evidence count. More investigation needed.")
+            emit(f"  WARNING: Low evidence count. More investigation needed.")
 
         # Concerns
         if self.concerns:
-            lines.append(f"\nCONCERNS FLAGGED")
+            emit(f"\nCONCERNS FLAGGED")
             for c in self.concerns:
-                lines.append(f"  - {c}")
+                emit(f"  - {c}")
 
         # SIGHT
         if self.sight:
-            lines.append(f"\nSIGHT — Direct evidence ({len(self.sight)} items)")
+            emit(f"\nSIGHT — Direct evidence ({len(self.sight)} items)")
             for s in self.sight:
-                lines.append(f"  [{s.grade}] {s.summary}")
-                lines.append(f"      Source: {s.source} ({s.document_type}, {s.date_of_record})")
+                emit(f"  [{s.grade}] {s.summary}")
+                emit(f"      Source: {s.source} ({s.document_type}, {s.date_of_record})")
                 if s.url:
-                    lines.append(f"      Link: {s.url}")
+                    emit(f"      Link: {s.url}")
 
         # HEARING
         if self.hearing:
-            lines.append(f"\nHEARING — Testimony ({len(self.hearing)} items)")
+            emit(f"\nHEARING — Testimony ({len(self.hearing)} items)")
             for h in self.hearing:
-                lines.append(f"  [{h.grade}] {h.summary}")
-                lines.append(f"      Source: {h.source_type} via {h.outlet_or_context} ({h.date})")
+                emit(f"  [{h.grade}] {h.summary}")
+                emit(f"      Source: {h.source_type} via {h.outlet_or_context} ({h.date})")
                 if h.corroborated_by:
-                    lines.append(f"      Corroborated by: {', '.join(h.corroborated_by)}")
+                    emit(f"      Corroborated by: {', '.join(h.corroborated_by)}")
 
         # SMELL
         if self.smell:
-            lines.append(f"\nSMELL — Pattern analysis ({len(self.smell)} patterns)")
+            emit(f"\nSMELL — Pattern analysis ({len(self.smell)} patterns)")
             for p in self.smell:
-                lines.append(f"  Pattern: {p.pattern_name} "
-                           f"(match: {p.match_strength:.0%})")
+                emit(f"  Pattern: {p.pattern_name} "
+                     f"(match: {p.match_strength:.0%})")
                 if p.indicators_present:
-                    lines.append(f"    Present: {', '.join(p.indicators_present)}")
+                    emit(f"    Present: {', '.join(p.indicators_present)}")
                 if p.indicators_absent:
-                    lines.append(f"    Absent: {', '.join(p.indicators_absent)}")
+                    emit(f"    Absent: {', '.join(p.indicators_absent)}")
                 if p.reference:
-                    lines.append(f"    Reference: {p.reference}")
+                    emit(f"    Reference: {p.reference}")
 
         # TASTE
         if self.taste:
-            lines.append(f"\nTASTE — Consistency checks ({len(self.taste)} items)")
+            emit(f"\nTASTE — Consistency checks ({len(self.taste)} items)")
             for t in self.taste:
                 label = "CONSISTENT" if t.consistency > 0.5 else (
                     "INCONSISTENT" if t.consistency < -0.5 else "MIXED")
-                lines.append(f"  [{label}] Said: \"{t.claim}\" ({t.claim_date})")
-                lines.append(f"            Did: \"{t.reality}\" ({t.reality_date})")
+                emit(f"  [{label}] Said: \"{t.claim}\" ({t.claim_date})")
+                emit(f"            Did: \"{t.reality}\" ({t.reality_date})")
 
         # TOUCH
         if self.touch:
-            lines.append(f"\nTOUCH — Impact analysis ({len(self.touch)} decisions)")
+            emit(f"\nTOUCH — Impact analysis ({len(self.touch)} decisions)")
             for i in self.touch:
-                lines.append(f"  Decision: {i.decision} ({i.date})")
-                lines.append(f"    Scale: {i.scale} | Reversible: {'yes' if i.reversible else 'NO'}")
+                emit(f"  Decision: {i.decision} ({i.date})")
+                emit(f"    Scale: {i.scale} | Reversible: {'yes' if i.reversible else 'NO'}")
                 if i.beneficiaries:
-                    lines.append(f"    Benefited: {', '.join(i.beneficiaries)}")
+                    emit(f"    Benefited: {', '.join(i.beneficiaries)}")
                 if i.harmed:
-                    lines.append(f"    Harmed: {', '.join(i.harmed)}")
-
-        lines.append(f"\n{'='*60}")
-        lines.append("THIS REPORT DESCRIBES. IT DOES NOT SENTENCE.")
-        lines.append("HUMANS SEE. HUMANS DECIDE.")
-        lines.append(f"{'='*60}")
+                    emit(f"    Harmed: {', '.join(i.harmed)}")
 
-        return "\n".join(lines)
+        emit(f"\n{'='*60}")
+        emit("THIS REPORT DESCRIBES. IT DOES NOT SENTENCE.")
+        emit("HUMANS SEE. HUMANS DECIDE.")
+        emit(f"{'='*60}")
 
     def seal(self):
         """Create tamper-evident hash of the record."""
@@ -284,6 +297,11 @@ class AccountabilityRecord:
         """Load from JSON file."""
         with open(path) as f:
             data = json.load(f)
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccountabilityRecord":
+        """Rebuild from the dict that save() writes."""
         # Reconstruct nested dataclasses
         rec = cls(
             name=data['name'], role=data['role'], country=data['country'],
@@ -306,177 +324,116 @@ class AccountabilityRecord:
         return rec
 
 
+# === SAID/DID cards ===
+
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?"
+_DATE_HINT = re.compile(
+    rf"(?:(?:\d{{1,2}}\s+)?{_MONTH}\s+(?:\d{{1,2}},?\s+)?)?(?:1[89]|20)\d{{2}}"
+    rf"(?:\s*[-–]\s*(?:1[89]|20)\d{{2}})?"
+)
+
+
+def date_hint(text: str) -> str:
+    """First date-like phrase in free text ("Oct 2013", "1998-2014"), or ""."""
+    m = _DATE_HINT.search(text)
+    return m.group(0) if m else ""
+
+
+def to_accountability(record: dict) -> AccountabilityRecord:
+    """
+    Read a flat SAID/DID card as a five-sense record.
+
+    facts   -> SIGHT   (what the public record shows)
+    sources -> HEARING (each source corroborated by the others it is cited with)
+    did     -> TOUCH   (the decisions, beneficiaries/harmed left for humans)
+    """
+    grade = record.get("grade", "C")
+    sources = record.get("sources", [])
+    rec = AccountabilityRecord(
+        name=record["name"],
+        role=record.get("role", ""),
+        country=record.get("country", ""),
+        last_updated=record.get("classified_at", ""),
+    )
+    for fact in record.get("facts", []):
+        rec.sight.append(SightEvidence(
+            source="public record", document_type="fact",
+            date_of_record=date_hint(fact), summary=fact, grade=grade,
+        ))
+    for src in sources:
+        rec.hearing.append(HearingTestimony(
+            source_type="source", outlet_or_context=src,
+            date=date_hint(src), summary=src,
+            corroborated_by=[o for o in sources if o != src], grade=grade,
+        ))
+    for d in record.get("did", []):
+        rec.touch.append(TouchImpact(decision=d, date=date_hint(d)))
+    return rec
+
+
+# === Bulk reports ===
+
+SENSE_FIELDS = ("sight", "hearing", "smell", "taste", "touch")
+
+
+def records_in(path: str) -> list:
+    """
+    AccountabilityRecords from one JSON file: a saved record, a list of
+    them, or a list of SAID/DID cards (read via to_accountability).
+    """
+    with open(path) as f:
+        data = json.load(f)
+    items = data if isinstance(data, list) else [data]
+    records = []
+    for item in items:
+        if any(k in item for k in SENSE_FIELDS):
+            records.append(AccountabilityRecord.from_dict(item))
+        else:
+            records.append(to_accountability(item))
+    return records
+
+
+def _render_file(path: str) -> str:
+    """Every report in one file. Runs in a pool worker."""
+    buf = io.StringIO()
+    for rec in records_in(path):
+        rec.write_report(buf)
+        buf.write("\n\n")
+    return buf.getvalue()
+
+
+def write_reports(directory: str, out, workers: Optional[int] = None) -> int:
+    """
+    Render every *.json in a directory into one stream.
+
+    Files are rendered across a process pool and written in sorted path
+    order, so the output is the same on every run. At most two files per
+    worker are submitted ahead of the one being written: a slow file early
+    in the order holds back submission instead of letting finished renders
+    pile up behind it. Returns the file count.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            out.write(_render_file(path))
+        return len(paths)
+    import multiprocessing
+    from collections import deque
+    window = 2 * (workers or os.cpu_count() or 1)
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append(pool.apply_async(_render_file, (path,)))
+            if len(pending) >= window:
+                out.write(pending.popleft().get())
+        while pending:
+            out.write(pending.popleft().get())
+    return len(paths)
+
+
 # === Known harmful patterns (for SMELL sense) ===
 
-KNOWN_PATTERNS = {
-    "authoritarian_consolidation": {
-        "description": "Systematic concentration of power, elimination of checks",
-        "indicators": [
-            "attacks independent judiciary",
-            "controls or threatens media",
-            "changes constitution to extend power",
-            "imprisons political opponents",
-            "places loyalists in key institutions",
-            "creates personality cult",
-            "uses emergency powers beyond emergencies",
-            "attacks electoral integrity",
-        ],
-        "reference": "Levitsky & Ziblatt, 'How Democracies Die' (2018)"
-    },
-    "kleptocratic_extraction": {
-        "description": "Using state power for personal/family enrichment",
-        "indicators": [
-            "unexplained personal wealth growth while in office",
-            "family members in business roles benefiting from policy",
-            "state contracts to connected entities",
-            "offshore accounts or shell companies linked to leader",
-            "luxury lifestyle inconsistent with official salary",
-            "suppression of financial transparency requirements",
-        ],
-        "reference": "Acemoglu & Robinson, 'Why Nations Fail' (2012)"
-    },
-    "predatory_networking": {
-        "description": "Using power/wealth to access and exploit vulnerable people",
-        "indicators": [
-            "repeated association with convicted abusers",
-            "use of private venues/transport to avoid oversight",
-            "NDAs used to silence victims",
-            "pattern of settlements with accusers",
-            "power differential in relationships",
-            "institutional protection of the accused",
-        ],
-        "reference": "Pattern documented in Epstein case investigations"
-    },
-    "war_of_choice": {
-        "description": "Initiating military conflict for non-defensive purposes",
-        "indicators": [
-            "invasion without UN authorization or defensive justification",
-            "civilian casualties disproportionate to military objectives",
-            "territorial annexation",
-            "use of prohibited weapons or tactics",
-            "targeting civilian infrastructure",
-            "blocking humanitarian access",
-        ],
-        "reference": "Geneva Conventions, Rome Statute of the ICC"
-    },
-    "systematic_coverup": {
-        "description": "Organized suppression of accountability",
-        "indicators": [
-            "classification of embarrassing (not security) information",
-            "firing investigators who get close",
-            "destroying documents or communications",
-            "witness intimidation",
-            "attacking whistleblower protections",
-            "using legal system to delay and exhaust accusers",
-        ],
-        "reference": "Transparency International corruption patterns"
-    },
-    "nepotistic_dynasty": {
-        "description": "Transferring power to family members without democratic mandate",
-        "indicators": [
-            "children or spouse in senior government/business roles",
-            "family members receiving security clearances despite disqualifiers",
-            "government policy benefiting family businesses",
-            "grooming successors from within family",
-            "family members acting as unofficial envoys",
-        ],
-        "reference": "Historical pattern: Marcos, Duvalier, Assad, etc."
-    },
-
-    # === CORPORATE PATTERNS ===
-
-    "executive_extraction": {
-        "description": "CEO/executives extracting wealth while workers and company suffer",
-        "indicators": [
-            "CEO pay ratio > 300:1 vs median worker",
-            "executive bonuses during layoffs",
-            "stock buybacks while cutting workforce",
-            "golden parachutes after poor performance",
-            "compensation increases while revenue declines",
-            "board composed of personal friends and allies",
-            "suppression of worker unionization",
-            "lobbying against minimum wage or benefits",
-        ],
-        "reference": "SEC filings, proxy statements. Piketty 'Capital in the 21st Century' (2013)"
-    },
-    "corporate_bribery": {
-        "description": "Systematic corruption of government officials for business advantage",
-        "indicators": [
-            "FCPA (Foreign Corrupt Practices Act) violations or investigations",
-            "payments to officials through intermediaries or consultants",
-            "suspicious donations to political campaigns before favorable policy",
-            "revolving door: hiring regulators who then deregulate",
-            "offshore payment structures with no clear business purpose",
-            "whistleblower retaliation after corruption reports",
-            "contracts won in countries with high corruption indices",
-        ],
-        "reference": "FCPA enforcement database, Transparency International CPI"
-    },
-    "worker_exploitation": {
-        "description": "Systematic abuse of workers for profit",
-        "indicators": [
-            "wage theft (unpaid overtime, withheld pay)",
-            "unsafe working conditions despite known hazards",
-            "suppression of injury/illness reporting",
-            "use of forced labor in supply chain",
-            "child labor in supply chain",
-            "retaliation against safety whistleblowers",
-            "mandatory arbitration to prevent class action",
-            "misclassification of employees as contractors",
-            "union busting activities",
-        ],
-        "reference": "ILO Forced Labour indicators, OSHA violation databases"
-    },
-    "environmental_destruction": {
-        "description": "Knowingly causing ecological harm for profit",
-        "indicators": [
-            "pollution above legal limits",
-            "lobbying against environmental regulation",
-            "internal documents showing knowledge of harm (like Exxon on climate)",
-            "dumping waste in poor communities",
-            "deforestation of protected areas via subsidiaries",
-            "greenwashing: public environmental claims contradicted by actions",
-            "failure to remediate known contamination",
-        ],
-        "reference": "EPA enforcement, academic studies on environmental justice"
-    },
-    "regulatory_capture": {
-        "description": "Corporation takes control of the agencies meant to regulate it",
-        "indicators": [
-            "former executives appointed to regulatory positions",
-            "industry writes its own regulations",
-            "fines smaller than profits from violation (cost of doing business)",
-            "regulatory agency budget cut while industry profits rise",
-            "suppression of scientific findings that threaten industry",
-            "mandatory industry self-reporting with no verification",
-        ],
-        "reference": "Stigler 'Theory of Economic Regulation' (1971), multiple case studies"
-    },
-    "predatory_monopoly": {
-        "description": "Using market dominance to crush competition and extract from consumers",
-        "indicators": [
-            "acquiring competitors to eliminate them",
-            "predatory pricing to destroy smaller rivals then raising prices",
-            "exclusive dealing to lock out alternatives",
-            "using platform control to favor own products",
-            "lobbying against antitrust enforcement",
-            "price increases far above inflation with no quality improvement",
-        ],
-        "reference": "Antitrust case law, FTC/EU competition enforcement"
-    },
-    "tax_parasitism": {
-        "description": "Corporations enjoying public infrastructure while paying nothing for it",
-        "indicators": [
-            "effective tax rate near zero despite billions in profit",
-            "profits shifted to tax havens with no real operations",
-            "complex subsidiary structures designed to avoid tax",
-            "lobbying against corporate tax reform",
-            "receiving government subsidies while avoiding taxes",
-            "using public infrastructure (roads, courts, educated workforce) funded by others",
-        ],
-        "reference": "ProPublica tax investigations, OECD BEPS reports, EU state aid cases"
-    },
-}
+KNOWN_PATTERNS = knowledge.KNOWN_PATTERNS      # tools/data/patterns.json
 
 
 # === The escalation ladder: what happens after all questions are asked ===
@@ -594,10 +551,29 @@ def demo():
     print()
     print("  record.save('data/leaders/name.json')  # Save with tamper-evident hash")
     print("  record.generate_report()                # Human-readable output")
+    print("  record.write_report(f)                  # Same, streamed to a file")
+    print()
+    print("  python3 tools/leader_transparency.py report data/leaders/ all.txt")
+    print("                                          # Every record in a directory, one file")
     print()
     print("The tool DESCRIBES. It does not SENTENCE.")
     print("Humans see. Humans decide.")
 
 
 if __name__ == "__main__":
-    demo()
+    if len(sys.argv) > 2 and sys.argv[1] == "report":
+        # python3 tools/leader_transparency.py report <dir> [out.txt] [--workers N]
+        args = sys.argv[2:]
+        workers = None
+        if "--workers" in args:
+            i = args.index("--workers")
+            workers = int(args[i + 1])
+            del args[i:i + 2]
+        if len(args) > 1:
+            with open(args[1], "w") as f:
+                n = write_reports(args[0], f, workers)
+            print(f"Wrote {args[1]} — {n} files")
+        else:
+            write_reports(args[0], sys.stdout, workers)
+    else:
+        demo()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+maint_cache.py — Rerun a maintenance check only when its own inputs changed.
+
+workspace/cache/head_cache.json keeps every maint_check_* result under
+one key, the repo HEAD. Any commit, even an "auto swarm HH:MM:SS" one
+that touched nothing a check reads, throws all of them away.
+
+Here every check has its own key: a hash of the inputs it depends on.
+
+  declared  Globs, paths and tokens given up front:
+              "tasks/*.md", "memory/INDEX.md"   Content of each match
+              "@head"                           Commit id of HEAD
+              "@day"                            Today's date (for age-based checks)
+  recorded  While the check runs, an audit hook notes every file under
+            the repo it opens and every directory it lists, plus the
+            file the check is defined in. A check that starts a process
+            cannot be followed inside it, so it also depends on @head.
+
+A file's hash is its content (sha1), recomputed only when its inode,
+mtime or size changed; a directory's is the hash of its sorted names.
+On the next run, a check whose inputs hash the same is a hit and its
+stored result is returned without running it.
+
+  workspace/cache/maint_cache.json
+    {"files":  {"tasks/NEXT.md": [inode, mtime_ns, size, sha1], ...},
+     "checks": {"maint_check_human_queue": {"deps": [...], "key": "...",
+                "result": [...], "hits": 12, "misses": 3, "ms": 41.2, "cpu_ms": 38.0}}}
+
+Run:
+  python3 tools/maint_cache.py stats           Hit rate per check
+  python3 tools/maint_cache.py deps NAME       What NAME depends on
+  python3 tools/maint_cache.py clear [NAME]    Forget one check, or all
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+from orient_cache import git_head
+
+
+CACHE = "workspace/cache/maint_cache.json"
+
+_local = threading.local()      # .paths: set being recorded by this thread, if any
+_hooked = False
+
+
+# === Recording ===
+
+def _hook(event, args):
+    paths = getattr(_local, "paths", None)
+    if paths is None:
+        return
+    if event in ("open", "os.listdir", "os.scandir") and args and isinstance(args[0], (str, bytes)):
+        path = os.fsdecode(args[0])
+        if not path.endswith(".pyc"):
+            paths.add((event != "open", os.path.realpath(path or ".")))
+    elif event == "subprocess.Popen":
+        paths.add((False, "@head"))
+
+
+def record(fn, *args, root: str = ".", declared=(), **kwargs) -> tuple:
+    """
+    Run fn(*args, **kwargs) and note what it read. Returns
+    (result, deps, ms): deps are declared + recorded, relative to root.
+    Safe to call in a worker process; store the outcome with MaintCache.store.
+    """
+    global _hooked
+    if not _hooked:
+        sys.addaudithook(_hook)     # Hooks cannot be removed: it idles when not recording
+        _hooked = True
+    root = os.path.realpath(root)
+    seen = set()
+    outer = getattr(_local, "paths", None)
+    _local.paths = seen
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        _local.paths = outer
+        if outer is not None:
+            outer |= seen       # A check built from other checks reads what they read
+    ms = (time.perf_counter() - t0) * 1000
+
+    deps = set(declared)
+    try:
+        source = inspect.getsourcefile(fn)
+    except TypeError:
+        source = None
+    if source:
+        seen.add((False, os.path.realpath(source)))
+    for is_dir, path in seen:
+        if path.startswith("@"):
+            deps.add(path)
+            continue
+        if path != root and not path.startswith(root + os.sep):
+            continue
+        rel = os.path.relpath(path, root)
+        if "__pycache__" in rel or rel == CACHE or rel.startswith(CACHE + "."):
+            continue
+        deps.add(rel + "/" if is_dir else rel)
+    return result, sorted(deps), ms
+
+
+# === Cache ===
+
+class MaintCache:
+    """Per-check results keyed by the hash of that check's inputs."""
+
+    def __init__(self, root: str = ".", path: str = None):
+        self.root = root
+        self.path = path or os.path.join(root, CACHE)
+        self.files = {}
+        self.checks = {}
+        self.session = {}       # name -> [hits, misses] since this object was made
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.checks = data.get("checks", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # --- input hashes ---
+
+    def _file_hash(self, rel: str) -> str:
+        full = os.path.join(self.root, rel)
+        try:
+            st = os.stat(full)
+        except OSError:
+            self.files.pop(rel, None)
+            return "missing"
+        known = self.files.get(rel)
+        stamp = [st.st_ino, st.st_mtime_ns, st.st_size]
+        if known and known[:3] == stamp:
+            return known[3]
+        h = hashlib.sha1()
+        try:
+            with open(full, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        except OSError:
+            return "unreadable"
+        digest = h.hexdigest()
+        self.files[rel] = stamp + [digest]
+        return digest
+
+    def _dir_hash(self, rel: str) -> str:
+        try:
+            names = sorted(os.listdir(os.path.join(self.root, rel or ".")))
+        except OSError:
+            return "missing"
+        return hashlib.sha1("\0".join(names).encode("utf-8", "surrogateescape")).hexdigest()
+
+    def _token(self, token: str) -> str:
+        if token == "@head":
+            return git_head(self.root)
+        if token == "@day":
+            return time.strftime("%Y-%m-%d", time.gmtime())
+        return token
+
+    def _expand(self, dep: str) -> list:
+        """[(kind, rel)] for one dep: a token, a directory, a path, or a glob."""
+        if dep.startswith("@"):
+            return [("token", dep)]
+        if dep.endswith("/"):
+            return [("dir", dep.rstrip("/"))]
+        if any(c in dep for c in "*?["):
+            import glob     # Only when a check declares a glob
+            matches = glob.glob(dep, root_dir=self.root, recursive=True)
+            return [("glob", dep)] + [("file", m) for m in sorted(matches)]
+        return [("file", dep)]
+
+    def key(self, deps) -> str:
+        """Hash of the current content of every input in deps."""
+        h = hashlib.sha1()
+        for dep in deps:
+            for kind, rel in self._expand(dep):
+                if kind == "token":
+                    value = self._token(rel)
+                elif kind == "dir":
+                    value = self._dir_hash(rel)
+                elif kind == "file":
+                    value = self._file_hash(rel)
+                else:
+                    value = ""
+                h.update(f"{kind}\0{rel}\0{value}\n".encode("utf-8", "surrogateescape"))
+        return h.hexdigest()
+
+    # --- results ---
+
+    def _count(self, name: str, hit: bool):
+        entry = self.checks.setdefault(name, {})
+        field = "hits" if hit else "misses"
+        entry[field] = entry.get(field, 0) + 1
+        self.session.setdefault(name, [0, 0])[0 if hit else 1] += 1
+
+    def lookup(self, name: str) -> tuple:
+        """(True, result) if name's inputs are unchanged since its result was stored."""
+        entry = self.checks.get(name)
+        if entry and "key" in entry and self.key(entry["deps"]) == entry["key"]:
+            self._count(name, True)
+            return True, entry["result"]
+        return False, None
+
+    def store(self, name: str, result, deps, ms: float = 0.0, cpu_ms: float = None):
+        """Keep a fresh result with the inputs it was computed from, and what it cost."""
+        entry = self.checks.setdefault(name, {})
+        entry.update(deps=list(deps), key=self.key(deps), result=result, ms=round(ms, 1))
+        if cpu_ms is not None:
+            entry["cpu_ms"] = round(cpu_ms, 1)
+        self._count(name, False)
+
+    def timed_out(self, name: str, budget_s: float):
+        """A run that hit its budget: counted as a miss, nothing stored."""
+        entry = self.checks.setdefault(name, {})
+        entry["timeouts"] = entry.get("timeouts", 0) + 1
+        entry["ms"] = round(budget_s * 1000, 1)     # At least this long; schedules it early next time
+        self._count(name, False)
+
+    def run(self, name: str, fn, *args, declared=(), **kwargs):
+        """Stored result of fn if its inputs are unchanged, else run, record and store it."""
+        hit, result = self.lookup(name)
+        if hit:
+            return result
+        result, deps, ms = record(fn, *args, root=self.root, declared=declared, **kwargs)
+        self.store(name, result, deps, ms)
+        return result
+
+    def forget(self, name: str = None):
+        if name is None:
+            self.checks.clear()
+        else:
+            self.checks.pop(name, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"files": self.files, "checks": self.checks}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def stats(self) -> list:
+        """[(name, hits, misses, hit rate, last ms)], lifetime counts, worst rate first."""
+        rows = []
+        for name, entry in self.checks.items():
+            hits, misses = entry.get("hits", 0), entry.get("misses", 0)
+            total = hits + misses
+            rows.append((name, hits, misses, hits / total if total else 0.0, entry.get("ms", 0.0)))
+        rows.sort(key=lambda r: (r[3], r[0]))
+        return rows
+
+
+def print_stats(cache: MaintCache):
+    rows = cache.stats()
+    hits = sum(r[1] for r in rows)
+    total = hits + sum(r[2] for r in rows)
+    print(f"{len(rows)} checks, {hits}/{total} hits ({hits / total:.0%})" if total else "empty")
+    for name, h, m, rate, ms in rows:
+        print(f"  {rate:5.0%}  {h:5d} hit {m:4d} miss  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    cache = MaintCache()
+    cmd = args[0] if args else "stats"
+    if cmd == "stats":
+        print_stats(cache)
+    elif cmd == "deps" and len(args) > 1:
+        entry = cache.checks.get(args[1])
+        if not entry:
+            print(f"No entry for {args[1]}")
+            sys.exit(1)
+        state = "fresh" if cache.key(entry.get("deps", [])) == entry.get("key") else "stale"
+        print(f"{args[1]}: {state}, {len(entry.get('deps', []))} inputs")
+        for dep in entry.get("deps", []):
+            print(f"  {dep}")
+    elif cmd == "clear":
+        cache.forget(args[1] if len(args) > 1 else None)
+        cache.save()
+    else:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
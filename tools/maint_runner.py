@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+maint_runner.py — Run every maintenance check at once, each within a budget.
+
+The maint_check_* functions (and the helpers cached beside them, like
+git_log_name_only_200_s50) do not depend on each other, but they ran
+one after another. A pass took the sum of all of them.
+
+This runs them side by side, one forked worker per check and at most
+--workers at a time:
+
+  - Checks whose inputs are unchanged come straight from maint_cache.py
+    and never start a worker.
+  - The rest are started longest first (by their last recorded time),
+    so a pass finishes in about the time of the slowest check.
+  - Each check has a time budget. A check still running when its
+    budget ends is killed and reported as a NOTICE. Every other result
+    is still returned.
+  - Wall and CPU time (including processes the check started) are
+    written to each check's entry in workspace/cache/maint_cache.json.
+
+A check that raises becomes a NOTICE ("check_x: <error>"). Timeouts and
+errors are not cached, so the next pass tries again.
+
+Run:
+  python3 tools/maint_runner.py                       Checks from tools/maint.py
+  python3 tools/maint_runner.py MODULE --workers 8 --budget 30
+  python3 tools/maint_runner.py MODULE --only maint_check_file_graph,maint_check_utility
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+
+from maint_cache import MaintCache, record
+
+
+BUDGET = 60.0           # Seconds per check, unless budgets says otherwise
+PREFIX = "maint_check_"
+
+
+@dataclass
+class CheckRun:
+    name: str
+    status: str             # hit, ok, error or timeout
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+
+
+def _short(name: str) -> str:
+    """maint_check_council_health -> check_council_health, as the NOTICEs name them."""
+    return name[len("maint_"):] if name.startswith("maint_") else name
+
+
+def discover(module) -> dict:
+    """{name: function} for every maint_check_* in a module, in definition order."""
+    return {name: fn for name, fn in vars(module).items()
+            if name.startswith(PREFIX) and callable(fn)}
+
+
+def _child(conn, fn, root: str, declared):
+    """Worker: run one check, send (status, result, deps, wall ms, cpu ms) back."""
+    cpu0 = time.process_time()
+    kids0 = os.times()
+    try:
+        result, deps, ms = record(fn, root=root, declared=declared)
+        status = "ok"
+    except Exception as e:
+        result, deps, ms, status = [["NOTICE", f"{_short(fn.__name__)}: {e}"]], [], 0.0, "error"
+    kids1 = os.times()
+    cpu = (time.process_time() - cpu0
+           + (kids1.children_user - kids0.children_user)
+           + (kids1.children_system - kids0.children_system))
+    conn.send((status, result, deps, ms, cpu * 1000))
+    conn.close()
+
+
+def run_checks(checks: dict, cache: MaintCache = None, workers: int = None,
+               budget: float = BUDGET, budgets: dict = None, declared: dict = None) -> tuple:
+    """
+    Run checks ({name: fn}) in parallel. Returns (results, runs):
+    results {name: result} in the order given, runs [CheckRun].
+    """
+    cache = cache or MaintCache()
+    workers = workers or os.cpu_count() or 1
+    budgets = budgets or {}
+    declared = declared or {}
+    results, runs = {}, {}
+
+    todo = []
+    for name in checks:
+        hit, result = cache.lookup(name)
+        if hit:
+            results[name] = result
+            runs[name] = CheckRun(name, "hit")
+        else:
+            todo.append(name)
+    # Longest first: the slowest check starts at once instead of last
+    todo.sort(key=lambda n: -cache.checks.get(n, {}).get("ms", 0.0))
+
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods()
+                                      else None)
+    running = {}        # conn -> (name, process, started, deadline)
+    while todo or running:
+        while todo and len(running) < workers:
+            name = todo.pop(0)
+            recv, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_child, args=(send, checks[name], cache.root,
+                                                    declared.get(name, ())), daemon=True)
+            proc.start()
+            send.close()
+            now = time.monotonic()
+            running[recv] = (name, proc, now, now + budgets.get(name, budget))
+
+        timeout = max(min(d for _, _, _, d in running.values()) - time.monotonic(), 0)
+        for conn in wait(list(running), timeout=timeout):
+            name, proc, started, _ = running.pop(conn)
+            try:
+                status, result, deps, ms, cpu = conn.recv()
+            except (EOFError, OSError):
+                # Died without a word (killed, os._exit, segfault)
+                proc.join()
+                result = [["NOTICE", f"{_short(name)}: worker exited ({proc.exitcode})"]]
+                status, deps, ms, cpu = "error", [], 0.0, 0.0
+            conn.close()
+            proc.join()
+            wall = (time.monotonic() - started) * 1000
+            if status == "ok":
+                cache.store(name, result, deps, wall, cpu)
+            results[name] = result
+            runs[name] = CheckRun(name, status, wall, cpu)
+
+        now = time.monotonic()
+        for conn, (name, proc, started, deadline) in list(running.items()):
+            if now < deadline:
+                continue
+            proc.kill()
+            proc.join()
+            conn.close()
+            del running[conn]
+            spent = budgets.get(name, budget)
+            cache.timed_out(name, spent)
+            results[name] = [["NOTICE", f"{_short(name)}: timed out after {spent:g}s"]]
+            runs[name] = CheckRun(name, "timeout", (now - started) * 1000)
+
+    return {n: results[n] for n in checks}, [runs[n] for n in checks]
+
+
+def print_runs(runs: list, elapsed: float):
+    longest = max((r.wall_ms for r in runs), default=0.0)
+    total = sum(r.wall_ms for r in runs)
+    counts = {}
+    for r in runs:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    print(f"{len(runs)} checks in {elapsed:.0f} ms (slowest {longest:.0f} ms, "
+          f"serial {total:.0f} ms): " + ", ".join(f"{v} {k}" for k, v in sorted(counts.items())))
+    for r in sorted(runs, key=lambda r: -r.wall_ms):
+        if r.status == "hit":
+            continue
+        print(f"  {r.status:7s} {r.wall_ms:8.1f} ms wall {r.cpu_ms:8.1f} ms cpu  {r.name}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {"--workers": None, "--budget": BUDGET, "--only": ""}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    module_name = args[0] if args else "maint"
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        print(f"Cannot import {module_name}: {e}")
+        sys.exit(1)
+    checks = discover(module)
+    if opts["--only"]:
+        wanted = opts["--only"].split(",")
+        checks = {n: getattr(module, n) for n in wanted if hasattr(module, n)}
+    if not checks:
+        print(f"No {PREFIX}* functions in {module_name}")
+        sys.exit(1)
+
+    cache = MaintCache()
+    t0 = time.perf_counter()
+    results, runs = run_checks(checks, cache, workers=int(opts["--workers"] or 0) or None,
+                               budget=float(opts["--budget"]))
+    elapsed = (time.perf_counter() - t0) * 1000
+    cache.save()
+    print_runs(runs, elapsed)
+    for name, result in results.items():
+        if not isinstance(result, list):
+            continue        # A helper's data, not findings
+        for item in result:
+            if isinstance(item, (list, tuple)) and len(item) == 2:
+                print(f"  [{item[0]}] {item[1]}")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+montecarlo.py — Run the choice a million times. Watch where it lands.
+
+consequence_sim.py shows what happened each time a choice was made. The
+precedents also say how long the consequences took ("6 years", "10-20
+years", "Immediate") and whether they could be undone (False, "Partially,
+through investigations", "Dead people don't come back"). Those are
+strings written for people.
+
+This reads them once into numbers:
+  time_to_consequence -> (low, high) years, sampled uniformly
+  reversible          -> (probability of reversal, years it takes)
+
+A trial picks one precedent of the choice at random, draws a time to
+consequence and draws whether it is ever reversed. Trials run in
+fixed-size chunks of NumPy arrays; only a histogram and a few sums are
+kept between chunks, so memory stays flat for any trial count.
+
+Every chunk has its own random stream spawned from (seed, choice key):
+the same seed gives the same numbers, whether one choice is run alone
+or a whole sweep is spread over a process pool.
+
+Not prediction. History, resampled.
+
+Run:
+  python3 tools/montecarlo.py invade_neighbor
+  python3 tools/montecarlo.py all --trials 10000000 --workers 4
+  python3 tools/montecarlo.py elect_authoritarian --seed 7
+
+Requires: numpy
+"""
+
+import multiprocessing
+import re
+import sys
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+TRIALS = 1_000_000
+CHUNK = 1 << 18                 # Trials per chunk: a few MB of arrays
+SEED = 0
+
+HORIZON = 50.0                  # Years covered by the histogram; later lands in the last bin
+BIN = 0.1                       # Histogram resolution, years
+PERCENTILES = (10, 25, 50, 75, 90)
+WITHIN = (1, 5, 10)             # Report the share of consequences inside these many years
+
+JITTER = 0.2                    # "6 years" -> 4.8..7.2
+IMMEDIATE = (0.0, 0.25)
+MONTHS = (1 / 12, 1.0)
+YEARS = (1.0, 10.0)             # "years", with no number
+ONGOING = (1.0, 20.0)           # Still unfolding: at least a year, open-ended
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)(?:\s*[-–]\s*(\d+(?:\.\d+)?))?\s*(months?|years?)?", re.I)
+
+# First match wins. (phrase, probability the consequence is ever reversed)
+REVERSIBILITY = [
+    ("don't come back", 0.0),
+    ("never", 0.0),
+    ("technically", 0.3),
+    ("slowly", 0.3),
+    ("after", 0.3),
+    ("partially", 0.4),
+    ("damaged but", 0.5),
+    ("yes, but", 0.6),
+    ("yes", 0.9),
+]
+UNKNOWN_REVERSIBILITY = 0.5
+
+
+# === Parsing ===
+
+def parse_time(text: str) -> tuple:
+    """
+    "6 years" -> (4.8, 7.2). "10-20 years" -> (10, 20).
+    "6 years to war, 12 to total collapse" -> (6, 12). "Immediate" -> (0, 0.25).
+    The range runs from the earliest to the latest time the text mentions.
+    """
+    low = text.lower()
+    points = []
+    for m in _NUMBER.finditer(low):
+        scale = 1 / 12 if (m.group(3) or "").startswith("month") else 1.0
+        points.append(float(m.group(1)) * scale)
+        if m.group(2):
+            points.append(float(m.group(2)) * scale)
+    if "immediate" in low:
+        points.extend(IMMEDIATE)
+    if "month" in low and not any(m.group(3) for m in _NUMBER.finditer(low)):
+        points.extend(MONTHS)
+    if re.search(r"\byears\b", low) and not re.search(r"\d", low):
+        points.extend(YEARS)
+    if "ongoing" in low and not points:
+        points.extend(ONGOING)
+    if not points:
+        return YEARS
+    lo, hi = min(points), max(points)
+    if lo == hi:
+        lo, hi = lo * (1 - JITTER), hi * (1 + JITTER)
+    return lo, hi
+
+
+def parse_reversible(value) -> tuple:
+    """
+    (probability of reversal, years until reversal) from a bool or a note.
+    "After 20 years and a revolution" -> (0.3, 20.0). False -> (0.0, 0.0).
+    """
+    if isinstance(value, bool):
+        return (1.0 if value else 0.0), 0.0
+    low = str(value).lower()
+    m = re.search(r"(\d+(?:\.\d+)?)\s*years?", low)
+    delay = float(m.group(1)) if m else 0.0
+    for phrase, p in REVERSIBILITY:
+        if phrase in low:
+            return p, delay
+    return UNKNOWN_REVERSIBILITY, delay
+
+
+@dataclass
+class ChoiceModel:
+    """Parsed precedents of one choice, as arrays. One row per precedent."""
+    key: str
+    who: list
+    time_low: np.ndarray
+    time_high: np.ndarray
+    p_reverse: np.ndarray
+    reverse_delay: np.ndarray
+
+    @classmethod
+    def from_entry(cls, key: str, entry: dict) -> "ChoiceModel":
+        precedents = entry.get("precedents", [])
+        times = [parse_time(p.get("time_to_consequence", "")) for p in precedents]
+        revs = [parse_reversible(p.get("reversible", "")) for p in precedents]
+        return cls(
+            key=key,
+            who=[p.get("who", "") for p in precedents],
+            time_low=np.array([t[0] for t in times]),
+            time_high=np.array([t[1] for t in times]),
+            p_reverse=np.array([r[0] for r in revs]),
+            reverse_delay=np.array([r[1] for r in revs]),
+        )
+
+
+# === Simulation ===
+
+@dataclass
+class SimulationResult:
+    key: str
+    trials: int
+    seed: int
+    mean_years: float
+    time_percentiles: dict          # {"p50": years, ...}
+    within: dict                    # {"1y": share, ...}
+    reversed_share: float
+    mean_years_to_reversal: float   # Over reversed trials only
+    per_precedent: list = field(default_factory=list)  # [(who, share of trials, reversed share)]
+
+
+def _streams(seed: int, key: str, chunks: int) -> list:
+    """One independent generator per chunk, fixed by (seed, key)."""
+    ss = np.random.SeedSequence([seed, zlib.crc32(key.encode())])
+    return [np.random.default_rng(s) for s in ss.spawn(chunks)]
+
+
+def _percentiles(hist: np.ndarray) -> dict:
+    cdf = np.cumsum(hist) / max(hist.sum(), 1)
+    return {f"p{p}": round(float(np.searchsorted(cdf, p / 100.0) * BIN), 2) for p in PERCENTILES}
+
+
+def simulate(model: ChoiceModel, trials: int = TRIALS, seed: int = SEED,
+             chunk: int = CHUNK) -> SimulationResult:
+    """Run `trials` draws of one choice, `chunk` at a time. trials must be at least 1."""
+    if trials < 1:
+        raise ValueError(f"trials must be at least 1, got {trials}")
+    n_prec = len(model.who)
+    bins = int(HORIZON / BIN) + 1
+    hist = np.zeros(bins, dtype=np.int64)
+    picked = np.zeros(n_prec, dtype=np.int64)
+    reversed_by = np.zeros(n_prec, dtype=np.int64)
+    total_time = total_reversal = 0.0
+    if not n_prec:
+        return SimulationResult(model.key, 0, seed, 0.0, _percentiles(hist), {}, 0.0, 0.0)
+
+    n_chunks = -(-trials // chunk)
+    for c, rng in enumerate(_streams(seed, model.key, n_chunks)):
+        n = min(chunk, trials - c * chunk)
+        which = rng.integers(0, n_prec, size=n)
+        years = rng.uniform(model.time_low[which], model.time_high[which])
+        undone = rng.random(n) < model.p_reverse[which]
+
+        hist += np.bincount(np.minimum((years / BIN).astype(np.int64), bins - 1), minlength=bins)
+        picked += np.bincount(which, minlength=n_prec)
+        reversed_by += np.bincount(which[undone], minlength=n_prec)
+        total_time += years.sum()
+        total_reversal += (years[undone] + model.reverse_delay[which[undone]]).sum()
+
+    n_reversed = int(reversed_by.sum())
+    cdf = np.cumsum(hist)
+    return SimulationResult(
+        key=model.key,
+        trials=trials,
+        seed=seed,
+        mean_years=round(total_time / trials, 2),
+        time_percentiles=_percentiles(hist),
+        within={f"{y}y": round(float(cdf[min(int(y / BIN), bins - 1) - 1]) / trials, 4) for y in WITHIN},
+        reversed_share=round(n_reversed / trials, 4),
+        mean_years_to_reversal=round(total_reversal / n_reversed, 2) if n_reversed else 0.0,
+        per_precedent=[
+            (who, round(int(k) / trials, 4), round(int(r) / int(k), 4) if k else 0.0)
+            for who, k, r in zip(model.who, picked, reversed_by)
+        ],
+    )
+
+
+def _run(job) -> SimulationResult:
+    key, entry, trials, seed, chunk = job
+    return simulate(ChoiceModel.from_entry(key, entry), trials, seed, chunk)
+
+
+def sweep(database: dict, keys: list = None, trials: int = TRIALS, seed: int = SEED,
+          chunk: int = CHUNK, workers: int = 1) -> list:
+    """Simulate several choices. workers > 1 runs one choice per process."""
+    keys = list(keys or database)
+    jobs = [(k, database[k], trials, seed, chunk) for k in keys]
+    if workers == 1 or len(jobs) < 2:
+        return [_run(j) for j in jobs]
+    with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+        return pool.map(_run, jobs)
+
+
+def format_result(res: SimulationResult, choice: str = "") -> str:
+    lines = []
+    lines.append(f"{res.key}" + (f" — {choice}" if choice else ""))
+    lines.append(f"  {res.trials:,} trials, seed {res.seed}")
+    pct = "  ".join(f"{k} {v:g}y" for k, v in res.time_percentiles.items())
+    lines.append(f"  Time to consequence: mean {res.mean_years:g}y   {pct}")
+    within = "  ".join(f"within {k}: {v:.0%}" for k, v in res.within.items())
+    lines.append(f"  {within}")
+    lines.append(f"  Ever reversed: {res.reversed_share:.1%}"
+                 + (f" (after ~{res.mean_years_to_reversal:g}y)" if res.reversed_share else ""))
+    for who, share, rev in res.per_precedent:
+        lines.append(f"    {share:6.1%} of trials  reversed {rev:5.1%}  {who}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from consequence_sim import PRECEDENT_DATABASE
+
+    args = sys.argv[1:]
+    opts = {"--trials": TRIALS, "--seed": SEED, "--workers": 1}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = int(args[i + 1])
+            del args[i:i + 2]
+
+    if not args:
+        print("Usage: python3 tools/montecarlo.py <choice_key|all> "
+              "[--trials N] [--seed S] [--workers N]")
+        print("Choices: " + ", ".join(PRECEDENT_DATABASE))
+        sys.exit(0)
+
+    if opts["--trials"] < 1:
+        print(f"--trials must be at least 1, got {opts['--trials']}")
+        sys.exit(1)
+
+    keys = list(PRECEDENT_DATABASE) if args[0] == "all" else args
+    unknown = [k for k in keys if k not in PRECEDENT_DATABASE]
+    if unknown:
+        print(f"Unknown choice: {', '.join(unknown)}")
+        sys.exit(1)
+
+    results = sweep(PRECEDENT_DATABASE, keys, opts["--trials"], opts["--seed"],
+                    workers=opts["--workers"])
+    print("MONTE CARLO — history, resampled\n")
+    for res in results:
+        print(format_result(res, PRECEDENT_DATABASE[res.key]["choice"]))
+        print()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+orient_cache.py — orient.py output, reused until HEAD or its inputs change.
+
+Every swarm loop asks tools/orient.py for the current priorities, once
+per cycle (swarm_clean.sh twice). On an unchanged tree the answer is the
+same every time, and each run costs an interpreter plus whatever orient
+reads.
+
+This runs orient.py once with an audit hook that records every file it
+opens and every directory it lists under the repo root. The output is
+stored with git HEAD and the (mtime, size) of each of those paths, the
+way workspace/cache/head_cache.json stores results by head:
+
+  workspace/cache/orient_cache.json
+    {"head": "8df900e8d424", "deps": {"tasks/NEXT.md": [mtime_ns, size], ...},
+     "returncode": 0, "stdout": "..."}
+
+The next call reads HEAD straight from .git (no git process) and stats
+the recorded paths. If nothing moved, the stored output is printed and
+orient.py does not run. A path orient looked for but did not find is
+recorded as missing, so creating it invalidates the entry too.
+
+Run:
+  python3 tools/orient_cache.py              Same output as tools/orient.py
+  python3 tools/orient_cache.py --refresh    Run orient.py regardless
+  python3 tools/orient_cache.py --deps       Show what the cached entry depends on
+"""
+
+import json
+import os
+import sys
+
+
+ORIENT = "tools/orient.py"
+CACHE = "workspace/cache/orient_cache.json"
+
+# Runs orient.py as __main__ and writes every repo path it touched to argv[1]
+_RECORDER = r"""
+import json, os, runpy, sys
+out, script, root = sys.argv[1], sys.argv[2], os.path.realpath(sys.argv[3])
+seen = set()
+def hook(event, args):
+    if event in ("open", "os.listdir", "os.scandir") and args and isinstance(args[0], (str, bytes)):
+        path = os.fsdecode(args[0])
+        if event == "open" and path.endswith(".pyc"):
+            return
+        seen.add(os.path.realpath(path or "."))
+sys.addaudithook(hook)
+sys.argv = [script]
+sys.path[0] = os.path.dirname(script)
+try:
+    runpy.run_path(script, run_name="__main__")
+finally:
+    sys.stdout.flush()
+    deps = sorted(os.path.relpath(p, root) for p in seen
+                  if p == root or p.startswith(root + os.sep))
+    with open(out, "w") as f:
+        json.dump([d for d in deps if "__pycache__" not in d and not d.startswith(".git" + os.sep)], f)
+"""
+
+
+# === HEAD ===
+
+def _git_dir(root: str) -> str:
+    git = os.path.join(root, ".git")
+    if os.path.isfile(git):
+        # Worktree or submodule: .git is a "gitdir: <path>" pointer
+        with open(git) as f:
+            line = f.read().strip()
+        if line.startswith("gitdir:"):
+            return os.path.join(root, line.split(":", 1)[1].strip())
+    return git
+
+
+def git_head(root: str = ".") -> str:
+    """Commit id of HEAD, read from .git without starting git. '' if unknown."""
+    gd = _git_dir(root)
+    try:
+        with open(os.path.join(gd, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref:"):
+            return head
+        ref = head[4:].strip()
+        common = gd
+        if os.path.exists(os.path.join(gd, "commondir")):
+            with open(os.path.join(gd, "commondir")) as f:
+                common = os.path.join(gd, f.read().strip())
+        for base in (gd, common):
+            try:
+                with open(os.path.join(base, ref)) as f:
+                    return f.read().strip()
+            except OSError:
+                pass
+        with open(os.path.join(common, "packed-refs")) as f:
+            for line in f:
+                if line.endswith(" " + ref + "\n"):
+                    return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    import subprocess
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True,
+                              text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+# === Cache ===
+
+def _stamp(root: str, rel: str):
+    try:
+        st = os.stat(os.path.join(root, rel))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load(root: str) -> dict:
+    try:
+        with open(os.path.join(root, CACHE)) as f:
+            entry = json.load(f)
+        return entry if isinstance(entry, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _fresh(root: str, entry: dict, head: str) -> bool:
+    if not entry or entry.get("head") != head[:12]:
+        return False
+    return all(_stamp(root, rel) == stamp for rel, stamp in entry.get("deps", {}).items())
+
+
+def _run(root: str) -> dict:
+    import subprocess   # Only on a miss: a hit starts no process and needs neither
+    import tempfile
+    script = os.path.join(root, ORIENT)
+    fd, deps_path = tempfile.mkstemp(prefix="orient_deps_", suffix=".json")
+    os.close(fd)
+    try:
+        r = subprocess.run([sys.executable, "-c", _RECORDER, deps_path, os.path.abspath(script),
+                            os.path.abspath(root)],
+                           cwd=root, capture_output=True, text=True)
+        try:
+            with open(deps_path) as f:
+                deps = json.load(f)
+        except (OSError, ValueError):
+            deps = []
+    finally:
+        os.remove(deps_path)
+    deps = sorted(set(deps) | {ORIENT})
+    return {"head": "", "deps": {rel: _stamp(root, rel) for rel in deps},
+            "returncode": r.returncode, "stdout": r.stdout, "stderr": r.stderr}
+
+
+def _save(root: str, entry: dict):
+    path = os.path.join(root, CACHE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass        # Read-only tree: just no cache
+
+
+def orient_entry(root: str = ".", refresh: bool = False) -> dict:
+    """Cached (or freshly run) orient.py result: head, deps, returncode, stdout, stderr."""
+    if not os.path.exists(os.path.join(root, ORIENT)):
+        return {"head": "", "deps": {}, "returncode": 2, "stdout": "", "stderr": "", "hit": False}
+    head = git_head(root)
+    entry = _load(root)
+    if not refresh and _fresh(root, entry, head):
+        entry["hit"] = True
+        return entry
+    entry = _run(root)
+    entry["head"] = head[:12]
+    # Only a clean run is worth keeping
+    if entry["returncode"] == 0:
+        _save(root, entry)
+    entry["hit"] = False
+    return entry
+
+
+def orient(root: str = ".", refresh: bool = False) -> str:
+    """orient.py's stdout, '' if it is missing or failed."""
+    entry = orient_entry(root, refresh)
+    return entry["stdout"] if entry["returncode"] == 0 else ""
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    entry = orient_entry(".", refresh="--refresh" in args)
+    if "--deps" in args:
+        state = "hit" if entry["hit"] else "miss"
+        print(f"{state}, head {entry['head'] or '-'}, {len(entry['deps'])} paths:")
+        for rel, stamp in entry["deps"].items():
+            print(f"  {rel}" + ("" if stamp else "  (missing)"))
+        sys.exit(0)
+    sys.stdout.write(entry["stdout"])
+    sys.stderr.write(entry.get("stderr", ""))
+    sys.exit(entry["returncode"])
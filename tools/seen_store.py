@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+seen_store.py — Has the swarm already done this task? One hash lookup.
+
+Every loop keeps a seen file (.swarm_seen, .swarm_super.seen,
+.swarm_brain.seen, runtime/*.seen): one task id per line, appended
+forever. Checking it meant `grep -vxFf` or reading the whole file into a
+set, every cycle. Both get slower as the file grows.
+
+The seen file stays exactly what it is: an append-only log, one key per
+line, so `echo "$ID" >> "$SEEN_FILE"` keeps working. Next to it lives an
+index, <seen file>.idx: an open-addressing hash table of 64-bit key
+hashes, memory-mapped, with a header that records how many bytes of the
+log it covers.
+
+Opening the store reads only the bytes appended since the last open.
+Membership is one hash and a short probe, whatever the history size.
+If the log shrinks (someone truncated it to start over), the index is
+rebuilt. When more than a fifth of the log lines are duplicates, the
+log is compacted: rewritten with each key once, in first-seen order.
+
+Run:
+  printf 'L-1\\nL-2\\n' | python3 tools/seen_store.py filter .swarm_seen   Unseen lines only
+  python3 tools/seen_store.py add .swarm_seen L-1 L-2
+  python3 tools/seen_store.py has .swarm_seen L-1                        Exit 0 if seen
+  python3 tools/seen_store.py stats .swarm_seen
+  python3 tools/seen_store.py compact .swarm_seen
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from contextlib import contextmanager
+
+
+_MAGIC = b"SEENIDX1"
+_HEADER = struct.Struct("<8sQQQQQ")   # magic, log inode, log bytes covered, keys, duplicate lines, capacity
+_SLOT = struct.Struct("<Q")
+
+MIN_CAPACITY = 1 << 10
+MAX_LOAD = 0.5
+COMPACT_MIN_LINES = 1000
+COMPACT_DUP_SHARE = 0.2
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of a key. Never 0: 0 marks an empty slot."""
+    h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    return h or 1
+
+
+class SeenStore:
+    """Append-only seen log with a memory-mapped hash index beside it. Safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.idx_path = path + ".idx"
+        self._fd = None
+        self._map = None
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.inode = self.covered = self.count = self.duplicates = 0
+        self.capacity = 0
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            open(path, "a").close()
+        self._open_index()
+        self.refresh()
+
+    @contextmanager
+    def _locked(self):
+        """
+        The index to ourselves. flock keeps other processes out but not our
+        own threads (they share the fd), so a thread lock goes around it.
+        """
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # --- index file ---
+
+    def _open_index(self):
+        fd = os.open(self.idx_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(fd).st_size
+            ok = size >= _HEADER.size
+            if ok:
+                magic, inode, covered, count, dups, cap = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+                ok = magic == _MAGIC and cap and size == _HEADER.size + cap * _SLOT.size
+            if not ok:
+                inode = covered = count = dups = 0
+                cap = MIN_CAPACITY
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, _HEADER.size + cap * _SLOT.size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._map = mmap.mmap(fd, 0)
+        self.inode, self.covered, self.count, self.duplicates, self.capacity = inode, covered, count, dups, cap
+        self._write_header()
+
+    def _reload_header(self):
+        """Pick up what another process wrote to the shared index."""
+        _, inode, covered, count, dups, cap = _HEADER.unpack(self._map[:_HEADER.size])
+        if cap != self.capacity:
+            self._map.close()
+            self._map = mmap.mmap(self._fd, 0)
+        self.inode, self.covered, self.count, self.duplicates, self.capacity = inode, covered, count, dups, cap
+
+    def _write_header(self):
+        self._map[:_HEADER.size] = _HEADER.pack(
+            _MAGIC, self.inode, self.covered, self.count, self.duplicates, self.capacity)
+
+    def _slot(self, h: int) -> tuple:
+        """(slot index, found) for hash h, by linear probing."""
+        mask = self.capacity - 1
+        i = h & mask
+        base = _HEADER.size
+        while True:
+            v = _SLOT.unpack_from(self._map, base + i * _SLOT.size)[0]
+            if v == h:
+                return i, True
+            if v == 0:
+                return i, False
+            i = (i + 1) & mask
+
+    def _insert(self, h: int) -> bool:
+        i, found = self._slot(h)
+        if found:
+            return False
+        _SLOT.pack_into(self._map, _HEADER.size + i * _SLOT.size, h)
+        self.count += 1
+        if self.count > self.capacity * MAX_LOAD:
+            self._resize(self.capacity * 2)
+        return True
+
+    def _resize(self, capacity: int):
+        old = [v for v in struct.unpack_from(f"<{self.capacity}Q", self._map, _HEADER.size) if v]
+        self._map.close()
+        os.ftruncate(self._fd, _HEADER.size + capacity * _SLOT.size)
+        self._map = mmap.mmap(self._fd, 0)
+        self._map[_HEADER.size:] = bytes(capacity * _SLOT.size)
+        self.capacity = capacity
+        self.count = 0
+        for h in old:
+            i, _ = self._slot(h)
+            _SLOT.pack_into(self._map, _HEADER.size + i * _SLOT.size, h)
+            self.count += 1
+
+    def _reset(self):
+        self._map[_HEADER.size:] = bytes(self.capacity * _SLOT.size)
+        self.covered = self.count = self.duplicates = 0
+
+    # --- log ---
+
+    def refresh(self):
+        """Index whatever was appended to the log since last time."""
+        st = os.stat(self.path)
+        if st.st_size == self.covered and st.st_ino == self.inode:
+            return
+        with self._locked():
+            self._catch_up()
+
+    def _catch_up(self):
+        """Read the log from where the index stops. Caller holds the index lock."""
+        self._reload_header()
+        st = os.stat(self.path)
+        if st.st_ino != self.inode or st.st_size < self.covered:
+            self._reset()       # Log was truncated or replaced: start over
+            self.inode = st.st_ino
+        with open(self.path, "rb") as f:
+            f.seek(self.covered)
+            tail = f.read(st.st_size - self.covered)
+        end = tail.rfind(b"\n") + 1     # Leave a half-written last line for next time
+        for line in tail[:end].splitlines():
+            key = line.decode("utf-8", "replace").strip()
+            if key and not self._insert(key_hash(key)):
+                self.duplicates += 1
+        self.covered += end
+        self._write_header()
+
+    def __contains__(self, key: str) -> bool:
+        """Membership as of the last refresh()/add()."""
+        with self._lock:
+            return self._slot(key_hash(key.strip()))[1]
+
+    def __len__(self):
+        return self.count
+
+    def add(self, key: str) -> bool:
+        """Record a key. False if it was already seen (nothing is written)."""
+        key = key.strip()
+        if not key:
+            return False
+        with self._locked():
+            self._catch_up()
+            if key in self:
+                return False
+            with open(self.path, "ab") as f:
+                f.write((key + "\n").encode("utf-8"))
+            # Index our line the same way as anyone else's, in log order
+            self._catch_up()
+            self.maybe_compact()
+        return True
+
+    def filter(self, keys) -> list:
+        """Keys not seen yet, in their original order."""
+        self.refresh()
+        return [k for k in keys if k.strip() and k.strip() not in self]
+
+    def maybe_compact(self) -> bool:
+        lines = self.count + self.duplicates
+        if lines >= COMPACT_MIN_LINES and self.duplicates > lines * COMPACT_DUP_SHARE:
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """Rewrite the log with each key once, first-seen order, then reindex."""
+        with self._locked():
+            with open(self.path, "rb") as f:
+                data = f.read()
+            end = data.rfind(b"\n") + 1
+            keys = dict.fromkeys(
+                k for k in (line.decode("utf-8", "replace").strip() for line in data[:end].splitlines()) if k)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write("".join(k + "\n" for k in keys).encode("utf-8"))
+                # Anything appended while we were writing
+                with open(self.path, "rb") as src:
+                    src.seek(end)
+                    f.write(src.read())
+            os.replace(tmp, self.path)
+            self._reset()
+            self.inode = os.stat(self.path).st_ino
+            self._write_header()
+            self._catch_up()
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+    cmd, path, rest = sys.argv[1], sys.argv[2], sys.argv[3:]
+    store = SeenStore(path)
+
+    if cmd == "filter":
+        out = sys.stdout
+        for line in sys.stdin:
+            key = line.strip()
+            if key and key not in store:
+                out.write(key + "\n")
+    elif cmd == "add":
+        for key in rest or (line for line in sys.stdin):
+            store.add(key)
+    elif cmd == "has":
+        sys.exit(0 if rest and all(k in store for k in rest) else 1)
+    elif cmd == "stats":
+        print(f"{store.count} keys, {store.duplicates} duplicate lines, "
+              f"{store.covered} bytes indexed, capacity {store.capacity}")
+    elif cmd == "compact":
+        before = store.covered
+        store.compact()
+        print(f"{before} -> {store.covered} bytes, {store.count} keys")
+    else:
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
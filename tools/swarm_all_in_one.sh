@@ -8,6 +8,7 @@ LOG_FILE="$ROOT/runtime/swarm.log"
 STATUS_FILE="$ROOT/runtime/status.txt"
 SUMMARY_FILE="$ROOT/runtime/summary.txt"
 CLAIM_DIR="$ROOT/runtime/claims"
+SYNC_STATE="$SEEN_FILE.gitsync"
 
 MAX_BATCH="${MAX_BATCH:-3}"
 SLEEP_SECS="${SLEEP_SECS:-4}"
@@ -16,6 +17,10 @@ SCREENSHOT_EVERY="${SCREENSHOT_EVERY:-0}"
 mkdir -p "$ROOT/runtime" "$CLAIM_DIR" "$ROOT/tasks" "$ROOT/tools" "$ROOT/memory"
 touch "$SEEN_FILE" "$LOG_FILE" "$STATUS_FILE" "$SUMMARY_FILE" "$ROOT/tasks/NEXT.md"
 
+# The loop runs in one Python process (swarm_daemon.py), not a process per step.
+# SWARM_PY=0 bash tools/swarm_all_in_one.sh runs the shell loop below instead
+[ "${SWARM_PY:-1}" = 1 ] && exec python3 "$ROOT/tools/swarm_daemon.py" all_in_one
+
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
 
@@ -23,6 +28,24 @@ log() {
   printf '[%s] %s\n' "$(date '+%F %T')" "$*" | tee -a "$LOG_FILE"
 }
 
+# ---------- TRACE ----------
+# One JSON line per phase for tools/swarm_trace.py, written with builtins only
+TRACE_FILE="${LOG_FILE%.log}.trace.jsonl"
+CYCLE=0
+mark() {
+  # mark VAR: the /proc/uptime clock (what swarm_trace.py calls start) and the wall clock
+  local up _
+  { read -r up _ < /proc/uptime; } 2>/dev/null || up=0
+  printf -v "$1" '%s %s' "$up" "$EPOCHREALTIME"
+}
+span() {
+  # span NAME MARK OUTCOME [TASK]
+  local end _
+  { read -r end _ < /proc/uptime; } 2>/dev/null || end=0
+  printf '{"name":"%s","start":%s,"end":%s,"ts":%s,"loop":"all_in_one","pid":%d,"tid":%d,"cycle":%d,"task":"%s","outcome":"%s"}\n' \
+    "$1" "${2% *}" "$end" "${2#* }" "$$" "$BASHPID" "$CYCLE" "${4:-}" "$3" >> "$TRACE_FILE"
+}
+
 DEFAULT_BRANCH="$(git remote show origin 2>/dev/null | sed -n '/HEAD branch/s/.*: //p')"
 [ -z "${DEFAULT_BRANCH:-}" ] && DEFAULT_BRANCH="$(git branch --show-current 2>/dev/null || echo master)"
 
@@ -31,8 +54,13 @@ LAST_ID="none"
 LAST_ACTION="none"
 LAST_RESULT="idle"
 
+# Counted once here; the loop adds what it appends, so a status write never rescans the file
+SEEN_COUNT="$(wc -l < "$SEEN_FILE" 2>/dev/null || echo 0)"
+
 write_status() {
-  cat > "$STATUS_FILE" <<STATUS
+  # Written aside and renamed in: readers never see a half-written file
+  local tmp="$STATUS_FILE.$BASHPID.tmp"
+  cat > "$tmp" <<STATUS
 time: $(date '+%F %T')
 root: $ROOT
 branch: $DEFAULT_BRANCH
@@ -41,10 +69,11 @@ last_batch: $LAST_BATCH
 last_id: $LAST_ID
 last_action: $LAST_ACTION
 last_result: $LAST_RESULT
-seen_count: $(wc -l < "$SEEN_FILE" 2>/dev/null || echo 0)
+seen_count: $SEEN_COUNT
 log_file: $LOG_FILE
 summary_file: $SUMMARY_FILE
 STATUS
+  mv -f "$tmp" "$STATUS_FILE"
 }
 
 write_summary() {
@@ -71,127 +100,72 @@ maybe_screenshot() {
 
 sync_down() {
   log "SYNC DOWN"
-  git fetch origin "$DEFAULT_BRANCH" || true
-  git reset --hard "origin/$DEFAULT_BRANCH" || true
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --reset-to origin --message "swarm: batch {time}")" || true
+  span sync_down "$t" "${out:-error}"
 }
 
 sync_up() {
   log "SYNC UP"
-  git add . || true
-  git commit -m "swarm: batch $(date +%H:%M:%S)" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  # Only the paths workers reported; commits coalesce over SYNC_WINDOW_SECS / SYNC_TASKS
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "swarm: batch {time}")" || true
+  span sync_up "$t" "${out:-error}"
 }
 
 claim() {
-  local id="$1"
-  local file="$CLAIM_DIR/$id.claim"
-  ( set -o noclobber; echo "$$" > "$file" ) 2>/dev/null
+  # A lease, renewed by the loop's heartbeat below; stale claims are reclaimed
+  local t
+  mark t
+  if ! python3 "$ROOT/tools/claims.py" acquire "$CLAIM_DIR" "$1" --pid $$; then
+    span claim "$t" held "$1"
+    return 1
+  fi
+  span claim "$t" claimed "$1"
 }
 
 release() {
-  rm -f "$CLAIM_DIR/$1.claim" 2>/dev/null || true
+  python3 "$ROOT/tools/claims.py" release "$CLAIM_DIR" "$1" --pid $$ 2>/dev/null || true
 }
 
+# One heartbeat renews every claim this loop holds, until the loop exits.
+# Disowned, so `wait` and `wait -n` only ever see the workers
+python3 "$ROOT/tools/claims.py" heartbeat "$CLAIM_DIR" --all --pid $$ >/dev/null 2>&1 &
+disown
+
 pick_batch() {
 python3 - "$ROOT" "$SEEN_FILE" "$MAX_BATCH" << 'PY'
-import re, sys, pathlib, subprocess
+import sys, pathlib
 
 root = pathlib.Path(sys.argv[1])
 seen_path = pathlib.Path(sys.argv[2])
 max_batch = int(sys.argv[3])
 
-def read(p):
-    try:
-        return p.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return ""
-
-seen = set()
-if seen_path.exists():
-    seen = {x.strip() for x in read(seen_path).splitlines() if x.strip()}
-
-text_next = read(root / "tasks" / "NEXT.md")
-text_lanes = read(root / "tasks" / "SWARM-LANES.md")
-text_log = read(root / "memory" / "SESSION-LOG.md")
-
-scores = {}
-
-def add(id_, score):
-    if re.fullmatch(r"L-\d+", id_):
-        scores[id_] = scores.get(id_, 0) + score
-
-for m in re.finditer(r"L-\d+", text_next):
-    add(m.group(0), 80)
-
-for line in text_lanes.splitlines():
-    ids = re.findall(r"L-\d+", line)
-    if not ids:
-        continue
-    U = line.upper()
-    L = line.lower()
-    base = 0
-    if "ACTIVE" in U: base += 120
-    if "READY" in U: base += 100
-    if "BLOCKED" in U: base -= 80
-    if "ABANDONED" in U or "MERGED" in U: base -= 120
-    if "next_step=" in L: base += 10
-    if "focus=" in L: base += 8
-    if "available=" in L: base += 5
-    if "human_open_item=" in L: base -= 25
-    for i in ids:
-        add(i, base)
-
-for line in text_log.lower().splitlines()[-300:]:
-    for i in re.findall(r"l-\d+", line):
-        i = i.upper()
-        if "duplicate" in line or "near-duplicate" in line:
-            add(i, -20)
-        if "stale" in line or "obsolete" in line:
-            add(i, -15)
-        if "working" in line or "resolved" in line or "done" in line:
-            add(i, 5)
-
-try:
-    out = subprocess.check_output(
-        ["python3", str(root / "tools" / "orient.py")],
-        stderr=subprocess.DEVNULL,
-        text=True,
-    )
-    for n, i in enumerate(re.findall(r"L-\d+", out)):
-        add(i, max(30 - n, 1))
-except Exception:
-    pass
-
-items = [(score, i) for i, score in scores.items() if i not in seen and score >= 0]
-items.sort(key=lambda x: (-x[0], x[1]))
-
-for _, i in items[:max_batch]:
+sys.path.insert(0, str(root / "tools"))
+from seen_store import SeenStore
+from task_index import LANE_WEIGHTS, TaskIndex
+seen = SeenStore(str(seen_path))
+
+weights = dict(LANE_WEIGHTS, BLOCKED=-80, **{"domain_sync=": 0, "memory_target=": 0})
+state = str(seen_path) + ".taskindex"
+index = TaskIndex.load(state, str(root), weights, window=300)
+index.update()
+index.save(state)
+
+from orient_cache import orient
+out = orient(str(root))
+
+for _, i in index.ranked(out, seen)[:max_batch]:
     print(i)
 PY
 }
 
 decide_action() {
-python3 - "$ROOT" "$1" << 'PY'
-import sys, pathlib
-root = pathlib.Path(sys.argv[1])
-id_ = sys.argv[2]
-
-txt = ""
-for p in [root/"tasks"/"NEXT.md", root/"tasks"/"SWARM-LANES.md", root/"memory"/"SESSION-LOG.md"]:
-    try:
-        txt += "\n" + p.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        pass
-
-scope = "\n".join([line.lower() for line in txt.splitlines() if id_.lower() in line.lower()]) or txt.lower()
-
-if any(w in scope for w in ["blocked", "human_open_item", "unclear", "investigate", "question"]):
-    print("s")
-elif any(w in scope for w in ["duplicate", "near-duplicate", "stale", "obsolete", "abandoned"]):
-    print("d")
-else:
-    print("k")
-PY
+  # Lines naming the id, from a mention index kept next to the seen file
+  python3 "$ROOT/tools/task_index.py" decide "$1" --state "$SEEN_FILE.mentions"
 }
 
 process_one() {
@@ -207,17 +181,28 @@ process_one() {
 
   log "WORK $id action=$action"
 
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  local t rc=0 outcome=ok
+  mark t
+  local touched="$SYNC_STATE.touched/$id"
+  mkdir -p "${touched%/*}"
+  rm -f "$touched"
   if [ -x "$ROOT/tools/resolve_one.sh" ]; then
-    AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$id" || true
+    SWARM_TOUCHED="$touched" AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$id" || rc=$?
   else
     case "$action" in
       d) git commit --allow-empty -m "resolve $id" >/dev/null 2>&1 || true ;;
       k) git commit --allow-empty -m "acknowledge $id" >/dev/null 2>&1 || true ;;
       *) : ;;
     esac
+    : > "$touched"
   fi
 
   echo "$id" >> "$SEEN_FILE"
+  SEEN_COUNT=$((SEEN_COUNT + 1))
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$id" || true
+  [ "$rc" -eq 0 ] || outcome="exit $rc"
+  span work "$t" "$outcome" "$id"
   LAST_RESULT="done"
   write_status
   write_summary
@@ -230,9 +215,15 @@ write_status
 write_summary
 
 while true; do
+  CYCLE=$((CYCLE + 1))
+  if [ $((CYCLE % 100)) -eq 0 ]; then
+    python3 "$ROOT/tools/swarm_trace.py" rotate "$TRACE_FILE" >/dev/null || true
+  fi
   sync_down
 
+  mark t
   mapfile -t BATCH < <(pick_batch)
+  span pick "$t" ok
 
   if [ "${#BATCH[@]}" -eq 0 ]; then
     LAST_BATCH="none"
@@ -243,7 +234,9 @@ while true; do
     write_summary
     log "NO REAL TASKS -> waiting"
     maybe_screenshot
+    mark t
     sleep "$SLEEP_SECS"
+    span sleep "$t" ok
     continue
   fi
 
@@ -274,11 +267,15 @@ while true; do
   for id in "${active[@]}"; do
     release "$id"
   done
+  # The workers counted in their subshells
+  SEEN_COUNT=$((SEEN_COUNT + ${#active[@]}))
 
   sync_up
   maybe_screenshot
   log "CYCLE DONE"
   write_status
   write_summary
+  mark t
   sleep "$SLEEP_SECS"
+  span sleep "$t" ok
 done
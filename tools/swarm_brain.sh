@@ -6,9 +6,14 @@ LOCK_FILE="$ROOT/.swarm_brain.lock"
 SEEN_FILE="$ROOT/.swarm_brain.seen"
 LOG_FILE="$ROOT/.swarm_brain.log"
 CLAIM_DIR="$ROOT/.swarm_brain_claims"
+SYNC_STATE="$SEEN_FILE.gitsync"
 MAX_BATCH="${MAX_BATCH:-3}"
 SLEEP_SECS="${SLEEP_SECS:-4}"
 
+# The loop runs in one Python process (swarm_daemon.py), not a process per step.
+# SWARM_PY=0 bash tools/swarm_brain.sh runs the shell loop below instead
+[ "${SWARM_PY:-1}" = 1 ] && exec python3 "$ROOT/tools/swarm_daemon.py" brain
+
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
 
@@ -19,146 +24,95 @@ log() {
   printf '[%s] %s\n' "$(date '+%H:%M:%S')" "$*" | tee -a "$LOG_FILE"
 }
 
+# ---------- TRACE ----------
+# One JSON line per phase for tools/swarm_trace.py, written with builtins only
+TRACE_FILE="${LOG_FILE%.log}.trace.jsonl"
+CYCLE=0
+mark() {
+  # mark VAR: the /proc/uptime clock (what swarm_trace.py calls start) and the wall clock
+  local up _
+  { read -r up _ < /proc/uptime; } 2>/dev/null || up=0
+  printf -v "$1" '%s %s' "$up" "$EPOCHREALTIME"
+}
+span() {
+  # span NAME MARK OUTCOME [TASK]
+  local end _
+  { read -r end _ < /proc/uptime; } 2>/dev/null || end=0
+  printf '{"name":"%s","start":%s,"end":%s,"ts":%s,"loop":"brain","pid":%d,"tid":%d,"cycle":%d,"task":"%s","outcome":"%s"}\n' \
+    "$1" "${2% *}" "$end" "${2#* }" "$$" "$BASHPID" "$CYCLE" "${4:-}" "$3" >> "$TRACE_FILE"
+}
+
 DEFAULT_BRANCH="$(git remote show origin 2>/dev/null | sed -n '/HEAD branch/s/.*: //p')"
 [ -z "${DEFAULT_BRANCH:-}" ] && DEFAULT_BRANCH="$(git branch --show-current 2>/dev/null || echo master)"
 
 sync_down() {
-  git fetch origin "$DEFAULT_BRANCH" || true
-  git reset --hard "origin/$DEFAULT_BRANCH" || true
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --reset-to origin --message "brain: batch {time}")" || true
+  span sync_down "$t" "${out:-error}"
 }
 
 sync_up() {
-  git add . || true
-  git commit -m "brain: batch $(date +%H:%M:%S)" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  # Only the paths workers reported; commits coalesce over SYNC_WINDOW_SECS / SYNC_TASKS
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "brain: batch {time}")" || true
+  span sync_up "$t" "${out:-error}"
 }
 
 claim() {
-  local id="$1" f="$CLAIM_DIR/$1.claim"
-  ( set -o noclobber; echo "$$" > "$f" ) 2>/dev/null
+  # A lease, renewed by the loop's heartbeat below; stale claims are reclaimed
+  local t
+  mark t
+  if ! python3 "$ROOT/tools/claims.py" acquire "$CLAIM_DIR" "$1" --pid $$; then
+    span claim "$t" held "$1"
+    return 1
+  fi
+  span claim "$t" claimed "$1"
 }
 
 release() {
-  rm -f "$CLAIM_DIR/$1.claim" 2>/dev/null || true
+  python3 "$ROOT/tools/claims.py" release "$CLAIM_DIR" "$1" --pid $$ 2>/dev/null || true
 }
 
+# One heartbeat renews every claim this loop holds, until the loop exits.
+# Disowned, so `wait` and `wait -n` only ever see the workers
+python3 "$ROOT/tools/claims.py" heartbeat "$CLAIM_DIR" --all --pid $$ >/dev/null 2>&1 &
+disown
+
 pick_batch() {
 python3 - "$ROOT" "$SEEN_FILE" "$MAX_BATCH" << 'PY'
-import re, sys, pathlib, subprocess
+import sys, pathlib
 
 root = pathlib.Path(sys.argv[1])
 seen_path = pathlib.Path(sys.argv[2])
 max_batch = int(sys.argv[3])
 
-seen = set()
-if seen_path.exists():
-    seen = {x.strip() for x in seen_path.read_text(encoding="utf-8", errors="ignore").splitlines() if x.strip()}
-
-next_md = (root / "tasks" / "NEXT.md")
-lanes_md = (root / "tasks" / "SWARM-LANES.md")
-session_log = (root / "memory" / "SESSION-LOG.md")
-
-def read(p):
-    try:
-        return p.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return ""
-
-text_next = read(next_md)
-text_lanes = read(lanes_md)
-text_log = read(session_log)
-
-ids = {}
-def add_score(id_, score, reason):
-    if not re.fullmatch(r"L-\d+", id_):
-        return
-    entry = ids.setdefault(id_, {"score": 0, "reasons": []})
-    entry["score"] += score
-    entry["reasons"].append(reason)
-
-# NEXT.md gets strong priority
-for m in re.finditer(r"L-\d+", text_next):
-    add_score(m.group(0), 80, "NEXT")
-
-# SWARM-LANES.md priority logic
-for line in text_lanes.splitlines():
-    line_u = line.upper()
-    line_l = line.lower()
-    found = re.findall(r"L-\d+", line)
-    if not found:
-        continue
-    base = 0
-    if "ACTIVE" in line_u: base += 120
-    if "READY" in line_u: base += 100
-    if "BLOCKED" in line_u: base -= 90
-    if "ABANDONED" in line_u or "MERGED" in line_u: base -= 120
-    if "next_step=" in line_l: base += 10
-    if "focus=" in line_l: base += 8
-    if "available=" in line_l: base += 5
-    if "human_open_item=" in line_l: base -= 25
-    if "domain_sync=" in line_l: base += 4
-    if "memory_target=" in line_l: base += 4
-    for id_ in found:
-        add_score(id_, base, "LANE")
-
-# session log penalties/boosts
-for line in text_log.lower().splitlines()[-400:]:
-    ids_in_line = re.findall(r"l-\d+", line)
-    for id_ in ids_in_line:
-        id_ = id_.upper()
-        if "duplicate" in line or "near-duplicate" in line:
-            add_score(id_, -20, "dup")
-        if "stale" in line or "obsolete" in line:
-            add_score(id_, -15, "stale")
-        if "resolved" in line or "done" in line or "working" in line:
-            add_score(id_, 5, "good")
-
-# orient fallback
-try:
-    out = subprocess.check_output(
-        ["python3", str(root / "tools" / "orient.py")],
-        stderr=subprocess.DEVNULL,
-        text=True
-    )
-    for n, id_ in enumerate(re.findall(r"L-\d+", out)):
-        add_score(id_, max(30 - n, 1), "ORIENT")
-except Exception:
-    pass
+sys.path.insert(0, str(root / "tools"))
+from seen_store import SeenStore
+seen = SeenStore(str(seen_path))
+
+# NEXT.md, SWARM-LANES.md and the SESSION-LOG window, kept between runs:
+# only what was appended since the last pick is parsed
+from task_index import TaskIndex
+index = TaskIndex.load(str(seen_path) + ".taskindex", str(root))
+index.update()
+index.save(str(seen_path) + ".taskindex")
+
+# orient fallback (reused while HEAD and orient's inputs are unchanged)
+from orient_cache import orient
+out = orient(str(root))
 
 # filter seen / negative garbage
-items = []
-for id_, meta in ids.items():
-    if id_ in seen:
-        continue
-    if meta["score"] < 0:
-        continue
-    items.append((meta["score"], id_))
-
-items.sort(key=lambda x: (-x[0], x[1]))
-for score, id_ in items[:max_batch]:
+for score, id_ in index.ranked(out, seen)[:max_batch]:
     print(id_)
 PY
 }
 
 decide_action() {
-python3 - "$ROOT" "$1" << 'PY'
-import re, sys, pathlib
-root = pathlib.Path(sys.argv[1])
-id_ = sys.argv[2]
-txt = ""
-for p in [root/"tasks"/"NEXT.md", root/"tasks"/"SWARM-LANES.md", root/"memory"/"SESSION-LOG.md"]:
-    try:
-        txt += "\n" + p.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        pass
-scope = "\n".join([line.lower() for line in txt.splitlines() if id_.lower() in line.lower()]) or txt.lower()
-if any(w in scope for w in ["blocked", "human_open_item", "unclear", "investigate", "question"]):
-    print("s")
-elif any(w in scope for w in ["duplicate", "near-duplicate", "stale", "obsolete", "abandoned"]):
-    print("d")
-else:
-    print("k")
-PY
+  # Lines naming the id, from a mention index kept next to the seen file
+  python3 "$ROOT/tools/task_index.py" decide "$1" --state "$SEEN_FILE.mentions"
 }
 
 process_one() {
@@ -167,25 +121,43 @@ process_one() {
   action="$(decide_action "$id")"
   log "WORK $id action=$action"
 
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  local t rc=0 outcome=ok
+  mark t
+  local touched="$SYNC_STATE.touched/$id"
+  mkdir -p "${touched%/*}"
+  rm -f "$touched"
   if [ -x "$ROOT/tools/resolve_one.sh" ]; then
-    AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$id" || true
+    SWARM_TOUCHED="$touched" AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$id" || rc=$?
   else
     git commit --allow-empty -m "acknowledge $id" || true
+    : > "$touched"
   fi
 
   echo "$id" >> "$SEEN_FILE"
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$id" || true
+  [ "$rc" -eq 0 ] || outcome="exit $rc"
+  span work "$t" "$outcome" "$id"
 }
 
 log "START branch=$DEFAULT_BRANCH batch=$MAX_BATCH"
 
 while true; do
+  CYCLE=$((CYCLE + 1))
+  if [ $((CYCLE % 100)) -eq 0 ]; then
+    python3 "$ROOT/tools/swarm_trace.py" rotate "$TRACE_FILE" >/dev/null || true
+  fi
   sync_down
 
+  mark t
   mapfile -t BATCH < <(pick_batch)
+  span pick "$t" ok
 
   if [ "${#BATCH[@]}" -eq 0 ]; then
     log "NO REAL TASKS -> waiting"
+    mark t
     sleep "$SLEEP_SECS"
+    span sleep "$t" ok
     continue
   fi
 
@@ -202,5 +174,7 @@ while true; do
 
   sync_up
   log "CYCLE DONE"
+  mark t
   sleep "$SLEEP_SECS"
+  span sleep "$t" ok
 done
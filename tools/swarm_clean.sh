@@ -5,6 +5,7 @@ ROOT="$(pwd)"
 LOCK_FILE="$ROOT/.swarm_clean.lock"
 SEEN_FILE="$ROOT/.swarm_seen"
 LOG_FILE="$ROOT/.swarm_clean.log"
+SYNC_STATE="$SEEN_FILE.gitsync"
 
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
@@ -19,9 +20,9 @@ DEFAULT_BRANCH="$(git remote show origin 2>/dev/null | sed -n '/HEAD branch/s/.*
 [ -z "${DEFAULT_BRANCH:-}" ] && DEFAULT_BRANCH="$(git branch --show-current 2>/dev/null || echo master)"
 
 pick_next() {
-  python3 "$ROOT/tools/orient.py" 2>/dev/null \
+  python3 "$ROOT/tools/orient_cache.py" 2>/dev/null \
     | grep -o 'L-[0-9]\+' \
-    | grep -vxFf "$SEEN_FILE" \
+    | python3 "$ROOT/tools/seen_store.py" filter "$SEEN_FILE" \
     | head -n 1 || true
 }
 
@@ -41,8 +42,8 @@ log "branch=$DEFAULT_BRANCH"
 
 while true; do
   log "sync down"
-  git fetch origin "$DEFAULT_BRANCH" || true
-  git reset --hard "origin/$DEFAULT_BRANCH" || true
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "auto: processed {tasks}" >/dev/null || true
 
   reset_seen_if_exhausted
   ID="$(pick_next)"
@@ -56,15 +57,20 @@ while true; do
   echo "$ID" >> "$SEEN_FILE"
   log "selected $ID"
 
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  TOUCHED="$SYNC_STATE.touched/$ID"
+  mkdir -p "${TOUCHED%/*}"
+  rm -f "$TOUCHED"
   if [ -x "$ROOT/tools/resolve_one.sh" ]; then
-    bash "$ROOT/tools/resolve_one.sh" "$ID" || true
+    SWARM_TOUCHED="$TOUCHED" bash "$ROOT/tools/resolve_one.sh" "$ID" || true
   else
     log "missing tools/resolve_one.sh"
+    : > "$TOUCHED"
   fi
 
-  git add . || true
-  git commit -m "auto: processed $ID" || git commit --allow-empty -m "auto: checkpoint $ID" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  # One commit per SYNC_TASKS tasks or SYNC_WINDOW_SECS, not one per task
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$ID" || true
+  python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "auto: processed {tasks}" >/dev/null || true
 
   log "done $ID"
   sleep 2
@@ -5,6 +5,7 @@ ROOT="$(pwd)"
 SEEN_FILE="$ROOT/.loop_seen"
 LOG_FILE="$ROOT/.swarm.log"
 LOCK_FILE="$ROOT/.swarm.lock"
+SYNC_STATE="$SEEN_FILE.gitsync"
 
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
@@ -19,21 +20,23 @@ DEFAULT_BRANCH="$(git remote show origin | sed -n '/HEAD branch/s/.*: //p')"
 [ -z "$DEFAULT_BRANCH" ] && DEFAULT_BRANCH=master
 
 pick_next() {
-  python3 "$ROOT/tools/orient.py" 2>/dev/null \
+  python3 "$ROOT/tools/orient_cache.py" 2>/dev/null \
     | grep -o 'L-[0-9]\+' \
-    | grep -vxFf "$SEEN_FILE" \
+    | python3 "$ROOT/tools/seen_store.py" filter "$SEEN_FILE" \
     | head -n 1 || true
 }
 
 while true; do
   log "SYNC"
-  git fetch origin "$DEFAULT_BRANCH"
-  git reset --hard FETCH_HEAD
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --reset-to fetch_head --message "auto:{tasks}" >/dev/null
 
   log "STATE"
   python3 "$ROOT/tools/sync_state.py" || true
   python3 "$ROOT/tools/validate_beliefs.py" || true
   bash "$ROOT/tools/check.sh" --quick || true
+  # These report no paths: the next commit stages everything
+  python3 "$ROOT/tools/git_sync.py" touch "$SYNC_STATE" || true
 
   ID="$(pick_next)"
 
@@ -46,12 +49,15 @@ while true; do
   echo "$ID" >> "$SEEN_FILE"
   log "WORK $ID"
 
-  bash "$ROOT/tools/resolve_one.sh" "$ID" || true
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  TOUCHED="$SYNC_STATE.touched/$ID"
+  mkdir -p "${TOUCHED%/*}"
+  rm -f "$TOUCHED"
+  SWARM_TOUCHED="$TOUCHED" bash "$ROOT/tools/resolve_one.sh" "$ID" || true
 
   log "COMMIT"
-  git add .
-  git commit -m "auto:$ID" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$ID" || true
+  python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "auto:{tasks}" >/dev/null || true
 
   sleep 2
 done
@@ -8,11 +8,16 @@ LOG_FILE="$RUNTIME/swarm_complete.log"
 STATUS_FILE="$RUNTIME/swarm_complete.status"
 SEEN_FILE="$RUNTIME/swarm_complete.seen"
 CLAIM_DIR="$RUNTIME/claims"
+SYNC_STATE="$SEEN_FILE.gitsync"
 SLEEP_SECS="${SLEEP_SECS:-4}"
 
 mkdir -p "$RUNTIME" "$CLAIM_DIR"
 touch "$LOG_FILE" "$STATUS_FILE" "$SEEN_FILE"
 
+# The loop runs in one Python process (swarm_daemon.py), not a process per step.
+# SWARM_PY=0 bash tools/swarm_complete.sh runs the shell loop below instead
+[ "${SWARM_PY:-1}" = 1 ] && exec python3 "$ROOT/tools/swarm_daemon.py" complete
+
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
 
@@ -20,6 +25,24 @@ log() {
   printf '[%s] %s\n' "$(date '+%F %T')" "$*" | tee -a "$LOG_FILE"
 }
 
+# ---------- TRACE ----------
+# One JSON line per phase for tools/swarm_trace.py, written with builtins only
+TRACE_FILE="${LOG_FILE%.log}.trace.jsonl"
+CYCLE=0
+mark() {
+  # mark VAR: the /proc/uptime clock (what swarm_trace.py calls start) and the wall clock
+  local up _
+  { read -r up _ < /proc/uptime; } 2>/dev/null || up=0
+  printf -v "$1" '%s %s' "$up" "$EPOCHREALTIME"
+}
+span() {
+  # span NAME MARK OUTCOME [TASK]
+  local end _
+  { read -r end _ < /proc/uptime; } 2>/dev/null || end=0
+  printf '{"name":"%s","start":%s,"end":%s,"ts":%s,"loop":"complete","pid":%d,"tid":%d,"cycle":%d,"task":"%s","outcome":"%s"}\n' \
+    "$1" "${2% *}" "$end" "${2#* }" "$$" "$BASHPID" "$CYCLE" "${4:-}" "$3" >> "$TRACE_FILE"
+}
+
 DEFAULT_BRANCH="$(git remote show origin 2>/dev/null | sed -n '/HEAD branch/s/.*: //p')"
 [ -z "${DEFAULT_BRANCH:-}" ] && DEFAULT_BRANCH="$(git branch --show-current 2>/dev/null || echo master)"
 
@@ -27,23 +50,32 @@ LAST_PICK="none"
 LAST_ACTION="none"
 LAST_RESULT="idle"
 
+# Counted once here; the loop adds what it appends, so a status write never rescans the file
+SEEN_COUNT="$(wc -l < "$SEEN_FILE" 2>/dev/null || echo 0)"
+
 write_status() {
-  cat > "$STATUS_FILE" <<STATUS
+  # Written aside and renamed in: readers never see a half-written file
+  local tmp="$STATUS_FILE.$BASHPID.tmp"
+  cat > "$tmp" <<STATUS
 time: $(date '+%F %T')
 root: $ROOT
 branch: $DEFAULT_BRANCH
 last_pick: $LAST_PICK
 last_action: $LAST_ACTION
 last_result: $LAST_RESULT
-seen_count: $(wc -l < "$SEEN_FILE" 2>/dev/null || echo 0)
+seen_count: $SEEN_COUNT
 log_file: $LOG_FILE
 STATUS
+  mv -f "$tmp" "$STATUS_FILE"
 }
 
 sync_down() {
   log "SYNC DOWN"
-  git fetch origin "$DEFAULT_BRANCH" || true
-  git reset --hard "origin/$DEFAULT_BRANCH" || true
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "swarm: {time}")" || true
+  span sync_down "$t" "${out:-error}"
 }
 
 sync_state() {
@@ -51,28 +83,33 @@ sync_state() {
   [ -f "$ROOT/tools/sync_state.py" ] && python3 "$ROOT/tools/sync_state.py" || true
   [ -f "$ROOT/tools/validate_beliefs.py" ] && python3 "$ROOT/tools/validate_beliefs.py" || true
   [ -f "$ROOT/tools/check.sh" ] && bash "$ROOT/tools/check.sh" --quick || true
-}
-
-claim_key() {
-  python3 - "$1" <<'PY'
-import hashlib, sys
-print(hashlib.md5(sys.argv[1].encode("utf-8")).hexdigest()[:12])
-PY
+  # These report no paths: the next commit stages everything
+  python3 "$ROOT/tools/git_sync.py" touch "$SYNC_STATE" || true
 }
 
 claim() {
-  local key="$1"
-  local file="$CLAIM_DIR/$key.claim"
-  ( set -o noclobber; echo "$$" > "$file" ) 2>/dev/null
+  # A lease, renewed by the loop's heartbeat below; stale claims are reclaimed
+  local t
+  mark t
+  if ! python3 "$ROOT/tools/claims.py" acquire "$CLAIM_DIR" "$1" --pid $$; then
+    span claim "$t" held "$1"
+    return 1
+  fi
+  span claim "$t" claimed "$1"
 }
 
 release() {
-  rm -f "$CLAIM_DIR/$1.claim" 2>/dev/null || true
+  python3 "$ROOT/tools/claims.py" release "$CLAIM_DIR" "$1" --pid $$ 2>/dev/null || true
 }
 
+# One heartbeat renews every claim this loop holds, until the loop exits.
+# Disowned, so `wait` and `wait -n` only ever see the workers
+python3 "$ROOT/tools/claims.py" heartbeat "$CLAIM_DIR" --all --pid $$ >/dev/null 2>&1 &
+disown
+
 pick_task() {
 python3 - "$ROOT" "$SEEN_FILE" <<'PY'
-import pathlib, re, subprocess, sys, hashlib
+import pathlib, re, sys, hashlib
 
 root = pathlib.Path(sys.argv[1])
 seen_file = pathlib.Path(sys.argv[2])
@@ -83,9 +120,9 @@ def read(path):
     except Exception:
         return ""
 
-seen = set()
-if seen_file.exists():
-    seen = {x.strip() for x in read(seen_file).splitlines() if x.strip()}
+sys.path.insert(0, str(root / "tools"))
+from seen_store import SeenStore
+seen = SeenStore(str(seen_file))
 
 next_text = read(root / "tasks" / "NEXT.md")
 lanes_text = read(root / "tasks" / "SWARM-LANES.md")
@@ -149,21 +186,14 @@ for line in lanes_text.splitlines():
         score -= 35
     add("LANE", score, s)
 
-# orient.py fallback: only use substantial lines
-try:
-    out = subprocess.check_output(
-        ["python3", str(root / "tools" / "orient.py")],
-        stderr=subprocess.DEVNULL,
-        text=True
-    )
-    for n, line in enumerate(out.splitlines()):
-        s = line.strip()
-        if len(s) < 12:
-            continue
-        score = max(30 - n, 5)
-        add("ORIENT", score, s)
-except Exception:
-    pass
+# orient.py fallback: only use substantial lines (cached while HEAD and its inputs hold)
+from orient_cache import orient
+for n, line in enumerate(orient(str(root)).splitlines()):
+    s = line.strip()
+    if len(s) < 12:
+        continue
+    score = max(30 - n, 5)
+    add("ORIENT", score, s)
 
 # session log hints: penalize stale/duplicate phrases if text overlaps
 penalties = []
@@ -190,31 +220,9 @@ if rescored:
     print(key)
     print(kind)
     print(text)
-PY
-}
-
-decide_action() {
-python3 - "$ROOT" "$1" <<'PY'
-import pathlib, sys
-root = pathlib.Path(sys.argv[1])
-task = sys.argv[2].lower()
-
-txt = ""
-for p in [root/"tasks"/"NEXT.md", root/"tasks"/"SWARM-LANES.md", root/"memory"/"SESSION-LOG.md"]:
-    try:
-        txt += "\n" + p.read_text(encoding="utf-8", errors="ignore").lower()
-    except Exception:
-        pass
-
-scope_lines = [line for line in txt.splitlines() if task[:60] in line]
-scope = "\n".join(scope_lines) if scope_lines else txt
-
-if any(w in scope for w in ["blocked", "human_open_item", "unclear", "investigate", "question"]):
-    print("s")
-elif any(w in scope for w in ["duplicate", "near-duplicate", "stale", "obsolete", "abandoned", "remove", "delete"]):
-    print("d")
-else:
-    print("k")
+    # Decide here too, instead of a second python3 per task
+    from task_index import MentionIndex
+    print(MentionIndex(str(root)).decide(text, 60))
 PY
 }
 
@@ -232,26 +240,39 @@ run_task() {
   log "WORK kind=$kind action=$action"
   log "TASK $task"
 
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  local t rc=0 outcome=ok
+  mark t
+  local touched="$SYNC_STATE.touched/$key"
+  mkdir -p "${touched%/*}"
+  rm -f "$touched"
   if [ -x "$ROOT/tools/resolve_one.sh" ]; then
-    AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$task" || true
+    SWARM_TOUCHED="$touched" AUTO_ACTION="$action" bash "$ROOT/tools/resolve_one.sh" "$task" || rc=$?
   else
     case "$action" in
       d) git commit --allow-empty -m "swarm: resolve $kind" >/dev/null 2>&1 || true ;;
       k) git commit --allow-empty -m "swarm: acknowledge $kind" >/dev/null 2>&1 || true ;;
       s) : ;;
     esac
+    : > "$touched"
   fi
 
   echo "$key" >> "$SEEN_FILE"
+  SEEN_COUNT=$((SEEN_COUNT + 1))
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$key" || true
+  [ "$rc" -eq 0 ] || outcome="exit $rc"
+  span work "$t" "$outcome" "$key"
   LAST_RESULT="done"
   write_status
 }
 
 sync_up() {
   log "SYNC UP"
-  git add . || true
-  git commit -m "swarm: $(date +%H:%M:%S)" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  # Only the paths workers reported; commits coalesce over SYNC_WINDOW_SECS / SYNC_TASKS
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "swarm: {time}")" || true
+  span sync_up "$t" "${out:-error}"
 }
 
 trap 'log "STOP"; write_status' EXIT INT TERM
@@ -260,10 +281,16 @@ log "START branch=$DEFAULT_BRANCH"
 write_status
 
 while true; do
+  CYCLE=$((CYCLE + 1))
+  if [ $((CYCLE % 100)) -eq 0 ]; then
+    python3 "$ROOT/tools/swarm_trace.py" rotate "$TRACE_FILE" >/dev/null || true
+  fi
   sync_down
   sync_state
 
+  mark t
   mapfile -t PICK < <(pick_task)
+  span pick "$t" ok
 
   if [ "${#PICK[@]}" -lt 3 ]; then
     LAST_PICK="none"
@@ -271,7 +298,9 @@ while true; do
     LAST_RESULT="waiting-no-task"
     write_status
     log "NO EXISTING TASK FOUND"
+    mark t
     sleep "$SLEEP_SECS"
+    span sleep "$t" ok
     continue
   fi
 
@@ -285,12 +314,14 @@ while true; do
     continue
   fi
 
-  ACTION="$(decide_action "$TASK")"
+  ACTION="${PICK[3]}"
   run_task "$KEY" "$KIND" "$TASK" "$ACTION"
   release "$KEY"
 
   sync_state
   sync_up
 
+  mark t
   sleep "$SLEEP_SECS"
+  span sleep "$t" ok
 done
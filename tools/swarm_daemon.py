@@ -0,0 +1,774 @@
+#!/usr/bin/env python3
+"""
+swarm_daemon.py — The swarm loop, in one long-running Python process.
+
+swarm_super.sh, swarm_brain.sh, swarm_complete.sh and swarm_all_in_one.sh
+all run the same cycle: sync down, pick, claim, work, release, sync up,
+sleep. Each cycle they start a fresh python3 for every pick, every
+decision and (swarm_complete.sh) every md5, plus grep, awk and orient.py.
+Most of a cycle is process startup.
+
+This runs the same cycle with one interpreter. The task files are read
+once and re-read only when they change on disk; lane scores come from a
+TaskIndex (task_index.py) that parses only what was appended, and
+decisions are lookups in its MentionIndex. Picking, claims (leases from
+claims.py, renewed while work runs), claim keys and action decisions are
+plain function calls. The only processes left are the ones that do real
+work: git, resolve_one.sh, and orient.py when HEAD or its inputs changed
+(orient_cache.py). git_sync.py commits only the paths tasks report, in
+batches, and fetches only when the remote moved.
+
+Without --once the cycle is pipelined (worker_pool.py): a slot picks up
+the next task as soon as it finishes one, sync_up runs on its own clock,
+and the reset to the remote waits for the slots to empty, at most every
+SYNC_DOWN_SECS (60). tasks/sec and slot utilization go to the log and
+status file.
+
+Counters, gauges and phase-latency histograms live in a Registry
+(swarm_metrics.py). They are written atomically to a snapshot beside the
+log (runtime/swarm.metrics.json, ...) with the status file, at most every
+SWARM_METRICS_SECS (5) and at start and stop, and served as Prometheus
+text on 127.0.0.1:$SWARM_METRICS_PORT/metrics when that is set.
+
+Each script is a profile. A profile keeps that script's lock, seen file,
+log file, claim directory, log format, scoring weights, batch size and
+commit messages, so the daemon and the script can be swapped freely and
+never run at the same time. The scripts exec the daemon unless SWARM_PY=0;
+their shell loops remain as a fallback that still starts a process per step.
+
+Run:
+  python3 tools/swarm_daemon.py brain                One loop, forever
+  python3 tools/swarm_daemon.py complete --once      One cycle, then exit
+  python3 tools/swarm_daemon.py super --dry-run      Show the next pick, touch nothing
+  bash tools/swarm_brain.sh                          The script hands over to the daemon
+  SWARM_PY=0 bash tools/swarm_brain.sh               The script runs its own shell loop
+  SWARM_METRICS_PORT=9464 python3 tools/swarm_daemon.py all_in_one
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import orient_cache
+from claims import ClaimStore
+from git_sync import GitSync
+from seen_store import SeenStore
+from swarm_metrics import Registry, serve, snapshot_path
+from swarm_trace import Tracer, trace_path
+from task_index import LANE_WEIGHTS, MentionIndex, TaskIndex
+from worker_pool import WorkerPool
+
+
+_ID = re.compile(r"L-\d+")
+SYNC_DOWN_SECS = 60.0      # run(): at most this long between resets to the remote
+METRICS_SECS = 5.0         # write_status(): at most this often to the status and snapshot files
+
+
+# === Profiles ===
+
+@dataclass
+class Profile:
+    """Everything that differs between the shell loops."""
+    name: str
+    lock: str
+    seen: str
+    log: str
+    claims: str
+    claim_suffix: str = ".claim"
+    picker: str = "ids"              # ids: scored L-ids; ordered: first-seen L-ids; lines: scored task lines
+    batch_env: str = "MAX_BATCH"
+    batch: int = 3
+    sleep: float = 4.0
+    parallel: bool = False
+    time_format: str = "%H:%M:%S"
+    reset_to: str = "origin"         # origin: origin/<branch>; fetch_head: FETCH_HEAD
+    commit: str = "swarm: batch {time}"
+    fallback: dict = field(default_factory=dict)   # Action -> empty commit message when resolve_one.sh is missing
+    lane_weights: dict = field(default_factory=dict)
+    log_window: int = 400            # SESSION-LOG lines read for hints
+    generate_when_empty: bool = False
+    state_sync: bool = False
+    status: str = ""
+    summary: str = ""
+
+
+PROFILES = {
+    "super": Profile(
+        name="super", lock=".swarm_super.lock", seen=".swarm_super.seen",
+        log=".swarm_super.log", claims=".swarm_claims", claim_suffix="",
+        picker="ordered", batch_env="MAX_PARALLEL", sleep=3.0, parallel=True,
+        reset_to="fetch_head", commit="auto swarm {time}", generate_when_empty=True,
+    ),
+    "brain": Profile(
+        name="brain", lock=".swarm_brain.lock", seen=".swarm_brain.seen",
+        log=".swarm_brain.log", claims=".swarm_brain_claims",
+        commit="brain: batch {time}", fallback={"s": "acknowledge {id}", "d": "acknowledge {id}",
+                                                "k": "acknowledge {id}"},
+        lane_weights=LANE_WEIGHTS,
+    ),
+    "all_in_one": Profile(
+        name="all_in_one", lock="runtime/swarm.lock", seen="runtime/swarm.seen",
+        log="runtime/swarm.log", claims="runtime/claims", parallel=True,
+        time_format="%Y-%m-%d %H:%M:%S", commit="swarm: batch {time}",
+        fallback={"d": "resolve {id}", "k": "acknowledge {id}"},
+        lane_weights=dict(LANE_WEIGHTS, BLOCKED=-80, **{"domain_sync=": 0, "memory_target=": 0}),
+        log_window=300, status="runtime/status.txt", summary="runtime/summary.txt",
+    ),
+    "complete": Profile(
+        name="complete", lock="runtime/swarm_complete.lock", seen="runtime/swarm_complete.seen",
+        log="runtime/swarm_complete.log", claims="runtime/claims", picker="lines", batch=1,
+        time_format="%Y-%m-%d %H:%M:%S", commit="swarm: {time}",
+        fallback={"d": "swarm: resolve {kind}", "k": "swarm: acknowledge {kind}"},
+        state_sync=True, status="runtime/swarm_complete.status",
+    ),
+}
+
+
+# === Task model ===
+
+@dataclass
+class Task:
+    key: str        # Seen/claim key: the L-id, or an md5 of the task line
+    kind: str       # NEXT, LANE, ORIENT, or ID
+    text: str
+
+
+def claim_key(text: str) -> str:
+    """Same key swarm_complete.sh computes with a python3 subprocess."""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+
+
+class TaskFiles:
+    """NEXT.md, SWARM-LANES.md and SESSION-LOG.md, re-read only when they change."""
+
+    NAMES = {
+        "next": "tasks/NEXT.md",
+        "lanes": "tasks/SWARM-LANES.md",
+        "log": "memory/SESSION-LOG.md",
+    }
+
+    def __init__(self, root: str):
+        self.root = root
+        self.text = {k: "" for k in self.NAMES}
+        self._stamp = {}
+        self.version = 0        # Bumped whenever any file changed
+
+    def refresh(self) -> bool:
+        changed = False
+        for key, rel in self.NAMES.items():
+            path = os.path.join(self.root, rel)
+            try:
+                st = os.stat(path)
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            if stamp == self._stamp.get(key, False):
+                continue
+            self._stamp[key] = stamp
+            try:
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    self.text[key] = f.read()
+            except OSError:
+                self.text[key] = ""
+            changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+
+def ordered_ids(files: TaskFiles, orient: str) -> list:
+    """swarm_super.sh: NEXT.md ids, then ACTIVE/READY lane ids, then orient.py, first seen wins."""
+    out = _ID.findall(files.text["next"])
+    for line in files.text["lanes"].splitlines():
+        if re.search("ACTIVE|READY", line) and not re.search("BLOCKED|ABANDONED|MERGED", line):
+            out.extend(_ID.findall(line))
+    out.extend(_ID.findall(orient))
+    return list(dict.fromkeys(out))
+
+
+def score_lines(files: TaskFiles, orient: str) -> list:
+    """swarm_complete.sh: [(score, kind, key, text)] over whole task lines, best first."""
+    items = []
+
+    def add(kind, score, text):
+        text = " ".join(text.split())
+        if text:
+            items.append((score, kind, claim_key(text), text))
+
+    for line in files.text["next"].splitlines():
+        s = line.strip()
+        if not s or s.startswith("#"):
+            continue
+        score = 90 if s.startswith(("- [ ]", "* ", "- ", "1.", "2.", "3.")) else 40
+        low = s.lower()
+        if "just happened" in low:
+            score -= 30
+        if "blocked" in low:
+            score -= 50
+        if "next" in low:
+            score += 10
+        add("NEXT", score, s)
+
+    for line in files.text["lanes"].splitlines():
+        s = line.strip()
+        u, l = s.upper(), s.lower()
+        if not s or "MERGED" in u or "ABANDONED" in u:
+            continue
+        if "ACTIVE" not in u and "READY" not in u:
+            continue
+        score = 0
+        score += 140 if "ACTIVE" in u else 0
+        score += 120 if "READY" in u else 0
+        score -= 100 if "BLOCKED" in u else 0
+        score += 25 if "next_step=" in l else 0
+        score += 15 if "focus=" in l else 0
+        score += 10 if "available=" in l else 0
+        score -= 35 if "human_open_item=" in l else 0
+        add("LANE", score, s)
+
+    for n, line in enumerate(orient.splitlines()):
+        s = line.strip()
+        if len(s) >= 12:
+            add("ORIENT", max(30 - n, 5), s)
+
+    penalties = []
+    for line in files.text["log"].lower().splitlines()[-400:]:
+        if "duplicate" in line or "near-duplicate" in line:
+            penalties.append(("duplicate", -20))
+        if "stale" in line or "obsolete" in line:
+            penalties.append(("stale", -15))
+        if "blocked" in line:
+            penalties.append(("blocked", -25))
+
+    rescored = []
+    for score, kind, key, text in items:
+        low = text.lower()
+        score += sum(pen for word, pen in penalties if word in low)
+        rescored.append((score, kind, key, text))
+    rescored.sort(key=lambda x: (-x[0], x[1], x[3]))
+    return rescored
+
+
+# === Daemon ===
+
+class SwarmDaemon:
+    def __init__(self, profile: Profile, root: str = None, sync: bool = True):
+        self.profile = profile
+        self.root = root or os.getcwd()
+        self.sync = sync
+        self.files = TaskFiles(self.root)
+        self.index = TaskIndex(self.root, profile.lane_weights, profile.log_window)
+        self.mentions = MentionIndex(self.root)
+        self.batch = int(os.environ.get(profile.batch_env, profile.batch))
+        self.sleep = float(os.environ.get("SLEEP_SECS", profile.sleep))
+        self.seen = set()              # A SeenStore once prepare() finds the seen file
+        self.branch = ""
+        self.last = {"batch": "none", "pick": "none", "id": "none", "action": "none", "result": "idle"}
+        self._recent = deque(maxlen=40)
+        self._scored = (None, None)    # (file/index versions + orient text, scores)
+        self.claims = None             # A ClaimStore once prepare() creates the claim directory
+        self.git_sync = None           # A GitSync once prepare() knows the branch
+        self.trace = None              # A Tracer (swarm_trace.py) once prepare() may write
+        self.metrics = Registry()
+        self.metrics_every = float(os.environ.get("SWARM_METRICS_SECS", METRICS_SECS))
+        self._written = 0.0            # monotonic time of the last status and snapshot write
+        self.sync_every = float(os.environ.get("SYNC_DOWN_SECS", SYNC_DOWN_SECS))
+        self.pool = None               # The WorkerPool while run() is going
+        self._active = set()           # Keys claimed and not yet released
+        self._git_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self._lock_fd = None
+
+    def path(self, rel: str) -> str:
+        return os.path.join(self.root, rel)
+
+    # --- setup ---
+
+    def acquire(self) -> bool:
+        """Take the same flock the shell script takes."""
+        os.makedirs(os.path.dirname(self.path(self.profile.lock)), exist_ok=True)
+        self._lock_fd = open(self.path(self.profile.lock), "w")
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def prepare(self, create: bool = True):
+        """Load the seen set and recent log. create=False reads without touching anything."""
+        if create:
+            self.claims = ClaimStore(self.path(self.profile.claims), self.profile.claim_suffix)
+            os.makedirs(self.path("tasks"), exist_ok=True)
+            for rel in (self.profile.seen, self.profile.log):
+                os.makedirs(os.path.dirname(self.path(rel)), exist_ok=True)
+                open(self.path(rel), "a").close()
+        if os.path.exists(self.path(self.profile.seen)):
+            self.seen = SeenStore(self.path(self.profile.seen))
+        try:
+            with open(self.path(self.profile.log), encoding="utf-8", errors="ignore") as f:
+                self._recent.extend(line.rstrip("\n") for line in f)
+        except OSError:
+            pass
+        self.branch = self.default_branch()
+        if create:
+            p = self.profile
+            self.trace = Tracer(trace_path(self.path(p.log)), p.name)
+            self.git_sync = GitSync(self.root, self.path(p.seen) + ".gitsync", self.branch,
+                                    reset_to=p.reset_to, message=p.commit, log=self.log)
+
+    def default_branch(self) -> str:
+        out = self.git("remote", "show", "origin", capture=True)
+        m = re.search(r"HEAD branch: (\S+)", out)
+        if m and m.group(1) != "(unknown)":
+            return m.group(1)
+        return self.git("branch", "--show-current", capture=True).strip() or "master"
+
+    # --- plumbing ---
+
+    def log(self, msg: str):
+        line = f"[{datetime.now().strftime(self.profile.time_format)}] {msg}"
+        sys.stdout.write(line + "\n")     # One write: slots log from their own threads
+        sys.stdout.flush()
+        with open(self.path(self.profile.log), "a") as f:
+            f.write(line + "\n")
+        self._recent.append(line)
+
+    def git(self, *args, capture: bool = False) -> str:
+        if capture:
+            r = subprocess.run(["git", *args], cwd=self.root, capture_output=True, text=True)
+            return r.stdout
+        subprocess.run(["git", *args], cwd=self.root)
+        return ""
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """A traced phase, timed into the metrics; without a tracer (dry run) just the fields dict."""
+        start = time.perf_counter()
+        with (self.trace.span(name, **fields) if self.trace else nullcontext(fields)) as sp:
+            try:
+                yield sp
+            finally:
+                self.metrics.histogram("swarm_phase_seconds", "Time spent per cycle phase").observe(
+                    time.perf_counter() - start, phase=name)
+                self.metrics.counter("swarm_phase_total", "Phases run, by outcome").inc(
+                    phase=name, outcome=sp.get("outcome", "ok"))
+
+    def next_cycle(self):
+        if self.trace:
+            self.trace.cycle += 1
+        self.metrics.counter("swarm_cycles_total", "Scheduler passes").inc()
+
+    def orient(self) -> str:
+        return orient_cache.orient(self.root)
+
+    def mark_seen(self, key: str):
+        self.seen.add(key)
+
+    def write_status(self, force: bool = False):
+        """
+        Update the gauges, and every metrics_every seconds (or force) write
+        the snapshot and status file. Scrapes of the endpoint see every update.
+        """
+        g = self.metrics.gauge
+        g("swarm_seen_tasks", "Keys in the seen file").set(len(self.seen))
+        g("swarm_active_tasks", "Tasks claimed and not yet released").set(len(self._active))
+        if self.pool:
+            st = self.pool.stats()
+            g("swarm_slots_busy", "Worker slots running a task").set(st.busy)
+            g("swarm_tasks_per_second", "Tasks finished per second since start").set(round(st.rate, 4))
+            g("swarm_slot_utilization", "Share of slot time spent working").set(round(st.utilization, 4))
+        now = time.monotonic()
+        if not force and now - self._written < self.metrics_every:
+            return
+        with self._status_lock:     # Slots finish work from their own threads
+            self._written = now
+            if self.trace:          # Only once prepare() may write
+                self.metrics.write_snapshot(snapshot_path(self.path(self.profile.log)))
+            if self.profile.status:
+                self._write_status()
+
+    def _write_status(self):
+        p = self.profile
+        lines = [
+            f"time: {datetime.now():%Y-%m-%d %H:%M:%S}",
+            f"root: {self.root}",
+            f"branch: {self.branch}",
+        ]
+        if p.summary:
+            lines += [f"max_batch: {self.batch}", f"last_batch: {self.last['batch']}",
+                      f"last_id: {self.last['id']}"]
+        else:
+            lines.append(f"last_pick: {self.last['pick']}")
+        lines += [
+            f"last_action: {self.last['action']}",
+            f"last_result: {self.last['result']}",
+            f"seen_count: {len(self.seen)}",
+            f"log_file: {self.path(p.log)}",
+        ]
+        if self.pool:
+            st = self.pool.stats()
+            lines += [f"tasks_per_sec: {st.rate:.3f}", f"slot_utilization: {st.utilization:.2f}"]
+        lines.append(f"metrics_file: {snapshot_path(self.path(p.log))}")
+        if p.summary:
+            lines.append(f"summary_file: {self.path(p.summary)}")
+        _write(self.path(p.status), "\n".join(lines) + "\n")
+        if p.summary:
+            body = [
+                "=== SWARM SUMMARY ===",
+                f"time: {datetime.now():%Y-%m-%d %H:%M:%S}",
+                f"branch: {self.branch}",
+                f"last_batch: {self.last['batch']}",
+                f"last_id: {self.last['id']}",
+                f"last_action: {self.last['action']}",
+                f"last_result: {self.last['result']}",
+                "",
+                "=== RECENT LOG ===",
+                *self._recent,
+            ]
+            _write(self.path(p.summary), "\n".join(body) + "\n")
+
+    # --- lifecycle ---
+
+    def sync_down(self):
+        if not self.sync:
+            return
+        if self.profile.state_sync:
+            self.log("SYNC DOWN")
+        with self._git_lock, self.span("sync_down") as sp:
+            sp["outcome"] = self.git_sync.down()
+
+    def sync_state(self):
+        if not (self.sync and self.profile.state_sync):
+            return
+        self.log("STATE SYNC")
+        with self.span("sync_state"):
+            for script in ("tools/sync_state.py", "tools/validate_beliefs.py"):
+                if os.path.exists(self.path(script)):
+                    subprocess.run([sys.executable, self.path(script)], cwd=self.root)
+            if os.path.exists(self.path("tools/check.sh")):
+                subprocess.run(["bash", self.path("tools/check.sh"), "--quick"], cwd=self.root)
+        with self._git_lock:
+            self.git_sync.touch()      # They report no paths: the next commit stages everything
+
+    def sync_up(self, force: bool = False):
+        """Commit the paths finished tasks reported, once enough have gathered (or force), and push."""
+        if not self.sync:
+            return
+        if self.profile.state_sync:
+            self.log("SYNC UP")
+        with self._git_lock, self.span("sync_up") as sp:
+            sp["outcome"] = self.git_sync.up(force)
+
+    def pick(self, skip=()) -> list:
+        """Next batch of unseen tasks not in skip. Scores are reused until a task file changes."""
+        with self.span("pick") as sp:
+            batch = self._pick(skip)
+            sp["tasks"] = len(batch)
+        return batch
+
+    def _pick(self, skip) -> list:
+        p = self.profile
+        if p.picker == "ids":
+            self.index.update()
+        else:
+            self.files.refresh()
+        if isinstance(self.seen, SeenStore):
+            self.seen.refresh()
+        orient = self.orient()
+        stamp = (self.files.version, self.index.version, orient)
+        if self._scored[0] != stamp:
+            if p.picker == "ordered":
+                scored = ordered_ids(self.files, orient)
+            elif p.picker == "lines":
+                scored = score_lines(self.files, orient)
+            else:
+                scored = self.index.ranked(orient)
+            self._scored = (stamp, scored)
+        scored = self._scored[1]
+
+        if p.picker == "ordered":
+            ids = [i for i in scored if i not in self.seen and i not in skip]
+            return [Task(i, "ID", i) for i in ids[:self.batch]]
+        if p.picker == "lines":
+            return [Task(key, kind, text) for _, kind, key, text in scored
+                    if key not in self.seen and key not in skip][:self.batch]
+        return [Task(i, "ID", i) for _, i in scored
+                if i not in self.seen and i not in skip][:self.batch]
+
+    def claim(self, key: str) -> bool:
+        with self.span("claim", task=key) as sp:
+            if not self.claims.acquire(key):
+                sp["outcome"] = "held"
+                return False
+            sp["outcome"] = "claimed"
+        self._active.add(key)
+        return True
+
+    def release(self, key: str):
+        self._active.discard(key)
+        self.claims.release(key)
+
+    def decide(self, task: Task) -> str:
+        if self.profile.picker == "ordered":
+            # swarm_super.sh: any tasks/ line naming the id
+            lines = []
+            names = os.listdir(self.path("tasks")) if os.path.isdir(self.path("tasks")) else []
+            for name in sorted(names):
+                try:
+                    with open(self.path(os.path.join("tasks", name)), errors="ignore") as f:
+                        lines += [ln.lower() for ln in f if task.key.lower() in ln.lower()]
+                except OSError:
+                    continue
+            txt = "".join(lines)
+            if "blocked" in txt:
+                return "s"
+            if "duplicate" in txt or "stale" in txt:
+                return "d"
+            return "k"
+        self.mentions.update()
+        return self.mentions.decide(task.text, 60 if self.profile.picker == "lines" else 0)
+
+    def work(self, task: Task, action: str):
+        with self.span("work", task=task.key, action=action) as sp:
+            sp["outcome"] = self._work(task, action)
+
+    def _work(self, task: Task, action: str) -> str:
+        p = self.profile
+        if p.picker == "lines":
+            self.last.update(pick=f"{task.kind} | {task.text}", action=action, result="started")
+            self.write_status()
+            self.log(f"WORK kind={task.kind} action={action}")
+            self.log(f"TASK {task.text}")
+        else:
+            self.last.update(id=task.key, action=action, result="started")
+            self.write_status()
+            self.log(f"WORK {task.key} ({action})" if p.picker == "ordered"
+                     else f"WORK {task.key} action={action}")
+
+        resolver = self.path("tools/resolve_one.sh")
+        touched = None                 # Unknown unless the resolver reports (or nothing ran)
+        outcome = "ok"
+        if os.access(resolver, os.X_OK):
+            r = subprocess.run(["bash", resolver, task.text], cwd=self.root,
+                               env=dict(os.environ, AUTO_ACTION=action,
+                                        SWARM_TOUCHED=self.git_sync.touched_file(task.key)))
+            if r.returncode:
+                outcome = f"exit {r.returncode}"
+        else:
+            touched = []
+            outcome = "fallback" if action in p.fallback else "skipped"
+            if action in p.fallback:
+                with self._git_lock:
+                    self.git("commit", "--allow-empty", "-m",
+                             p.fallback[action].format(id=task.key, kind=task.kind), capture=True)
+
+        self.mark_seen(task.key)
+        with self._git_lock:
+            self.git_sync.done(task.key, touched)
+        self.last["result"] = "done"
+        self.write_status()
+        return outcome
+
+    def nothing_to_do(self):
+        p = self.profile
+        if p.generate_when_empty:
+            new = f"L-{int(time.time())}"
+            with open(self.path("tasks/NEXT.md"), "a") as f:
+                f.write(new + "\n")
+            if self.git_sync:
+                with self._git_lock:
+                    self.git_sync.touch(["tasks/NEXT.md"])
+            self.log(f"GENERATED {new}")
+        elif p.picker == "lines":
+            self.last.update(pick="none", action="none", result="waiting-no-task")
+            self.write_status()
+            self.log("NO EXISTING TASK FOUND")
+        else:
+            self.last.update(batch="none", id="none", action="none", result="waiting")
+            self.write_status()
+            self.log("NO REAL TASKS -> waiting")
+
+    def claim_batch(self, batch: list) -> list:
+        """Log the batch and claim what nobody else holds."""
+        p = self.profile
+        if p.picker != "lines":
+            self.last["batch"] = " ".join(t.key for t in batch)
+            self.write_status()
+            self.log(f"BATCH {self.last['batch']}")
+        claimed = []
+        for task in batch:
+            if self.claim(task.key):
+                claimed.append(task)
+            elif p.picker == "lines":
+                self.log(f"CLAIMED ELSEWHERE {task.key}")
+            else:
+                self.log(f"SKIP CLAIMED {task.key}")
+        return claimed
+
+    def cycle(self) -> int:
+        """One pick-claim-work-sync pass. Returns the number of tasks worked."""
+        p = self.profile
+        self.next_cycle()
+        self.sync_down()
+        self.sync_state()
+
+        t0 = time.perf_counter()
+        batch = self.pick()
+        pick_ms = (time.perf_counter() - t0) * 1000
+
+        if not batch:
+            self.nothing_to_do()
+            return 0
+
+        claimed = self.claim_batch(batch)
+        jobs = [(t, self.decide(t)) for t in claimed]
+        with self.claims.keep_alive():
+            if p.parallel and len(jobs) > 1:
+                with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+                    list(pool.map(lambda job: self.work(*job), jobs))
+            else:
+                for job in jobs:
+                    self.work(*job)
+        for task in claimed:
+            self.release(task.key)
+
+        self.sync_state()
+        self.sync_up(force=True)
+        if p.picker != "lines":
+            self.log(f"CYCLE DONE (pick {pick_ms:.1f} ms)")
+            self.write_status()
+        return len(claimed)
+
+    def _job(self, job: tuple):
+        task, action = job
+        try:
+            self.work(task, action)
+        finally:
+            self.release(task.key)
+
+    def feed(self) -> int:
+        """Claim unseen tasks into the pool's free room. Returns how many went in."""
+        room = self.pool.room()
+        if not room:
+            return 0
+        batch = self.pick(skip=self._active)[:room]
+        if not batch:
+            return 0
+        claimed = self.claim_batch(batch)
+        for task in claimed:
+            self.pool.submit((task, self.decide(task)))
+        return len(claimed)
+
+    def pipeline(self):
+        """
+        Work continuously: a slot takes the next task as soon as it frees
+        up, instead of every slot waiting for the slowest one in a batch.
+
+        Syncing is off the task path. Finished work is committed and
+        pushed in batches when git_sync says one is due. The reset to the
+        remote would wipe work in progress, so it waits until the slots
+        are empty, at most every sync_every seconds (and is skipped when
+        the remote has not moved).
+        """
+        p = self.profile
+        slots = self.batch if p.parallel else 1
+        self.pool = WorkerPool(slots, self._job,
+                               on_error=lambda job, e: self.log(f"ERROR {job[0].key}: {e}"))
+        last_down = time.monotonic()
+        self.sync_down()
+        self.sync_state()
+        with self.claims.keep_alive():
+            while True:
+                self.next_cycle()
+                fed = self.feed()
+                if not fed and self.pool.idle():
+                    self.nothing_to_do()
+                if not (fed and self.pool.room()):
+                    with self.span("sleep", busy=self.pool.stats().busy):
+                        self.pool.wait(self.sleep)
+
+                if self.git_sync.due():
+                    self.sync_state()
+                    self.sync_up()
+                    self.log(f"POOL {self.pool.stats().line()}")
+                    self.write_status()
+                if time.monotonic() - last_down >= self.sync_every:
+                    self.pool.drain()
+                    self.sync_down()       # Commits pending work first if the remote moved
+                    self.sync_state()
+                    last_down = time.monotonic()
+
+    def run(self, once: bool = False):
+        self.prepare()
+        p = self.profile
+        if p.picker == "lines":
+            self.log(f"START branch={self.branch}")
+        else:
+            size = "parallel" if p.batch_env == "MAX_PARALLEL" else "batch"
+            self.log(f"START branch={self.branch} {size}={self.batch}")
+        port = int(os.environ.get("SWARM_METRICS_PORT") or 0)
+        server = None
+        if port:
+            try:
+                server = serve(self.metrics, port)
+                self.log(f"METRICS http://127.0.0.1:{port}/metrics")
+            except OSError as e:
+                self.log(f"METRICS OFF port {port}: {e.strerror}")
+        self.write_status(force=True)
+        try:
+            if once:
+                self.cycle()
+            else:
+                self.pipeline()
+        finally:
+            if self.pool:
+                self.log(f"POOL {self.pool.stats().line()}")
+            self.log("STOP")
+            self.write_status(force=True)
+            if server:
+                server.shutdown()
+
+
+def _write(path: str, text: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    once = "--once" in args
+    dry = "--dry-run" in args
+    args = [a for a in args if a not in ("--once", "--dry-run")]
+    if not args or args[0] not in PROFILES:
+        print(f"Usage: python3 tools/swarm_daemon.py <{'|'.join(PROFILES)}> [--once] [--dry-run]")
+        sys.exit(1)
+
+    daemon = SwarmDaemon(PROFILES[args[0]], sync=not dry)
+    if dry:
+        daemon.prepare(create=False)
+        t0 = time.perf_counter()
+        batch = daemon.pick()
+        print(f"{len(batch)} task(s) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        for t in batch:
+            print(f"  {t.key}  {t.kind}  {t.text[:80]}  -> {daemon.decide(t)}")
+        sys.exit(0)
+
+    if not daemon.acquire():
+        print("already running")
+        sys.exit(1)
+    try:
+        daemon.run(once=once)
+    except KeyboardInterrupt:
+        pass
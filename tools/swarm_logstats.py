@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+swarm_logstats.py — Throughput, cycle times and where the time went, from the swarm loop logs.
+
+The loops have logged every cycle for months in their free-text formats:
+
+  [09:12:03] BATCH L-12 L-7 L-3                       swarm_super.sh, swarm_brain.sh
+  [09:12:03] WORK L-12 (k)  /  WORK L-12 action=k
+  [2026-01-04 09:12:09] SYNC UP                       swarm_all_in_one.sh, swarm_complete.sh
+  [2026-01-04 09:12:09] CYCLE DONE
+  [2026-01-04 09:12:03] sync down / selected L-12     swarm_clean.sh
+  [09:12:03] SYNC / STATE / WORK L-12 / COMMIT        swarm_combo.sh
+  [09:12:09] POOL done=12 failed=0 busy=2/3 ...       swarm_daemon.py, swarm_super.sh (pipeline)
+
+This reads them, and the seen files, in one streaming pass each:
+
+  cycles      Percentiles of the time between cycle starts (SYNC DOWN
+              and friends), or between CYCLE DONE lines for loops that
+              do not log a start. A pipeline (a loop that logs POOL
+              lines) has no cycles: there it is the time between POOL
+              lines, one per commit of finished work.
+  pool        A pipeline's last POOL line: tasks done and failed, rate,
+              and how busy its slots were.
+  tasks       WORK lines per active hour, and the busiest hour.
+  time        Each gap between two lines is charged to the phase the
+              first line opened: sync (fetch/reset, add/commit/push),
+              state, claim (BATCH until WORK), work, sleep. Gaps over
+              MAX_GAP are a stopped loop and are not charged. In a
+              pipeline, BATCH until WORK is a task waiting for a slot,
+              and is charged to queue instead.
+              If the loop's trace (swarm_trace.py) is beside its log,
+              the shares come from the traced spans instead, measured
+              to the millisecond, with each phase's p50 and p95.
+  duplicates  WORK lines naming an id already worked, and claims lost
+              to another worker (SKIP CLAIMED, CLAIMED ELSEWHERE).
+
+Memory stays bounded whatever the log size: durations are counted per
+whole second (the logs' resolution), and ids are kept exactly up to
+EXACT_IDS, then counted with a HyperLogLog (about 1% error). Times
+without a date roll over to the next day when the clock jumps back.
+.gz logs are read as they are.
+
+Run:
+  python3 tools/swarm_logstats.py                     Every known log and seen file in this tree
+  python3 tools/swarm_logstats.py LOG... [--seen FILE...] [--json]
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from datetime import datetime
+
+import swarm_trace
+
+
+LOGS = [".swarm_super.log", ".swarm_brain.log", "runtime/swarm.log", "runtime/swarm_complete.log",
+        ".swarm_clean.log", ".swarm.log"]
+SEEN = [".swarm_super.seen", ".swarm_brain.seen", "runtime/swarm.seen", "runtime/swarm_complete.seen",
+        ".swarm_seen", ".loop_seen"]
+
+MAX_GAP = 900           # Seconds: a longer silence is a stopped loop, not a phase
+EXACT_IDS = 200_000     # Distinct ids kept exactly before switching to an estimate
+
+_LINE = re.compile(r"^\[(?:(\d{4})-(\d\d)-(\d\d) )?(\d\d):(\d\d):(\d\d)\] (.*)")
+_WORK = re.compile(r"^(?:WORK (?!kind=)(\S+)|selected (\S+)|TASK (.+))")
+
+# First match wins: (pattern, phase the line opens, cycle boundary: "start", "end" or None)
+_RULES = [
+    (re.compile(r"^(?:SYNC DOWN|sync down|SYNC)$"), "sync", "start"),
+    (re.compile(r"^(?:SYNC UP|COMMIT)$"), "sync", None),
+    (re.compile(r"^(?:STATE SYNC|STATE)$"), "state", None),
+    (re.compile(r"^BATCH "), "batch", None),     # claim, or queue in a pipeline: see _close_run()
+    (re.compile(r"^(?:WORK|TASK|selected) "), "work", None),
+    (re.compile(r"^(?:CYCLE DONE|done )"), "sleep", "end"),
+    (re.compile(r"^(?:NO REAL TASKS|NO EXISTING TASK|no work|no IDs|GENERATED|SKIP CLAIMED|CLAIMED ELSEWHERE)"),
+     "sleep", None),
+    (re.compile(r"^(?:START|STOP|starting|stopping)\b"), "stopped", None),
+]
+_POOL = re.compile(r"^POOL (.*)")
+_POOL_FIELD = re.compile(r"(\w+)=(\S+)")
+
+
+# === Bounded counting ===
+
+class Distinct:
+    """How many different keys were added: exact up to a limit, then a HyperLogLog."""
+
+    P = 14
+
+    def __init__(self, limit: int = EXACT_IDS):
+        self.limit = limit
+        self.exact = set()
+        self.registers = None
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8", "replace"), digest_size=8).digest(), "big")
+
+    def _register(self, h: int):
+        idx = h >> (64 - self.P)
+        rest = (h << self.P) & ((1 << 64) - 1)
+        rank = 64 - self.P + 1 if rest == 0 else (64 - rest.bit_length()) + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def add(self, key: str):
+        if self.registers is not None:
+            self._register(self._hash(key))
+            return
+        self.exact.add(key)
+        if len(self.exact) > self.limit:
+            self.registers = bytearray(1 << self.P)
+            for k in self.exact:
+                self._register(self._hash(k))
+            self.exact = None
+
+    def count(self) -> int:
+        if self.registers is None:
+            return len(self.exact)
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros:
+            small = m * math.log(m / zeros)
+            if small <= 2.5 * m:
+                return round(small)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        return round(alpha * m * m / sum(2.0 ** -r for r in self.registers))
+
+    @property
+    def estimated(self) -> bool:
+        return self.registers is not None
+
+
+def percentile(counts: dict, q: float):
+    """q-th percentile (0..1) of values given as {value: times seen}. None if empty."""
+    total = sum(counts.values())
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen > rank:
+            return value
+    return max(counts)
+
+
+# === Logs ===
+
+def _open(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+class LogStats:
+    """Everything measured from one log, built a line at a time."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lines = 0
+        self.events = 0
+        self.first = self.last = None
+        self.phases = {}            # phase -> seconds
+        self.cycles = {"start": {}, "end": {}, "pool": {}}     # boundary kind -> {seconds: count}
+        self.pool = None            # Fields of the last POOL line, once a pipeline logs one
+        self._pipeline = False      # This run (START to START) has logged a POOL line
+        self.hours = {}             # hour index -> WORK lines
+        self.work = 0
+        self.lost_claims = 0
+        self.ids = Distinct()
+        self._dated = False
+        self._phase = None
+        self._t = None
+        self._day = 0
+        self._clock = None          # Previous time of day, for dateless rollover
+        self._boundary = {"start": None, "end": None, "pool": None}
+
+    def _time(self, m) -> float:
+        h, mi, s = int(m[4]), int(m[5]), int(m[6])
+        if m[1]:
+            self._dated = True
+            return datetime(int(m[1]), int(m[2]), int(m[3]), h, mi, s).timestamp()
+        clock = h * 3600 + mi * 60 + s
+        if self._clock is not None and clock < self._clock - 3600:
+            self._day += 1      # Past midnight
+        self._clock = clock
+        return self._day * 86400.0 + clock
+
+    def feed(self, line: str):
+        self.lines += 1
+        m = _LINE.match(line)
+        if not m:
+            return
+        t = self._time(m)
+        text = m[7].rstrip("\n")
+        self.events += 1
+        if self.first is None:
+            self.first = t
+        self.last = t
+
+        gap = None if self._t is None else t - self._t
+        if gap is not None and 0 <= gap <= MAX_GAP and self._phase and self._phase != "stopped":
+            self.phases[self._phase] = self.phases.get(self._phase, 0) + gap
+
+        phase, boundary = None, None
+        for pattern, ph, bound in _RULES:
+            if pattern.match(text):
+                phase, boundary = ph, bound
+                break
+        pool = _POOL.match(text)
+        if pool:
+            self.pool = dict(_POOL_FIELD.findall(pool[1]))
+            self._pipeline = True
+            boundary = "pool"
+        if phase:
+            self._phase = phase
+        self._t = t
+
+        if boundary:
+            prev = self._boundary[boundary]
+            if prev is not None and 0 <= t - prev <= MAX_GAP:
+                counts = self.cycles[boundary]
+                counts[int(t - prev)] = counts.get(int(t - prev), 0) + 1
+            self._boundary[boundary] = t
+        elif phase == "stopped":
+            self._boundary = {"start": None, "end": None, "pool": None}
+            self._close_run()
+
+        w = _WORK.match(text)
+        if w:
+            self.work += 1
+            hour = int(t // 3600)
+            self.hours[hour] = self.hours.get(hour, 0) + 1
+            self.ids.add(w[1] or w[2] or w[3].strip())
+        elif text.startswith(("SKIP CLAIMED", "CLAIMED ELSEWHERE")):
+            self.lost_claims += 1
+
+    def _close_run(self):
+        """
+        Charge the run's BATCH-until-WORK time: claiming in a batch loop,
+        a task waiting for a free slot in a pipeline.
+        """
+        wait = self.phases.pop("batch", 0)
+        if wait:
+            phase = "queue" if self._pipeline else "claim"
+            self.phases[phase] = self.phases.get(phase, 0) + wait
+        self._pipeline = False
+
+    def report(self, spans=None) -> dict:
+        """spans: the loop's traced spans, if it has a trace; they replace the line-gap time shares."""
+        self._close_run()
+        kinds = {"start": "start to start", "end": "end to end", "pool": "POOL to POOL"}
+        boundary = max(kinds, key=lambda k: sum(self.cycles[k].values()))
+        cycles, kind = self.cycles[boundary], kinds[boundary]
+        phases = self.phases
+        active = sum(phases.values())
+        time_shares = {ph: round(sec / active, 3) for ph, sec in sorted(phases.items(), key=lambda kv: -kv[1])} \
+            if active else {}
+        traced = _span_times(spans) if spans is not None else None
+        peak = max(self.hours.items(), key=lambda kv: kv[1]) if self.hours else None
+        distinct = self.ids.count()
+        repeats = max(self.work - distinct, 0)
+        return {
+            "log": self.name, "lines": self.lines, "events": self.events,
+            "cycles": {"count": sum(cycles.values()), "measured": kind,
+                       **{f"p{int(q * 100)}": percentile(cycles, q) for q in (0.5, 0.9, 0.99)},
+                       "max": max(cycles) if cycles else None},
+            "tasks": {"count": self.work, "active_hours": round(active / 3600, 2),
+                      "per_hour": round(self.work / (active / 3600), 1) if active else None,
+                      "peak_hour": peak[1] if peak else 0,
+                      "peak_at": _hour_label(peak[0], self._dated) if peak else None},
+            "pool": self.pool,
+            "time": traced["share"] if traced else time_shares,
+            "time_from": "trace" if traced else "log",
+            "spans": traced["spans"] if traced else None,
+            "duplicates": {"repeated_work": repeats, "distinct_ids": distinct,
+                           "rate": round(repeats / self.work, 4) if self.work else 0.0,
+                           "estimated": self.ids.estimated, "lost_claims": self.lost_claims},
+        }
+
+
+def _span_times(spans) -> dict:
+    """{"share": {phase: share of traced seconds}, "spans": {phase: {count, p50, p95 in s}}}, or None if empty."""
+    durations = {}
+    for rec in spans:
+        durations.setdefault(rec["name"], []).append(max(rec["end"] - rec["start"], 0.0))
+    total = sum(sum(ds) for ds in durations.values())
+    if not total:
+        return None
+    out = {"share": {}, "spans": {}}
+    for name, ds in sorted(durations.items(), key=lambda kv: -sum(kv[1])):
+        ds.sort()
+        out["share"][name] = round(sum(ds) / total, 3)
+        out["spans"][name] = {"count": len(ds), "p50": round(ds[(len(ds) - 1) // 2], 3),
+                              "p95": round(ds[min(int(len(ds) * 0.95), len(ds) - 1)], 3)}
+    return out
+
+
+def _hour_label(hour: int, dated: bool) -> str:
+    if not dated:
+        return f"day {hour // 24 + 1} {hour % 24:02d}:00"
+    return datetime.fromtimestamp(hour * 3600).strftime("%Y-%m-%d %H:00")
+
+
+def analyze_log(path: str) -> dict:
+    stats = LogStats(path)
+    with _open(path) as f:
+        for line in f:
+            stats.feed(line)
+    trace = swarm_trace.trace_path(path)
+    spans = swarm_trace.read_spans(trace) if not path.endswith(".gz") and os.path.exists(trace) else None
+    return stats.report(spans)
+
+
+def analyze_seen(path: str) -> dict:
+    """Lines, distinct keys and the share of lines that repeat a key, for one seen file."""
+    lines = 0
+    ids = Distinct()
+    with _open(path) as f:
+        for line in f:
+            key = line.strip()
+            if key:
+                lines += 1
+                ids.add(key)
+    distinct = ids.count()
+    return {"seen": path, "lines": lines, "distinct": distinct,
+            "rate": round(1 - distinct / lines, 4) if lines else 0.0, "estimated": ids.estimated}
+
+
+def _s(v) -> str:
+    return "-" if v is None else f"{v}s"
+
+
+def print_report(logs: list, seen: list):
+    for r in logs:
+        c, t, d = r["cycles"], r["tasks"], r["duplicates"]
+        print(f"{r['log']}: {r['lines']:,} lines, {r['events']:,} events")
+        print(f"  cycles      {c['count']:,} ({c['measured']})  p50 {_s(c['p50'])}  p90 {_s(c['p90'])}  "
+              f"p99 {_s(c['p99'])}  max {_s(c['max'])}")
+        rate = "-" if t["per_hour"] is None else f"{t['per_hour']}/h"
+        peak = f", peak {t['peak_hour']} at {t['peak_at']}" if t["peak_at"] else ""
+        if r["pool"]:
+            pool = r["pool"]
+            print(f"  pool        done {pool.get('done', '-')}, failed {pool.get('failed', '-')}, "
+                  f"rate {pool.get('rate', '-')}, util {pool.get('util', '-')}")
+        print(f"  tasks       {t['count']:,} over {t['active_hours']} active h ({rate}{peak})")
+        print("  time        " + ("  ".join(f"{ph} {share:.0%}" for ph, share in r["time"].items()) or "-")
+              + ("  (trace)" if r["time_from"] == "trace" else ""))
+        if r["spans"]:
+            print("  spans       " + "  ".join(f"{ph} p50 {_s(v['p50'])} p95 {_s(v['p95'])}"
+                                            for ph, v in r["spans"].items()))
+        approx = "~" if d["estimated"] else ""
+        print(f"  duplicates  {d['repeated_work']:,} repeated WORK ({d['rate']:.1%}), "
+              f"{approx}{d['distinct_ids']:,} distinct ids, {d['lost_claims']:,} claims lost")
+    if seen:
+        print("seen files:")
+        for r in seen:
+            approx = "~" if r["estimated"] else ""
+            print(f"  {r['seen']:32s} {r['lines']:>10,} lines  {approx}{r['distinct']:>10,} distinct  "
+                  f"{r['rate']:.1%} repeated")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    args = [a for a in args if a != "--json"]
+    seen_paths = []
+    if "--seen" in args:
+        i = args.index("--seen")
+        seen_paths = args[i + 1:]
+        args = args[:i]
+    log_paths = args
+    if not log_paths and not seen_paths:
+        log_paths = [p for p in LOGS if os.path.exists(p)]
+        seen_paths = [p for p in SEEN if os.path.exists(p)]
+    if not log_paths and not seen_paths:
+        print("No swarm logs here. " + __doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+
+    logs = [analyze_log(p) for p in log_paths]
+    seen = [analyze_seen(p) for p in seen_paths]
+    if as_json:
+        json.dump({"logs": logs, "seen": seen}, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(logs, seen)
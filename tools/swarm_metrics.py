@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+swarm_metrics.py — Counters, gauges and latency histograms for the swarm loop, served live.
+
+Watching a loop meant reading its status file (runtime/status.txt,
+runtime/swarm_complete.status), which the scripts rewrote on every step
+and filled by counting the seen file with `wc -l`, a cost that grows with
+the history.
+
+A Registry keeps the numbers in the process instead. Updating one is a
+dict write under a lock, whatever the history. Reading them takes either
+route:
+
+  HTTP      serve() answers GET /metrics in the Prometheus text format
+            (and /metrics.json) from a thread, on 127.0.0.1 only
+  snapshot  write_snapshot() replaces a JSON file atomically (temp file +
+            rename), so a reader never sees half of one
+
+Metrics take labels as keyword arguments:
+
+  reg.counter("swarm_tasks_total", "Tasks worked").inc(outcome="ok")
+  reg.gauge("swarm_seen_tasks", "Keys in the seen file").set(1234)
+  reg.histogram("swarm_phase_seconds", "Phase duration").observe(0.42, phase="work")
+
+Run:
+  python3 tools/swarm_metrics.py show SNAPSHOT                 Prometheus text from a snapshot file
+  python3 tools/swarm_metrics.py serve SNAPSHOT [--port 9464]  Serve a snapshot another process writes
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PORT = 9464
+BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def snapshot_path(log_path: str) -> str:
+    """runtime/swarm.log -> runtime/swarm.metrics.json, beside the loop's trace."""
+    base = log_path[:-4] if log_path.endswith(".log") else log_path
+    return base + ".metrics.json"
+
+
+def _key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _labels(key, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _le(bound: str) -> str:
+    return f'le="{bound}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+# === Metrics ===
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self._lock = lock
+        self._values = {}           # Label key -> value
+
+    def samples(self) -> list:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Counter(Metric):
+    """Only goes up."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that is set, and may go either way."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_key(labels)] = value
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, plus their sum and count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, lock: threading.Lock, buckets=BUCKETS):
+        super().__init__(name, help, lock)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        k = _key(labels)
+        with self._lock:
+            h = self._values.get(k)
+            if h is None:
+                h = self._values[k] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    h["counts"][i] += 1
+                    break
+            h["sum"] += value
+            h["count"] += 1
+
+    def samples(self) -> list:
+        with self._lock:
+            out = []
+            for k, h in self._values.items():
+                cumulative, total = [], 0
+                for n in h["counts"]:
+                    total += n
+                    cumulative.append(total)
+                out.append({"labels": dict(k), "buckets": dict(zip(map(_number, self.buckets), cumulative)),
+                            "sum": h["sum"], "count": h["count"]})
+            return out
+
+
+# === Registry ===
+
+class Registry:
+    """Named metrics, created on first use. Safe to update from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, cls, name: str, help: str, **kw):
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, help, threading.Lock(), **kw)
+        if not isinstance(m, cls):
+            raise TypeError(f"{name} is a {m.kind}, not a {cls.kind}")
+        return m
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets=BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+        return render_snapshot(self.snapshot())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {"time": time.time(),
+                "metrics": {m.name: {"type": m.kind, "help": m.help, "samples": m.samples()} for m in metrics}}
+
+    def write_snapshot(self, path: str):
+        """Replace path with the current snapshot in one rename."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+def render_snapshot(snap: dict) -> str:
+    """Prometheus text for a snapshot() dict, as read back from its file."""
+    out = []
+    for name, m in snap.get("metrics", {}).items():
+        out += [f"# HELP {name} {m.get('help') or name}", f"# TYPE {name} {m['type']}"]
+        for s in m["samples"]:
+            k = _key(s["labels"])
+            if m["type"] == "histogram":
+                out += [f"{name}_bucket{_labels(k, _le(le))} {n}" for le, n in s["buckets"].items()]
+                out += [f"{name}_sum{_labels(k)} {_number(s['sum'])}", f"{name}_count{_labels(k)} {s['count']}"]
+            else:
+                out.append(f"{name}{_labels(k)} {_number(s['value'])}")
+    return "\n".join(out) + "\n"
+
+
+# === HTTP ===
+
+def serve(source, port: int = PORT, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Answer /metrics (Prometheus text) and /metrics.json from a daemon
+    thread. source is a Registry, or a callable returning a snapshot dict.
+    Returns the server; shutdown() stops it.
+    """
+    def snapshot() -> dict:
+        return source.snapshot() if isinstance(source, Registry) else source()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path in ("/", "/metrics"):
+                body = render_snapshot(snapshot()).encode()
+                ctype = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body = json.dumps(snapshot()).encode()
+                ctype = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass                    # Scrapes every few seconds would drown the loop's own output
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    return server
+
+
+def _read(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {"--port": str(PORT)}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    if len(args) < 2:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+
+    cmd, path = args[0], args[1]
+    if cmd == "show":
+        sys.stdout.write(render_snapshot(_read(path)))
+    elif cmd == "serve":
+        server = serve(lambda: _read(path), int(opts["--port"]))
+        print(f"serving {path} on http://127.0.0.1:{server.server_port}/metrics")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
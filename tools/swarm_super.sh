@@ -6,8 +6,15 @@ LOCK_FILE="$ROOT/.swarm_super.lock"
 SEEN_FILE="$ROOT/.swarm_super.seen"
 LOG_FILE="$ROOT/.swarm_super.log"
 CLAIM_DIR="$ROOT/.swarm_claims"
+SYNC_STATE="$SEEN_FILE.gitsync"
 MAX_PARALLEL="${MAX_PARALLEL:-3}"
 SLEEP_SECS="${SLEEP_SECS:-3}"
+SYNC_DOWN_SECS="${SYNC_DOWN_SECS:-60}"
+SYNC_WINDOW_SECS="${SYNC_WINDOW_SECS:-30}"
+
+# The loop runs in one Python process (swarm_daemon.py), not a process per step.
+# SWARM_PY=0 bash tools/swarm_super.sh runs the shell loop below instead
+[ "${SWARM_PY:-1}" = 1 ] && exec python3 "$ROOT/tools/swarm_daemon.py" super
 
 exec 9>"$LOCK_FILE"
 flock -n 9 || { echo "already running"; exit 1; }
@@ -17,6 +24,24 @@ touch "$SEEN_FILE" "$LOG_FILE" tasks/NEXT.md
 
 log() { printf '[%s] %s\n' "$(date '+%H:%M:%S')" "$*" | tee -a "$LOG_FILE"; }
 
+# ---------- TRACE ----------
+# One JSON line per phase for tools/swarm_trace.py, written with builtins only
+TRACE_FILE="${LOG_FILE%.log}.trace.jsonl"
+CYCLE=0
+mark() {
+  # mark VAR: the /proc/uptime clock (what swarm_trace.py calls start) and the wall clock
+  local up _
+  { read -r up _ < /proc/uptime; } 2>/dev/null || up=0
+  printf -v "$1" '%s %s' "$up" "$EPOCHREALTIME"
+}
+span() {
+  # span NAME MARK OUTCOME [TASK]
+  local end _
+  { read -r end _ < /proc/uptime; } 2>/dev/null || end=0
+  printf '{"name":"%s","start":%s,"end":%s,"ts":%s,"loop":"super","pid":%d,"tid":%d,"cycle":%d,"task":"%s","outcome":"%s"}\n' \
+    "$1" "${2% *}" "$end" "${2#* }" "$$" "$BASHPID" "$CYCLE" "${4:-}" "$3" >> "$TRACE_FILE"
+}
+
 DEFAULT_BRANCH="$(git remote show origin 2>/dev/null | sed -n '/HEAD branch/s/.*: //p')"
 [ -z "$DEFAULT_BRANCH" ] && DEFAULT_BRANCH="$(git branch --show-current 2>/dev/null || echo master)"
 
@@ -30,22 +55,36 @@ pick_tasks() {
     awk '/ACTIVE|READY/ && !/BLOCKED|ABANDONED|MERGED/' "$ROOT/tasks/SWARM-LANES.md" \
     | grep -o 'L-[0-9]\+' || true
 
-    python3 "$ROOT/tools/orient.py" 2>/dev/null | grep -o 'L-[0-9]\+' || true
+    python3 "$ROOT/tools/orient_cache.py" 2>/dev/null | grep -o 'L-[0-9]\+' || true
   ) | awk '!seen[$0]++'
 }
 
 pick_batch() {
-  pick_tasks | grep -vxFf "$SEEN_FILE" | head -n "$MAX_PARALLEL"
+  # Up to $1 unseen ids that no slot is already working on
+  pick_tasks | python3 "$ROOT/tools/seen_store.py" filter "$SEEN_FILE" \
+    | grep -vxF -f <(printf '%s\n' "${RUNNING[@]}") | head -n "$1"
 }
 
 # ---------- CLAIM ----------
 claim() {
-  local id="$1"
-  local f="$CLAIM_DIR/$id"
-  ( set -o noclobber; echo "$$" > "$f" ) 2>/dev/null
+  # A lease, renewed by the loop's heartbeat below; stale claims are reclaimed
+  local t
+  mark t
+  if ! python3 "$ROOT/tools/claims.py" acquire "$CLAIM_DIR" "$1" --pid $$ --suffix ""; then
+    span claim "$t" held "$1"
+    return 1
+  fi
+  span claim "$t" claimed "$1"
+}
+
+release() {
+  python3 "$ROOT/tools/claims.py" release "$CLAIM_DIR" "$1" --pid $$ --suffix "" 2>/dev/null || true
 }
 
-release() { rm -f "$CLAIM_DIR/$1" 2>/dev/null || true; }
+# One heartbeat renews every claim this loop holds, until the loop exits.
+# Disowned, so `wait` and `wait -n` only ever see the workers
+python3 "$ROOT/tools/claims.py" heartbeat "$CLAIM_DIR" --all --pid $$ --suffix "" >/dev/null 2>&1 &
+disown
 
 # ---------- AUTO DECISION ----------
 decide() {
@@ -66,60 +105,153 @@ work() {
   act="$(decide "$id")"
   log "WORK $id ($act)"
 
+  # resolve_one.sh lists the paths it changed in SWARM_TOUCHED; only those are committed
+  local t rc=0 outcome=ok
+  mark t
+  local touched="$SYNC_STATE.touched/$id"
+  mkdir -p "${touched%/*}"
+  rm -f "$touched"
   if [ -x "$ROOT/tools/resolve_one.sh" ]; then
-    AUTO_ACTION="$act" bash "$ROOT/tools/resolve_one.sh" "$id" || true
+    SWARM_TOUCHED="$touched" AUTO_ACTION="$act" bash "$ROOT/tools/resolve_one.sh" "$id" || rc=$?
+  else
+    : > "$touched"
   fi
 
   echo "$id" >> "$SEEN_FILE"
+  python3 "$ROOT/tools/git_sync.py" done "$SYNC_STATE" "$id" || true
+  [ "$rc" -eq 0 ] || outcome="exit $rc"
+  span work "$t" "$outcome" "$id"
 }
 
 # ---------- SYNC ----------
 sync_down() {
-  git fetch origin "$DEFAULT_BRANCH" || true
-  git reset --hard FETCH_HEAD || true
+  # Skipped when the remote branch has not moved since we last fetched or pushed
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" down "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --reset-to fetch_head --message "auto swarm {time}")" || true
+  span sync_down "$t" "${out:-error}"
 }
 
 sync_up() {
-  git add . || true
-  git commit -m "auto swarm $(date +%H:%M:%S)" || true
-  git push origin HEAD:"$DEFAULT_BRANCH" || true
+  # Only the paths workers reported; commits coalesce over SYNC_WINDOW_SECS / SYNC_TASKS
+  local t out
+  mark t
+  out="$(python3 "$ROOT/tools/git_sync.py" up "$SYNC_STATE" --branch "$DEFAULT_BRANCH" --message "auto swarm {time}")" || true
+  span sync_up "$t" "${out:-error}"
+  # A batch still inside its window is asked again when the window is over, not every cycle
+  if [ "$out" = waiting ]; then UP_WAITING=1; else UP_WAITING=0; fi
 }
 
-# ---------- LOOP ----------
-log "START branch=$DEFAULT_BRANCH parallel=$MAX_PARALLEL"
+# ---------- POOL ----------
+# MAX_PARALLEL slots, each refilled as soon as its worker exits
+declare -A RUNNING=()   # pid -> id
+declare -A STARTED=()   # pid -> start, ms
+DONE=0
+SYNCED=0
+UP_WAITING=0
+BUSY_MS=0
+now_ms() { date +%s%3N; }
+T0="$(now_ms)"
 
-while true; do
-  sync_down
+reap() {
+  local pid
+  for pid in "${!RUNNING[@]}"; do
+    kill -0 "$pid" 2>/dev/null && continue
+    wait "$pid" || true
+    release "${RUNNING[$pid]}"
+    BUSY_MS=$((BUSY_MS + $(now_ms) - STARTED[$pid]))
+    DONE=$((DONE + 1))
+    unset "RUNNING[$pid]" "STARTED[$pid]"
+  done
+}
 
-  mapfile -t BATCH < <(pick_batch)
+pool_stats() {
+  local now busy pid
+  now="$(now_ms)"
+  busy="$BUSY_MS"
+  for pid in "${!STARTED[@]}"; do busy=$((busy + now - STARTED[$pid])); done
+  awk -v d="$DONE" -v b="$busy" -v e="$((now - T0))" -v s="$MAX_PARALLEL" -v r="${#RUNNING[@]}" \
+    'BEGIN { e = e > 0 ? e : 1; printf "done=%d busy=%d/%d rate=%.2f/s util=%.0f%%", d, r, s, d * 1000 / e, 100 * b / (s * e) }'
+}
 
-  # fallback: generate task if empty
-  if [ "${#BATCH[@]}" -eq 0 ]; then
-    NEW="L-$(date +%s)"
-    echo "$NEW" >> "$ROOT/tasks/NEXT.md"
-    log "GENERATED $NEW"
-    sleep "$SLEEP_SECS"
-    continue
-  fi
+# ---------- LOOP ----------
+# No batch barrier: sync_up runs on its own clock once work has finished,
+# and sync_down (which commits and rebases the tree under the workers)
+# waits until no slot is busy, at most every SYNC_DOWN_SECS.
+log "START branch=$DEFAULT_BRANCH parallel=$MAX_PARALLEL"
 
-  log "BATCH ${BATCH[*]}"
+sync_down
+LAST_UP="$(now_ms)"
+LAST_DOWN="$LAST_UP"
 
-  pids=()
-  active=()
+while true; do
+  CYCLE=$((CYCLE + 1))
+  if [ $((CYCLE % 100)) -eq 0 ]; then
+    python3 "$ROOT/tools/swarm_trace.py" rotate "$TRACE_FILE" >/dev/null || true
+  fi
+  reap
+  now="$(now_ms)"
+  down_due=$(( now - LAST_DOWN >= SYNC_DOWN_SECS * 1000 ))
+  free_all=$(( ${#RUNNING[@]} == 0 ))
 
-  for id in "${BATCH[@]}"; do
-    if claim "$id"; then
-      active+=("$id")
-      ( work "$id" ) &
-      pids+=("$!")
+  # Only when there is something to commit: completions since the last sync_up,
+  # or a batch that was waiting out SYNC_WINDOW_SECS
+  up_due=0
+  if [ "$DONE" -gt "$SYNCED" ]; then
+    if [ $((now - LAST_UP)) -ge $((SLEEP_SECS * 1000)) ] || [ "$down_due$free_all" = 11 ]; then up_due=1; fi
+  elif [ "$UP_WAITING" = 1 ]; then
+    if [ $((now - LAST_UP)) -ge $((SYNC_WINDOW_SECS * 1000)) ] || [ "$down_due$free_all" = 11 ]; then up_due=1; fi
+  fi
+  if [ "$up_due" = 1 ]; then
+    sync_up
+    LAST_UP="$now"
+    if [ "$DONE" -gt "$SYNCED" ]; then
+      SYNCED="$DONE"
+      log "POOL $(pool_stats)"
     fi
-  done
-
-  for p in "${pids[@]}"; do wait "$p" || true; done
-  for id in "${active[@]}"; do release "$id"; done
+  fi
+  if [ "$down_due" = 1 ] && [ "${#RUNNING[@]}" -eq 0 ]; then
+    sync_down
+    LAST_DOWN="$(now_ms)"
+    down_due=0
+  fi
 
-  sync_up
-  log "CYCLE DONE"
+  free=$((MAX_PARALLEL - ${#RUNNING[@]}))
+  fed=0
+  if [ "$free" -gt 0 ] && [ "$down_due" = 0 ]; then
+    mark t
+    mapfile -t BATCH < <(pick_batch "$free")
+    span pick "$t" ok
+    if [ "${#BATCH[@]}" -gt 0 ]; then
+      log "BATCH ${BATCH[*]}"
+      for id in "${BATCH[@]}"; do
+        if claim "$id"; then
+          ( work "$id" ) &
+          RUNNING[$!]="$id"
+          STARTED[$!]="$(now_ms)"
+          fed=$((fed + 1))
+        else
+          log "SKIP CLAIMED $id"
+        fi
+      done
+    elif [ "${#RUNNING[@]}" -eq 0 ]; then
+      # fallback: generate task if empty
+      NEW="L-$(date +%s)"
+      echo "$NEW" >> "$ROOT/tasks/NEXT.md"
+      python3 "$ROOT/tools/git_sync.py" touch "$SYNC_STATE" tasks/NEXT.md || true
+      log "GENERATED $NEW"
+    fi
+  fi
 
-  sleep "$SLEEP_SECS"
+  if [ "$fed" -gt 0 ] && [ "${#RUNNING[@]}" -lt "$MAX_PARALLEL" ]; then
+    continue
+  elif [ "${#RUNNING[@]}" -gt 0 ]; then
+    mark t
+    wait -n "${!RUNNING[@]}" || true       # Until some worker exits
+    span sleep "$t" ok
+  else
+    mark t
+    sleep "$SLEEP_SECS"
+    span sleep "$t" ok
+  fi
 done
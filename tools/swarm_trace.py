@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+swarm_trace.py — Swarm cycles as spans: one JSON line per phase, viewable as a Chrome trace.
+
+The loop logs (.swarm_super.log, runtime/swarm.log, ...) are free text
+stamped to the second. They say that something happened, not how long
+it took, and a cycle can only be timed by reading timestamps by eye.
+
+Next to its log, each loop now writes a trace (.swarm_super.trace.jsonl,
+runtime/swarm.trace.jsonl, ...). Every phase of a cycle (sync_down,
+pick, claim, work, sync_up, sleep) is one line:
+
+  {"name": "work", "start": 81234.5012, "end": 81236.9120, "ts": 1760000000.12,
+   "loop": "super", "pid": 4242, "tid": 4250, "cycle": 17, "task": "L-12", "outcome": "ok"}
+
+  start, end  Seconds on the monotonic boot clock (CLOCK_BOOTTIME), the
+              one bash reads from /proc/uptime without starting a
+              process (to 10 ms there)
+  ts          Wall time at the start, for lining spans up with the logs
+  tid         The thread (daemon) or subshell (scripts) that ran it
+
+When the file passes MAX_BYTES it is renamed to .1 (.1 to .2, and so
+on, KEEP files kept) and a new one is started, so a long run never grows
+one file without bound.
+
+Run:
+  python3 tools/swarm_trace.py chrome TRACE [-o out.json]   Chrome trace (chrome://tracing, Perfetto)
+  python3 tools/swarm_trace.py summary TRACE                Count, mean and p95 per phase
+  python3 tools/swarm_trace.py rotate TRACE                 Rotate if over MAX_BYTES (for the shell loops)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+MAX_BYTES = int(os.environ.get("SWARM_TRACE_BYTES", 8 << 20))
+KEEP = 3
+
+
+def now() -> float:
+    """Seconds on the clock /proc/uptime reports, so bash and Python spans line up."""
+    try:
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+    except AttributeError:
+        return time.monotonic()     # Not Linux: spans are still ordered, just not comparable with bash
+
+
+def trace_path(log_path: str) -> str:
+    """runtime/swarm.log -> runtime/swarm.trace.jsonl, the way the scripts name it."""
+    base = log_path[:-4] if log_path.endswith(".log") else log_path
+    return base + ".trace.jsonl"
+
+
+def rotate(path: str, max_bytes: int = MAX_BYTES, keep: int = KEEP) -> bool:
+    """If path is over max_bytes, shift it to path.1 (and older ones along). True if it rotated."""
+    try:
+        if os.path.getsize(path) < max_bytes:
+            return False
+    except OSError:
+        return False
+    for n in range(keep - 1, 0, -1):
+        if os.path.exists(f"{path}.{n}"):
+            os.replace(f"{path}.{n}", f"{path}.{n + 1}")
+    os.replace(path, f"{path}.1")
+    return True
+
+
+class Tracer:
+    """Writes spans for one loop to a size-rotated JSONL file. Safe to share between threads."""
+
+    def __init__(self, path: str, loop: str = "", max_bytes: int = MAX_BYTES, keep: int = KEEP):
+        self.path = path
+        self.loop = loop
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.cycle = 0
+        self._lock = threading.Lock()
+        self._size = None
+
+    def write(self, name: str, start: float, end: float, fields: dict):
+        rec = {"name": name, "start": round(start, 6), "end": round(end, 6),
+               "ts": round(time.time() - (now() - start), 3), "loop": self.loop,
+               "pid": os.getpid(), "tid": threading.get_native_id(), "cycle": self.cycle}
+        rec.update(fields)
+        rec.setdefault("outcome", "ok")
+        line = json.dumps(rec, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._size is None:
+                try:
+                    self._size = os.path.getsize(self.path)
+                except OSError:
+                    self._size = 0
+            if self._size + len(line) > self.max_bytes and rotate(self.path, 0, self.keep):
+                self._size = 0
+            with open(self.path, "a") as f:
+                f.write(line)
+            self._size += len(line)
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """Time the block. Set fields["outcome"] (or anything else) on the yielded dict."""
+        start = now()
+        fields.setdefault("cycle", self.cycle)
+        try:
+            yield fields
+        except BaseException as e:
+            fields.setdefault("outcome", f"error: {type(e).__name__}")
+            raise
+        finally:
+            self.write(name, start, now(), fields)
+
+
+# === Reading ===
+
+def read_spans(path: str):
+    """Spans from path and its rotated files, oldest file first."""
+    files = [f"{path}.{n}" for n in range(KEEP * 4, 0, -1)] + [path]
+    for name in files:
+        try:
+            f = open(name, encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue        # A line cut short by a crash
+                if isinstance(rec, dict) and "start" in rec and "end" in rec:
+                    yield rec
+
+
+def chrome(spans) -> dict:
+    """Chrome trace event format: one complete ("X") event per span, in microseconds."""
+    events = []
+    names = {}
+    for rec in spans:
+        pid, tid = rec.get("pid", 0), rec.get("tid", rec.get("pid", 0))
+        names.setdefault(pid, rec.get("loop") or "swarm")
+        args = {k: v for k, v in rec.items() if k not in ("name", "start", "end", "pid", "tid", "loop")}
+        events.append({"name": rec["name"], "cat": rec.get("loop", ""), "ph": "X",
+                       "ts": round(rec["start"] * 1e6), "dur": round((rec["end"] - rec["start"]) * 1e6),
+                       "pid": pid, "tid": tid, "args": args})
+    for pid, name in names.items():
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{name} {pid}"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summary(spans) -> list:
+    """[(phase, count, mean ms, p95 ms, max ms, {outcome: count})], phases in first-seen order."""
+    durations, outcomes = {}, {}
+    for rec in spans:
+        name = rec["name"]
+        durations.setdefault(name, []).append((rec["end"] - rec["start"]) * 1000)
+        seen = outcomes.setdefault(name, {})
+        outcome = str(rec.get("outcome", "ok"))
+        seen[outcome] = seen.get(outcome, 0) + 1
+    rows = []
+    for name, ds in durations.items():
+        ds.sort()
+        rows.append((name, len(ds), sum(ds) / len(ds), ds[min(int(len(ds) * 0.95), len(ds) - 1)],
+                     ds[-1], outcomes[name]))
+    return rows
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out = None
+    if "-o" in args:
+        i = args.index("-o")
+        out = args[i + 1]
+        del args[i:i + 2]
+    if len(args) < 2:
+        print(__doc__.strip().split("Run:\n")[1])
+        sys.exit(1)
+
+    cmd, path = args[0], args[1]
+    if cmd == "chrome":
+        trace = chrome(read_spans(path))
+        if out:
+            with open(out, "w") as f:
+                json.dump(trace, f)
+            print(f"{len(trace['traceEvents'])} events -> {out}")
+        else:
+            json.dump(trace, sys.stdout)
+    elif cmd == "summary":
+        print(f"  {'phase':12s} {'count':>6s} {'mean ms':>9s} {'p95 ms':>9s} {'max ms':>9s}  outcomes")
+        for name, count, mean, p95, worst, outcomes in summary(read_spans(path)):
+            seen = ", ".join(f"{k} {v}" for k, v in sorted(outcomes.items(), key=lambda kv: -kv[1]))
+            print(f"  {name:12s} {count:6d} {mean:9.1f} {p95:9.1f} {worst:9.1f}  {seen}")
+    elif cmd == "rotate":
+        if rotate(path):
+            print(f"rotated {path}")
+    else:
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
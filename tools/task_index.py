@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+task_index.py — Lane scores and task mentions that survive between cycles.
+
+Every pick scored tasks from scratch: read all of tasks/NEXT.md,
+tasks/SWARM-LANES.md and memory/SESSION-LOG.md, split every line, run
+every regex, then use only the last 400 lines of the log. The log only
+ever grows, so each cycle cost more than the one before.
+
+This remembers where it stopped in each file (inode, mtime, size, byte
+offset) and keeps each file's contribution to every L-id score:
+
+  SESSION-LOG.md  append-only. Only appended bytes are parsed. The last
+                  WINDOW lines sit in a ring; a line entering the ring
+                  adds its score changes, a line leaving it takes them
+                  back. On first open only the tail of the file is read.
+  NEXT.md, SWARM-LANES.md
+                  small and edited by hand. If the old content is still
+                  a prefix, only the new lines are parsed; otherwise the
+                  file is re-read, and lines seen before reuse their
+                  parse instead of re-running the regexes.
+
+The state can be saved between runs (the shell pick heredocs do this),
+so even a fresh process does no more than read what was appended.
+
+Scores are the same as swarm_brain.sh / swarm_all_in_one.sh computed
+them, except that a half-written last log line is counted once complete.
+
+Decisions work the same way. MentionIndex maps every task id to the
+status keywords (blocked, stale, duplicate, ...) on the lines that name
+it, so skip / drop / keep for a task is a dictionary lookup instead of a
+scan of all three files.
+
+Run:
+  python3 tools/task_index.py                 Scores, best first
+  python3 tools/task_index.py --state F       Keep state in F between runs
+  python3 tools/task_index.py decide L-12 --state F
+                                              s, d or k for each task id
+"""
+
+import os
+import pickle
+import re
+import sys
+import time
+import zlib
+from collections import deque
+
+
+_ID = re.compile(r"L-\d+")
+_ID_LOWER = re.compile(r"l-\d+")
+
+NEXT_FILE = "tasks/NEXT.md"
+LANES_FILE = "tasks/SWARM-LANES.md"
+LOG_FILE = "memory/SESSION-LOG.md"
+
+NEXT_SCORE = 80
+WINDOW = 400
+
+LANE_WEIGHTS = {
+    "ACTIVE": 120, "READY": 100, "BLOCKED": -90, "ABANDONED|MERGED": -120,
+    "next_step=": 10, "focus=": 8, "available=": 5, "human_open_item=": -25,
+    "domain_sync=": 4, "memory_target=": 4,
+}
+
+_TAIL_CHECK = 64        # Bytes before the old end that must be unchanged for an append
+_MEMO_MAX = 50_000
+
+
+# === Per-line rules ===
+
+def next_line(line: str) -> list:
+    """[(id, delta)] for one NEXT.md line."""
+    return [(i, NEXT_SCORE) for i in _ID.findall(line)]
+
+
+def lane_line(line: str, weights: dict) -> list:
+    """[(id, delta)] for one SWARM-LANES.md line."""
+    found = _ID.findall(line)
+    if not found:
+        return []
+    upper, lower = line.upper(), line.lower()
+    base = 0
+    for marker, w in weights.items():
+        if marker.endswith("="):
+            base += w if marker in lower else 0
+        elif any(m in upper for m in marker.split("|")):
+            base += w
+    return [(i, base) for i in found]
+
+
+def log_line(line: str) -> list:
+    """[(id, delta)] for one SESSION-LOG.md line."""
+    line = line.lower()
+    out = []
+    for i in _ID_LOWER.findall(line):
+        i = i.upper()
+        if "duplicate" in line or "near-duplicate" in line:
+            out.append((i, -20))
+        if "stale" in line or "obsolete" in line:
+            out.append((i, -15))
+        if "resolved" in line or "done" in line or "working" in line:
+            out.append((i, 5))
+    return out
+
+
+def _apply(scores: dict, deltas: list, sign: int = 1):
+    """Add (sign=1) or take back (sign=-1) one line's deltas. scores: {id: [total, lines]}."""
+    for i, d in deltas:
+        entry = scores.get(i)
+        if entry is None:
+            entry = scores[i] = [0, 0]
+        entry[0] += sign * d
+        entry[1] += sign
+        if not entry[1]:
+            # An id scores (even 0) only while some line still mentions it
+            del scores[i]
+
+
+def _last_lines(path: str, size: int, n: int) -> tuple:
+    """(last n complete lines, offset after them), reading backwards from size."""
+    block = 1 << 16
+    pos, data = size, b""
+    with open(path, "rb") as f:
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8", "ignore").splitlines()
+    return lines[-n:] if n else [], pos + end
+
+
+# === Followed files ===
+
+class _Followed:
+    """Where we stopped in one file, and how to tell if it was rewritten."""
+
+    def __init__(self, rel: str):
+        self.rel = rel
+        self.inode = None
+        self.mtime = None
+        self.size = -1
+        self.offset = 0
+        self.tail = b""     # Last _TAIL_CHECK bytes before offset
+        self.crc = 0        # crc32 of bytes [0, offset), for small files
+
+    def _stat(self, path: str):
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def _unchanged(self, st) -> bool:
+        if st is None:
+            return self.inode is None and self.size == 0
+        return (st.st_ino, st.st_mtime_ns, st.st_size) == (self.inode, self.mtime, self.size)
+
+    def _mark(self, st, offset: int, tail: bytes = b"", crc: int = 0):
+        self.inode = st.st_ino if st else None
+        self.mtime = st.st_mtime_ns if st else None
+        self.size = st.st_size if st else 0
+        self.offset = offset
+        self.tail = tail
+        self.crc = crc
+
+    def read_small(self, root: str, whole: bool = False):
+        """
+        None if unchanged, else (appended, lines, partial). appended: the
+        old content is still a prefix and lines are only the new ones
+        (never with whole=True). partial: a last line without a newline,
+        to count now and re-read.
+        """
+        st = self._stat(os.path.join(root, self.rel))
+        if self._unchanged(st):
+            return None
+        data = b""
+        if st is not None:
+            with open(os.path.join(root, self.rel), "rb") as f:
+                data = f.read()
+        end = data.rfind(b"\n") + 1
+        appended = (not whole and st is not None and self.inode == st.st_ino
+                    and end >= self.offset and zlib.crc32(data[:self.offset]) == self.crc)
+        start = self.offset if appended else 0
+        lines = data[start:end].decode("utf-8", "ignore").splitlines()
+        partial = data[end:].decode("utf-8", "ignore")
+        # With a partial line counted, the next read must start over to drop it
+        self._mark(st, end, crc=-1 if partial else zlib.crc32(data[:end]))
+        return appended, lines, partial
+
+    def read_log(self, root: str, last: int = None):
+        """
+        None if unchanged, else (rewritten, lines): the complete lines
+        appended since last time. If the file is new, replaced or
+        truncated, rewritten is True and lines are the whole file, or
+        only its last `last` lines (read from the end).
+        """
+        path = os.path.join(root, self.rel)
+        st = self._stat(path)
+        if self._unchanged(st):
+            return None
+        rewritten = (st is None or self.inode != st.st_ino or st.st_size < self.offset)
+        if not rewritten and self.offset >= _TAIL_CHECK:
+            with open(path, "rb") as f:
+                f.seek(self.offset - _TAIL_CHECK)
+                rewritten = f.read(_TAIL_CHECK) != self.tail
+        if st is None:
+            self._mark(None, 0)
+            return True, []
+
+        if rewritten and last is not None:
+            lines, offset = _last_lines(path, st.st_size, last)
+        else:
+            start = 0 if rewritten else self.offset
+            with open(path, "rb") as f:
+                f.seek(start)
+                chunk = f.read(st.st_size - start)
+            end = chunk.rfind(b"\n") + 1
+            lines = chunk[:end].decode("utf-8", "ignore").splitlines()
+            offset = start + end
+
+        with open(path, "rb") as f:
+            f.seek(max(offset - _TAIL_CHECK, 0))
+            tail = f.read(min(_TAIL_CHECK, offset))
+        self._mark(st, offset, tail)
+        return rewritten, lines
+
+
+class _Saved:
+    """Pickled state, kept as plain dicts, valid only for the same root and settings."""
+
+    def _settings(self) -> dict:
+        return {}
+
+    @classmethod
+    def _restore(cls, path: str, obj):
+        try:
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            if (isinstance(saved, dict) and saved.get("root") == os.path.abspath(obj.root)
+                    and saved.get("settings") == obj._settings()):
+                state = saved["state"]
+                for name, value in state.items():
+                    if name.startswith("_f_"):
+                        followed = getattr(obj, name[2:])
+                        followed.__dict__.update(value)
+                    else:
+                        setattr(obj, name, value)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError, TypeError, ValueError):
+            pass
+        return obj
+
+    def save(self, path: str):
+        state = {}
+        for name, value in self.__dict__.items():
+            if name == "root":
+                continue
+            if isinstance(value, _Followed):
+                state["_f" + name] = dict(value.__dict__)
+            else:
+                state[name] = value
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"root": os.path.abspath(self.root), "settings": self._settings(),
+                         "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+
+# === Scores ===
+
+class TaskIndex(_Saved):
+    """Per-file, per-id score contributions, kept up to date incrementally."""
+
+    def __init__(self, root: str = ".", weights: dict = None, window: int = WINDOW):
+        self.root = root
+        self.weights = dict(weights if weights is not None else LANE_WEIGHTS)
+        self.window = window
+        self.version = 0                # Bumped whenever any score changed
+        self.next_scores = {}           # {id: [total, lines mentioning it]}
+        self.lane_scores = {}
+        self.log_scores = {}
+        self._next = _Followed(NEXT_FILE)
+        self._lanes = _Followed(LANES_FILE)
+        self._log = _Followed(LOG_FILE)
+        self._ring = deque()            # Deltas of the last `window` log lines
+        self._memo = {}                 # (kind, line) -> deltas
+        self.parsed_lines = 0           # Lines actually run through the regexes
+
+    def _settings(self) -> dict:
+        return {"weights": self.weights, "window": self.window}
+
+    @classmethod
+    def load(cls, path: str, root: str = ".", weights: dict = None, window: int = WINDOW) -> "TaskIndex":
+        """Saved state if it matches root, weights and window; otherwise a fresh index."""
+        return cls._restore(path, cls(root, weights, window))
+
+    def _deltas(self, kind: str, line: str) -> list:
+        key = (kind, line)
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+        self.parsed_lines += 1
+        if kind == "next":
+            deltas = next_line(line)
+        elif kind == "lane":
+            deltas = lane_line(line, self.weights)
+        else:
+            deltas = log_line(line)
+        if len(self._memo) >= _MEMO_MAX:
+            self._memo.clear()
+        self._memo[key] = deltas
+        return deltas
+
+    def _update_small(self, followed: _Followed, kind: str, scores: dict) -> bool:
+        """NEXT.md / SWARM-LANES.md: parse appended lines, or re-read with memoized lines."""
+        read = followed.read_small(self.root)
+        if read is None:
+            return False
+        appended, lines, partial = read
+        if not appended:
+            scores.clear()
+        for line in lines:
+            _apply(scores, self._deltas(kind, line))
+        if partial:
+            _apply(scores, self._deltas(kind, partial))
+        return True
+
+    def _update_log(self) -> bool:
+        read = self._log.read_log(self.root, last=self.window)
+        if read is None:
+            return False
+        rewritten, lines = read
+        if rewritten:
+            self._ring.clear()
+            self.log_scores.clear()
+        for line in lines[-self.window:]:
+            if len(self._ring) >= self.window:
+                _apply(self.log_scores, self._ring.popleft(), -1)
+            deltas = self._deltas("log", line)
+            self._ring.append(deltas)
+            _apply(self.log_scores, deltas)
+        return True
+
+    def update(self) -> bool:
+        """Catch up with all three files. True if any score may have changed."""
+        changed = self._update_small(self._next, "next", self.next_scores)
+        changed |= self._update_small(self._lanes, "lane", self.lane_scores)
+        changed |= self._update_log()
+        if changed:
+            self.version += 1
+        return changed
+
+    def scores(self, orient: str = "") -> dict:
+        """{L-id: score}: NEXT + lanes + log window + orient.py rank."""
+        out = {}
+        for part in (self.next_scores, self.lane_scores, self.log_scores):
+            for i, (v, _) in part.items():
+                out[i] = out.get(i, 0) + v
+        for n, i in enumerate(_ID.findall(orient)):
+            out[i] = out.get(i, 0) + max(30 - n, 1)
+        return out
+
+    def ranked(self, orient: str = "", seen=()) -> list:
+        """[(score, id)] best first, unseen and non-negative only."""
+        items = [(s, i) for i, s in self.scores(orient).items() if i not in seen and s >= 0]
+        items.sort(key=lambda x: (-x[0], x[1]))
+        return items
+
+
+# === Mentions ===
+
+SKIP_WORDS = ("blocked", "human_open_item", "unclear", "investigate", "question")
+DROP_WORDS = ("duplicate", "near-duplicate", "stale", "obsolete", "abandoned")
+TEXT_DROP_WORDS = ("remove", "delete")      # Also mean drop when the task is a line of text
+
+_KEYWORDS = SKIP_WORDS + DROP_WORDS + TEXT_DROP_WORDS
+_SKIP = (1 << len(SKIP_WORDS)) - 1
+_DROP = ((1 << len(DROP_WORDS)) - 1) << len(SKIP_WORDS)
+_TEXT_DROP = ((1 << len(TEXT_DROP_WORDS)) - 1) << (len(SKIP_WORDS) + len(DROP_WORDS))
+
+
+def line_flags(line: str) -> int:
+    """Bit per status keyword in a lowercased line."""
+    flags = 0
+    for bit, word in enumerate(_KEYWORDS):
+        if word in line:
+            flags |= 1 << bit
+    return flags
+
+
+def action_for(flags: int, text_task: bool = False) -> str:
+    """s(kip), d(rop) or k(eep), the way the decide_action heredocs choose."""
+    if flags & _SKIP:
+        return "s"
+    if flags & (_DROP | _TEXT_DROP if text_task else _DROP):
+        return "d"
+    return "k"
+
+
+def _mention(ids: dict, line: str) -> int:
+    """Fold one line into {id prefix: flags}. Returns the line's flags."""
+    line = line.lower()
+    flags = line_flags(line)
+    for token in _ID_LOWER.findall(line):
+        # "l-1" is a substring of "l-12": index every prefix, so lookup stays one get
+        for end in range(3, len(token) + 1):
+            key = token[:end]
+            ids[key] = ids.get(key, 0) | flags
+    return flags
+
+
+class MentionIndex(_Saved):
+    """
+    Which lines of NEXT.md, SWARM-LANES.md and SESSION-LOG.md name each
+    task id, reduced to the status keywords those lines contain. Deciding
+    an id is a dictionary lookup; the whole log is read once, after that
+    only what was appended.
+    """
+
+    PARTS = ("next", "lanes", "log")
+
+    def __init__(self, root: str = "."):
+        self.root = root
+        self._next = _Followed(NEXT_FILE)
+        self._lanes = _Followed(LANES_FILE)
+        self._log = _Followed(LOG_FILE)
+        self.ids = {part: {} for part in self.PARTS}       # Per file: {id prefix: flags}
+        self.any = {part: 0 for part in self.PARTS}        # Per file: OR over every line
+        self._text = None           # Lowercased text of all three, for text tasks
+
+    @classmethod
+    def load(cls, path: str, root: str = ".") -> "MentionIndex":
+        return cls._restore(path, cls(root))
+
+    def save(self, path: str):
+        self._text = None
+        super().save(path)
+
+    def _fold(self, part: str, lines):
+        ids, flags = self.ids[part], 0
+        for line in lines:
+            flags |= _mention(ids, line)
+        self.any[part] |= flags
+
+    def update(self) -> bool:
+        """Catch up with all three files. True if anything changed."""
+        changed = False
+        for part, followed in (("next", self._next), ("lanes", self._lanes)):
+            # Small files: an edit can take a mention away, so rebuild them whole
+            read = followed.read_small(self.root, whole=True)
+            if read is None:
+                continue
+            _, lines, partial = read
+            self.ids[part], self.any[part] = {}, 0
+            self._fold(part, lines + [partial] if partial else lines)
+            changed = True
+        read = self._log.read_log(self.root)
+        if read is not None:
+            rewritten, lines = read
+            if rewritten:
+                self.ids["log"], self.any["log"] = {}, 0
+            self._fold("log", lines)
+            changed = True
+        if changed:
+            self._text = None
+        return changed
+
+    def flags(self, task: str) -> int:
+        """OR of the keyword flags of lines naming task, or of every line if none does."""
+        needle = task.lower()
+        if not _ID_LOWER.fullmatch(needle):
+            return self._scan(needle)
+        flags, found = 0, False
+        for part in self.PARTS:
+            hit = self.ids[part].get(needle)
+            if hit is not None:
+                flags |= hit
+                found = True
+        if found:
+            return flags
+        for part in self.PARTS:
+            flags |= self.any[part]
+        return flags
+
+    def _scan(self, needle: str) -> int:
+        """Free text: find it in the lowercased files, kept in memory until they change."""
+        if self._text is None:
+            texts = []
+            for rel in (NEXT_FILE, LANES_FILE, LOG_FILE):
+                try:
+                    with open(os.path.join(self.root, rel), encoding="utf-8", errors="ignore") as f:
+                        texts.append(f.read().lower())
+                except OSError:
+                    continue
+            self._text = "\n" + "\n".join(texts) + "\n"
+        text = self._text
+        if not needle:
+            return line_flags(text)
+        flags, found = 0, False
+        i = text.find(needle)
+        while i != -1:
+            start = text.rfind("\n", 0, i) + 1
+            end = text.find("\n", i)
+            flags |= line_flags(text[start:end])
+            found = True
+            i = text.find(needle, end)
+        return flags if found else line_flags(text)
+
+    def decide(self, task: str, width: int = 0) -> str:
+        """s, d or k for an id, or for a task line (matched on its first `width` chars)."""
+        if width:
+            return action_for(self.flags(task.lower()[:width]), text_task=True)
+        return action_for(self.flags(task))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    state = None
+    if "--state" in args:
+        i = args.index("--state")
+        state = args[i + 1]
+        del args[i:i + 2]
+
+    if args and args[0] == "decide":
+        # One action letter per task id, in order
+        index = MentionIndex.load(state) if state else MentionIndex()
+        index.update()
+        if state:
+            index.save(state)
+        for task in args[1:]:
+            print(index.decide(task))
+        sys.exit(0)
+
+    index = TaskIndex.load(state) if state else TaskIndex()
+    t0 = time.perf_counter()
+    index.update()
+    elapsed = (time.perf_counter() - t0) * 1000
+    if state:
+        index.save(state)
+    print(f"{len(index.scores())} ids, {index.parsed_lines} lines parsed in total, "
+          f"update {elapsed:.1f} ms")
+    for score, i in index.ranked()[:20]:
+        print(f"  {score:5d}  {i}")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+textvec.py — Statements as vectors. Each one embedded once, ever.
+
+A statement becomes a bag of words and word pairs, hashed into a fixed
+number of slots and scaled to unit length. Cosine similarity between two
+statements is then one dot product, and a whole corpus is one matrix
+multiply.
+
+No model, no training, no network. The same text always gives the same
+vector, so vectors are cached on disk by a hash of the text: unchanged
+statements are never re-embedded, however often the corpus is rescored.
+
+Cache layout (append-only, memory-mapped for reads):
+  workspace/cache/textvec/keys-DIM.txt      one text hash per line
+  workspace/cache/textvec/vectors-DIM.f32   one row of DIM float32 per line
+  workspace/cache/textvec/keys-DIM.lock     flock held while appending
+
+Row i of the vectors belongs to line i of the keys, so an append of both
+is made under the lock: two processes filling the cache at once would
+otherwise interleave their rows and keys.
+
+Requires: numpy
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+
+DIM = 1 << 11
+CACHE_DIR = "workspace/cache/textvec"
+
+STOPWORDS = frozenset("""
+a an the and or but of to in on at by for from with as is are was were be been
+being it its this that these those i we you he she they our their his her my
+your us them will would can could should has have had do does did so than then
+into over under about after before up out all any some very just also only
+""".split())
+
+_WORDS = re.compile(r"[a-z0-9$%]+(?:[.,][0-9]+)*")
+
+
+def tokens(text: str) -> list:
+    """Lowercase words, "n't" spelled out as "not", stopwords dropped."""
+    text = text.lower().replace("n't", " not").replace("’", "'")
+    return [w for w in _WORDS.findall(text) if w not in STOPWORDS]
+
+
+def text_key(text: str) -> str:
+    """Stable cache key for a statement."""
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:20]
+
+
+def embed(texts: list, dim: int = DIM) -> np.ndarray:
+    """Unit-length hashed bag-of-words (+ word pairs), shape (len(texts), dim)."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = tokens(text)
+        feats = words + [a + " " + b for a, b in zip(words, words[1:])]
+        for f in feats:
+            h = zlib.crc32(f.encode())
+            # Low bits pick the slot, one high bit picks the sign
+            out[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+class VectorCache:
+    """Append-only on-disk store of statement vectors, keyed by text hash."""
+
+    def __init__(self, path: str = CACHE_DIR, dim: int = DIM):
+        self.path = path
+        self.dim = dim
+        self._keys_path = os.path.join(path, f"keys-{dim}.txt")
+        self._vec_path = os.path.join(path, f"vectors-{dim}.f32")
+        self._lock_path = os.path.join(path, f"keys-{dim}.lock")
+        self._row = {}
+        self._keys_end = 0          # Bytes of the keys file already in _row
+        self._mmap = None
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(self._keys_path):
+            with self._locked():
+                self._load()
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        """
+        Pick up keys appended since the last call, ours or another
+        process's. Caller holds the lock, so files that disagree mean a
+        write was interrupted, never one still in progress.
+        """
+        if not os.path.exists(self._keys_path) or not os.path.exists(self._vec_path):
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_end)
+            tail = f.read()
+        new = tail.decode("ascii", "replace").split()
+        size = os.path.getsize(self._vec_path)
+        if tail.endswith(b"\n") or not tail:
+            if size == (len(self._row) + len(new)) * 4 * self.dim:
+                for k in new:
+                    self._row[k] = len(self._row)
+                self._keys_end += len(tail)
+                return
+        # A write was interrupted. Drop the unmatched tail of both files.
+        with open(self._keys_path) as f:
+            keys = [line.strip() for line in f if line.strip()]
+        n = min(size // (4 * self.dim), len(keys))
+        with open(self._vec_path, "r+b") as f:
+            f.truncate(n * 4 * self.dim)
+        with open(self._keys_path, "w") as f:
+            f.writelines(k + "\n" for k in keys[:n])
+        self._row = {k: i for i, k in enumerate(keys[:n])}
+        self._keys_end = os.path.getsize(self._keys_path)
+        self._mmap = None
+
+    def __len__(self):
+        return len(self._row)
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self._row
+
+    def _matrix(self) -> np.ndarray:
+        if self._mmap is None or len(self._mmap) < len(self._row):
+            self._mmap = np.memmap(self._vec_path, dtype=np.float32, mode="r",
+                                   shape=(len(self._row), self.dim))
+        return self._mmap
+
+    def vectors(self, texts: list) -> np.ndarray:
+        """Vectors for texts, embedding and storing only the ones never seen."""
+        keys = [text_key(t) for t in texts]
+        missing = {}
+        for k, t in zip(keys, texts):
+            if k not in self._row and k not in missing:
+                missing[k] = t
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        if missing:
+            fresh = embed(list(missing.values()), self.dim)
+            with self._locked():
+                # Another process may have stored some of these meanwhile
+                self._load()
+                names = list(missing)
+                keep = [i for i, k in enumerate(names) if k not in self._row]
+                if keep:
+                    added = [names[i] for i in keep]
+                    # Vectors first, then keys. A crash in between leaves an
+                    # orphan row, which the next _load() trims.
+                    with open(self._vec_path, "ab") as f:
+                        f.write(fresh[keep].tobytes())
+                    with open(self._keys_path, "a") as f:
+                        f.writelines(k + "\n" for k in added)
+                    self._load()
+            self._mmap = None
+
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.asarray(self._matrix()[[self._row[k] for k in keys]])
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+timeline.py — When did it happen? Parse the dates once. Ask many times.
+
+Dates in the five senses are free strings: "2019", "March 2023",
+"Feb 24, 2022", "1998-2014", "2024-03-01". This reads each one once into
+a span of ordinal day numbers — partial dates become the whole month or
+year they name — and remembers the answer.
+
+The spans go into a sorted index, bucketed by span length. "Everything
+from 2008 to 2012" is two binary searches per bucket, not a walk through
+every record. Each person and each country has its own sorted slice, so
+their timelines come straight out of the index.
+
+Run:
+  python3 tools/timeline.py 2008 2012                 All evidence, 2008–2012
+  python3 tools/timeline.py --person "Vladimir Putin"  One person's timeline
+  python3 tools/timeline.py --country Russia 2020 2024 One country, one range
+"""
+
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from heapq import merge
+from typing import Optional
+
+
+_MONTHS = {
+    m: i for i, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+        ("dec", "december"),
+    ], 1) for m in names
+}
+_MONTH = r"(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_YEAR = r"((?:1[5-9]|20)\d{2})"
+
+_ISO = re.compile(rf"\b{_YEAR}-(\d{{1,2}})(?:-(\d{{1,2}}))?\b")
+_RANGE = re.compile(rf"\b{_YEAR}\s*(?:-|–|to)\s*((?:1[5-9]|20)?\d{{2}})\b")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})\s+{_MONTH}\s+{_YEAR}\b", re.I)
+_MONTH_DAY = re.compile(rf"\b{_MONTH}\s+(\d{{1,2}}),?\s+{_YEAR}\b", re.I)
+_MONTH_YEAR = re.compile(rf"\b{_MONTH}\s+{_YEAR}\b", re.I)
+_YEAR_ONLY = re.compile(rf"\b{_YEAR}\b")
+
+
+def _span(year: int, month: int = 0, day: int = 0) -> tuple:
+    """Ordinal (first day, last day) of a year, a month, or one day."""
+    if day:
+        d = date(year, month, day).toordinal()
+        return d, d
+    if month:
+        return (date(year, month, 1).toordinal(),
+                date(year, month, monthrange(year, month)[1]).toordinal())
+    return date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+
+
+@lru_cache(maxsize=None)
+def parse_date(text: str) -> Optional[tuple]:
+    """
+    Free-text date -> (first ordinal day, last ordinal day), or None.
+    The most specific form found wins; a year alone covers the whole year.
+    """
+    if not text:
+        return None
+    try:
+        m = _ISO.search(text)
+        if m:
+            return _span(int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
+        m = _RANGE.search(text)
+        if m:
+            first, last = m.group(1), m.group(2)
+            last = int(first[:4 - len(last)] + last)  # "2008–12" -> 2012
+            if last >= int(first):
+                return _span(int(first))[0], _span(last)[1]
+        m = _DAY_MONTH.search(text)
+        if m:
+            return _span(int(m.group(3)), _MONTHS[m.group(2).lower()], int(m.group(1)))
+        m = _MONTH_DAY.search(text)
+        if m:
+            return _span(int(m.group(3)), _MONTHS[m.group(1).lower()], int(m.group(2)))
+        m = _MONTH_YEAR.search(text)
+        if m:
+            return _span(int(m.group(2)), _MONTHS[m.group(1).lower()])
+        m = _YEAR_ONLY.search(text)
+        if m:
+            return _span(int(m.group(1)))
+    except ValueError:  # "Feb 30, 2020"
+        return None
+    return None
+
+
+def describe(span: tuple) -> str:
+    """(first, last) ordinals back to a readable date or range."""
+    first, last = date.fromordinal(span[0]), date.fromordinal(span[1])
+    if first == last:
+        return first.isoformat()
+    if (first.day, first.month, last.day, last.month) == (1, 1, 31, 12):
+        return str(first.year) if first.year == last.year else f"{first.year}–{last.year}"
+    if first.year == last.year and first.month == last.month:
+        return first.strftime("%Y-%m")
+    return f"{first.isoformat()} – {last.isoformat()}"
+
+
+@dataclass(order=True)
+class Event:
+    """One dated piece of evidence, ordered by when it started."""
+    start: int
+    end: int
+    person: str = ""
+    country: str = ""
+    sense: str = ""      # sight, hearing, taste, touch
+    text: str = ""
+    raw_date: str = ""
+
+
+def record_events(rec) -> list:
+    """Every dated item of an AccountabilityRecord as Events. Undated items are skipped."""
+    found = []
+    for s in rec.sight:
+        found.append(("sight", s.date_of_record, s.summary))
+    for h in rec.hearing:
+        found.append(("hearing", h.date, h.summary))
+    for t in rec.taste:
+        found.append(("taste", t.claim_date, t.claim))
+    for i in rec.touch:
+        found.append(("touch", i.date, i.decision))
+
+    events = []
+    for sense, raw, text in found:
+        span = parse_date(raw)
+        if span:
+            events.append(Event(span[0], span[1], rec.name, rec.country, sense, text, raw))
+    return events
+
+
+class _Sorted:
+    """
+    Events sorted by start, and again in buckets by span length.
+
+    A range query has to reach back to events that started before it and
+    are still running. With one sorted list, how far back is set by the
+    single longest span, so one decade-long item made every query scan a
+    decade of single days. Bucket k holds spans shorter than 2**k days and
+    is searched only as far back as that, so each bucket scans at most
+    about twice what actually overlaps.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._buckets = {}          # k -> (starts, events), spans < 2**k days
+
+    @staticmethod
+    def _bucket(ev: Event) -> int:
+        return (ev.end - ev.start).bit_length()
+
+    def add(self, ev: Event):
+        self.events.insert(bisect_right(self.events, ev), ev)
+        starts, events = self._buckets.setdefault(self._bucket(ev), ([], []))
+        i = bisect_right(events, ev)
+        starts.insert(i, ev.start)
+        events.insert(i, ev)
+
+    def extend(self, events: list):
+        """Bulk load: one sort instead of an insert per event."""
+        self.events = sorted(self.events + list(events))
+        grouped = {}
+        for ev in self.events:
+            grouped.setdefault(self._bucket(ev), []).append(ev)
+        self._buckets = {k: ([e.start for e in evs], evs) for k, evs in grouped.items()}
+
+    def overlapping(self, first: int, last: int) -> list:
+        found = []
+        for k, (starts, events) in self._buckets.items():
+            # A span in bucket k that overlaps [first, last] starts after
+            # first - 2**k and no later than last.
+            lo = bisect_left(starts, first - (1 << k))
+            hi = bisect_right(starts, last)
+            found.append([e for e in events[lo:hi] if e.end >= first])
+        return list(merge(*found))
+
+
+class TimelineIndex:
+    """Interval index over all dated evidence, globally and per person/country."""
+
+    def __init__(self):
+        self._all = _Sorted()
+        self._person = {}
+        self._country = {}
+
+    def __len__(self):
+        return len(self._all.events)
+
+    def add(self, ev: Event):
+        self._all.add(ev)
+        self._person.setdefault(ev.person, _Sorted()).add(ev)
+        self._country.setdefault(ev.country, _Sorted()).add(ev)
+
+    def add_record(self, rec):
+        for ev in record_events(rec):
+            self.add(ev)
+
+    @classmethod
+    def from_records(cls, records) -> "TimelineIndex":
+        events = [ev for rec in records for ev in record_events(rec)]
+        index = cls()
+        index._all.extend(events)
+        by_person, by_country = {}, {}
+        for ev in events:
+            by_person.setdefault(ev.person, []).append(ev)
+            by_country.setdefault(ev.country, []).append(ev)
+        for key, evs in by_person.items():
+            index._person.setdefault(key, _Sorted()).extend(evs)
+        for key, evs in by_country.items():
+            index._country.setdefault(key, _Sorted()).extend(evs)
+        return index
+
+    def _slice(self, person: str = None, country: str = None) -> Optional[_Sorted]:
+        if person is not None:
+            return self._person.get(person)
+        if country is not None:
+            return self._country.get(country)
+        return self._all
+
+    def between(self, first: str, last: str, person: str = None, country: str = None) -> list:
+        """
+        Events overlapping first..last (inclusive). Bounds are date strings
+        of any precision: between("2008", "2012") covers 2008-01-01..2012-12-31.
+        """
+        a, b = parse_date(first), parse_date(last)
+        if not a or not b:
+            raise ValueError(f"Unreadable date range: {first!r} .. {last!r}")
+        sl = self._slice(person, country)
+        return sl.overlapping(a[0], b[1]) if sl else []
+
+    def timeline(self, person: str = None, country: str = None) -> list:
+        """All events for one person or one country, in date order."""
+        sl = self._slice(person, country)
+        return list(sl.events) if sl else []
+
+    def people(self) -> list:
+        return sorted(self._person)
+
+    def countries(self) -> list:
+        return sorted(self._country)
+
+
+def print_events(events: list):
+    for ev in events:
+        print(f"  {describe((ev.start, ev.end)):>12}  {ev.person} [{ev.sense}]")
+        print(f"  {'':>12}  {ev.text}")
+
+
+if __name__ == "__main__":
+    from corpus import load_all_records, to_accountability
+
+    args = sys.argv[1:]
+    person = country = None
+    if "--person" in args:
+        i = args.index("--person")
+        person = args[i + 1]
+        del args[i:i + 2]
+    if "--country" in args:
+        i = args.index("--country")
+        country = args[i + 1]
+        del args[i:i + 2]
+
+    index = TimelineIndex.from_records(to_accountability(r) for r in load_all_records())
+
+    if len(args) >= 2:
+        events = index.between(args[0], args[1], person=person, country=country)
+        print(f"TIMELINE {args[0]} – {args[1]}: {len(events)} dated items\n")
+    elif person or country:
+        events = index.timeline(person=person, country=country)
+        print(f"TIMELINE — {person or country}: {len(events)} dated items\n")
+    else:
+        print("Usage:")
+        print("  python3 tools/timeline.py 2008 2012")
+        print('  python3 tools/timeline.py --person "Vladimir Putin"')
+        print("  python3 tools/timeline.py --country Russia 2020 2024")
+        print(f"\n{len(index)} dated items, {len(index.people())} people, "
+              f"{len(index.countries())} countries.")
+        sys.exit(0)
+    print_events(events)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+triggers.py — Watch the news for the SanctuaryPlan triggers. Count them.
+
+The plan lists early warning triggers and one rule: if 3+ fire, MOVE.
+This turns the rule into a running count.
+
+Events arrive as JSON lines, from a file or a live feed:
+  {"ts": "2026-03-01", "text": "Parliament grants the president emergency powers", "source": "..."}
+  {"ts": "2026-09-12", "text": "Emergency powers rescinded", "clear": true}
+
+Every trigger has a few phrases that mean it fired. All phrases are
+compiled once into one Aho-Corasick automaton, so an event is scanned in
+a single pass whatever the number of triggers, and per-trigger state is
+updated in place. The work per event does not grow with how many events
+came before it.
+
+When the number of active triggers reaches the threshold, one alert is
+emitted. If triggers are later cleared and the count drops, the engine
+re-arms.
+
+The triggers are the plan's own (SanctuaryPlan.triggers()), read from a
+plan saved as JSON with --plan, or the defaults without one. A trigger
+with no known phrases is matched on its own text and word pairs.
+
+Replay a recorded feed to test a plan:
+  python3 tools/triggers.py feed.jsonl
+  python3 tools/triggers.py feed.jsonl --threshold 2
+  python3 tools/triggers.py feed.jsonl --plan plan.json
+  tail -f feed.jsonl | python3 tools/triggers.py - --plan plan.json
+"""
+
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, field, fields
+
+from consequence_sim import DEFAULT_TRIGGERS, MOVE_THRESHOLD, SanctuaryPlan
+
+
+# Phrases that mean a default trigger fired. Lowercase, matched on word boundaries.
+TRIGGER_PHRASES = {
+    DEFAULT_TRIGGERS[0]: [
+        "independent media shut", "media shut down", "newspaper closed", "newspaper shut",
+        "broadcaster taken over", "tv station seized", "outlet shut down", "outlets shut down",
+        "press license revoked", "press licence revoked", "media taken over",
+    ],
+    DEFAULT_TRIGGERS[1]: [
+        "court packing", "packs the court", "packed the court", "judges dismissed",
+        "judges removed", "judges purged", "supreme court expanded", "ignores court ruling",
+        "defies court ruling", "judiciary bypassed", "bypasses the judiciary",
+    ],
+    DEFAULT_TRIGGERS[2]: [
+        "opposition leader arrested", "opposition leader jailed", "opponent jailed",
+        "opponents jailed", "opposition figures detained", "political prisoner",
+        "political prisoners", "jailed for extremism", "charged with extremism",
+    ],
+    DEFAULT_TRIGGERS[3]: [
+        "state of emergency", "emergency powers", "martial law", "rule by decree",
+    ],
+    DEFAULT_TRIGGERS[4]: [
+        "blames migrants", "blamed migrants", "blames minorities", "blamed minorities",
+        "enemy within", "foreign agents law", "foreign agent registry", "foreign agents registry",
+        "registry of foreign agents", "undesirable organization",
+    ],
+    DEFAULT_TRIGGERS[5]: [
+        "capital controls", "currency controls", "withdrawal limits", "withdrawals limited",
+        "exchange restrictions", "capital flight restrictions", "foreign currency banned",
+    ],
+    DEFAULT_TRIGGERS[6]: [
+        "exit visa", "exit visas", "passports confiscated", "passports seized",
+        "banned from leaving", "citizens barred from leaving", "travel ban on citizens",
+    ],
+    DEFAULT_TRIGGERS[7]: [
+        "troops deployed against protesters", "army deployed against protesters",
+        "military deployed against protesters", "soldiers fired on protesters",
+        "troops fired on protesters", "army on the streets", "military on the streets",
+    ],
+}
+
+
+def phrases_for(trigger: str) -> list:
+    """Known phrases for a trigger, else the trigger text itself and its word pairs."""
+    if trigger in TRIGGER_PHRASES:
+        return TRIGGER_PHRASES[trigger]
+    words = [w for w in trigger.lower().replace("(", " ").replace(")", " ").split() if len(w) > 3]
+    return [trigger.lower()] + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def load_plan(path: str) -> SanctuaryPlan:
+    """A SanctuaryPlan from a JSON object of its fields. Unknown keys are ignored."""
+    with open(path) as f:
+        data = json.load(f)
+    known = {f.name for f in fields(SanctuaryPlan)}
+    return SanctuaryPlan(**{k: v for k, v in data.items() if k in known})
+
+
+# === Keyword automaton ===
+
+class Automaton:
+    """
+    Aho-Corasick over many phrases. find(text) reports every phrase that
+    occurs as whole words, in one left-to-right pass over the text.
+    """
+
+    def __init__(self, phrases: dict):
+        """phrases: {phrase: [labels]}. A phrase may carry several labels, a label several phrases."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]           # Per state: [(label, phrase length)]
+        for phrase, labels in phrases.items():
+            for label in labels:
+                self._insert(phrase.lower(), label)
+        self._link()
+
+    def _insert(self, phrase: str, label):
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((label, len(phrase)))
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Labels of every phrase found in text on word boundaries."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                after = text[i + 1] if i + 1 < n else " "
+                if after.isalnum():
+                    continue
+                for label, length in out[state]:
+                    start = i - length + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        found.add(label)
+        return found
+
+
+# === Engine ===
+
+@dataclass
+class TriggerState:
+    trigger: str
+    active: bool = False
+    hits: int = 0
+    first_seen: str = ""
+    last_seen: str = ""
+    evidence: str = ""         # Text of the event that last fired it
+
+
+@dataclass
+class Alert:
+    ts: str
+    active: int
+    threshold: int
+    triggers: list = field(default_factory=list)   # Active trigger names
+
+    def __str__(self):
+        lines = [f"[{self.ts}] MOVE — {self.active} of the plan's triggers have fired "
+                 f"(threshold {self.threshold})"]
+        lines.extend(f"  - {t}" for t in self.triggers)
+        return "\n".join(lines)
+
+
+class TriggerEngine:
+    """Per-trigger state, updated event by event. Alerts once per crossing."""
+
+    def __init__(self, triggers=DEFAULT_TRIGGERS, threshold: int = MOVE_THRESHOLD):
+        self.threshold = threshold
+        self.states = [TriggerState(t) for t in triggers]
+        self.active = 0
+        self.events = 0
+        self.alerted = False
+        phrases = {}
+        for i, t in enumerate(triggers):
+            for p in phrases_for(t):
+                phrases.setdefault(p, []).append(i)
+        self._automaton = Automaton(phrases)
+
+    def feed(self, event: dict):
+        """Apply one event. Returns an Alert when the threshold is crossed, else None."""
+        self.events += 1
+        ts = str(event.get("ts", ""))
+        clear = bool(event.get("clear"))
+        for i in self._automaton.find(event.get("text", "")):
+            st = self.states[i]
+            if clear:
+                if st.active:
+                    st.active = False
+                    self.active -= 1
+                continue
+            st.hits += 1
+            st.first_seen = st.first_seen or ts
+            st.last_seen = ts
+            st.evidence = event.get("text", "")
+            if not st.active:
+                st.active = True
+                self.active += 1
+
+        if self.active < self.threshold:
+            self.alerted = False        # Re-arm once things calm down
+            return None
+        if self.alerted:
+            return None
+        self.alerted = True
+        return Alert(ts, self.active, self.threshold,
+                     [s.trigger for s in self.states if s.active])
+
+    def replay(self, lines) -> list:
+        """Feed JSON lines (a file, stdin, a list). Returns the alerts, in order."""
+        alerts = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            alert = self.feed(json.loads(line))
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+
+def print_state(engine: TriggerEngine):
+    print(f"{engine.events} events, {engine.active} of {len(engine.states)} triggers active "
+          f"(threshold {engine.threshold})")
+    for st in engine.states:
+        mark = "FIRED" if st.active else ("cleared" if st.hits else "-")
+        print(f"  [{mark:>7}] {st.trigger}" + (f"  ({st.hits}x, since {st.first_seen})" if st.hits else ""))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    threshold = MOVE_THRESHOLD
+    triggers = DEFAULT_TRIGGERS
+    if "--threshold" in args:
+        i = args.index("--threshold")
+        threshold = int(args[i + 1])
+        del args[i:i + 2]
+    if "--plan" in args:
+        i = args.index("--plan")
+        triggers = load_plan(args[i + 1]).triggers()
+        del args[i:i + 2]
+    if not args:
+        print(__doc__.strip().split("\n\n")[-1])
+        sys.exit(0)
+
+    engine = TriggerEngine(triggers, threshold=threshold)
+    if args[0] == "-":
+        for line in sys.stdin:
+            if line.strip():
+                alert = engine.feed(json.loads(line))
+                if alert:
+                    print(alert, flush=True)
+    else:
+        with open(args[0]) as f:
+            for alert in engine.replay(f):
+                print(alert)
+                print()
+    print_state(engine)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+worker_pool.py — Fixed worker slots, refilled the moment one frees up.
+
+The swarm loops worked in batches: pick N tasks, start N workers, wait
+for all of them, sync, pick again. One slow resolve_one.sh held every
+other slot idle until it finished.
+
+A WorkerPool keeps `slots` threads running. Each takes the next item
+from a bounded queue as soon as its last one is done, so a free slot
+never waits for a busy one. The scheduler puts items in with submit()
+while room() says there is space, and wait()s for a slot to finish when
+there is not; the bound keeps it from claiming far more work than the
+slots can start soon.
+
+Every slot records how long it was busy. stats() gives tasks done,
+tasks/sec and utilization (busy time / slots x elapsed), so a run shows
+whether the slots were kept fed.
+
+Run:
+  python3 tools/worker_pool.py [--slots 3] [--tasks 12]   Demo: sleeps of uneven length
+"""
+
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+
+_STOP = object()
+
+
+@dataclass
+class PoolStats:
+    slots: int
+    done: int
+    failed: int
+    queued: int
+    busy: int
+    elapsed: float          # Seconds since the pool started
+    busy_seconds: float     # Summed over slots, including work still running
+
+    @property
+    def rate(self) -> float:
+        """Tasks finished per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of slot time spent working, 0..1."""
+        total = self.slots * self.elapsed
+        return min(self.busy_seconds / total, 1.0) if total > 0 else 0.0
+
+    def line(self) -> str:
+        return (f"done={self.done} failed={self.failed} busy={self.busy}/{self.slots} "
+                f"queued={self.queued} rate={self.rate:.2f}/s util={self.utilization:.0%}")
+
+
+class WorkerPool:
+    """fn(item) run in `slots` threads, fed from a queue of at most queue_size waiting items."""
+
+    def __init__(self, slots: int, fn, queue_size: int = None, on_error=None):
+        self.slots = max(slots, 1)
+        self.fn = fn
+        self.on_error = on_error        # on_error(item, exc); the pool carries on either way
+        self.queue = queue.Queue(maxsize=queue_size or self.slots)
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)
+        self._started = time.monotonic()
+        self._busy_since = {}           # slot -> monotonic start of its current item
+        self._busy_total = 0.0
+        self._done = 0
+        self._failed = 0
+        self._threads = [threading.Thread(target=self._slot, args=(n,), daemon=True,
+                                          name=f"slot-{n}") for n in range(self.slots)]
+        for t in self._threads:
+            t.start()
+
+    def _slot(self, n: int):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+            with self._lock:
+                self._busy_since[n] = time.monotonic()
+            ok = True
+            try:
+                self.fn(item)
+            except Exception as e:
+                ok = False
+                if self.on_error:
+                    self.on_error(item, e)
+            finally:
+                with self._lock:
+                    self._busy_total += time.monotonic() - self._busy_since.pop(n)
+                    if ok:
+                        self._done += 1
+                    else:
+                        self._failed += 1
+                    self._freed.notify_all()
+                self.queue.task_done()
+
+    # --- feeding ---
+
+    def room(self) -> int:
+        """How many more items can be submitted without blocking."""
+        with self._lock:
+            return max(self.slots + self.queue.maxsize - self.queue.qsize() - len(self._busy_since), 0)
+
+    def submit(self, item, timeout: float = None):
+        """Queue item for the next free slot. Blocks while the queue is full."""
+        self.queue.put(item, timeout=timeout)
+
+    def idle(self) -> bool:
+        with self._lock:
+            return not self._busy_since and self.queue.qsize() == 0
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until some slot finishes an item, or timeout. True if one did."""
+        with self._freed:
+            finished = self._done + self._failed
+            self._freed.wait(timeout)
+            return self._done + self._failed > finished
+
+    def drain(self):
+        """Wait until every submitted item has finished."""
+        self.queue.join()
+
+    def close(self):
+        """Finish what was submitted, then stop the slots."""
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+
+    # --- reporting ---
+
+    def stats(self) -> PoolStats:
+        now = time.monotonic()
+        with self._lock:
+            running = sum(now - since for since in self._busy_since.values())
+            return PoolStats(self.slots, self._done, self._failed, self.queue.qsize(),
+                             len(self._busy_since), now - self._started, self._busy_total + running)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    opts = {"--slots": "3", "--tasks": "12"}
+    for flag in list(opts):
+        if flag in args:
+            i = args.index(flag)
+            opts[flag] = args[i + 1]
+            del args[i:i + 2]
+    slots, tasks = int(opts["--slots"]), int(opts["--tasks"])
+
+    # Every fourth task is slow, the way one resolve_one.sh can be
+    durations = [0.8 if n % 4 == 0 else 0.1 for n in range(tasks)]
+    pool = WorkerPool(slots, time.sleep)
+    for d in durations:
+        pool.submit(d)
+    pool.drain()
+    print(f"pool:    {pool.stats().line()}")
+    pool.close()
+
+    t0 = time.monotonic()
+    for n in range(0, tasks, slots):
+        batch = durations[n:n + slots]
+        threads = [threading.Thread(target=time.sleep, args=(d,)) for d in batch]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    elapsed = time.monotonic() - t0
+    print(f"batches: done={tasks} rate={tasks / elapsed:.2f}/s "
+          f"util={sum(durations) / (slots * elapsed):.0%}")